@@ -0,0 +1,288 @@
+"""
+Benchmark backend QA Automation Dashboard
+
+Untuk setiap ukuran dataset, log sintetis di-generate (generate_logs.py) lalu
+satu subprocess baru mengukur lewat Flask test client:
+
+- /api/logs, /api/metrics, /api/tests/history: latency request pertama (cold,
+  termasuk ingest), p50/p95 request berikutnya dan throughput
+- LogParser: throughput parse semua file (baris/detik)
+- append: latency request pertama setelah beberapa baris di-append ke satu
+  file (refresh incremental, bukan cold start)
+- peak RSS setelah setiap tahap
+
+Hasil dibandingkan dengan baseline di benchmarks/baselines/dashboard.json;
+exit code 1 kalau ada metrik yang lebih buruk dari toleransi. Baseline yang
+di-commit: 10k dan 1m untuk store memory dan sqlite. Default --sizes hanya
+10k supaya cepat; 10m tidak punya baseline (hanya dicetak, tidak dibandingkan).
+
+Jalankan:
+    python benchmarks/bench_dashboard.py [--sizes 10k,1m,10m] [--store memory|sqlite]
+    python benchmarks/bench_dashboard.py --save-baseline
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import random
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD_DIR = os.path.join(ROOT, 'qa-automation-dashboard')
+BASELINE_FILE = os.path.join(ROOT, 'benchmarks', 'baselines', 'dashboard.json')
+
+sys.path.insert(0, ROOT)
+from benchmarks.generate_logs import generate, generate_file, parse_size
+
+ENDPOINTS = {
+    'logs': '/api/logs?limit=200',
+    'logs_filtered': '/api/logs?limit=200&level=ERROR',
+    'metrics': '/api/metrics',
+    'history': '/api/tests/history?limit=50&archived=1',
+}
+HISTORY_IN_MEMORY = 200
+HISTORY_ARCHIVED = 5000
+# Skenario append: sekian putaran, masing-masing sekian baris baru
+APPEND_ROUNDS = 20
+APPEND_LINES = 100
+
+# Metrik yang lebih kecil lebih baik vs lebih besar lebih baik
+LOWER_IS_BETTER = ('cold_ms', 'p50_ms', 'p95_ms', 'peak_rss_mb')
+HIGHER_IS_BETTER = ('rps', 'lines_per_sec')
+# Selisih latency di bawah ini dianggap noise, bukan regresi
+MIN_DELTA_MS = 5.0
+
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: byte
+    return round(rss / 1024 / (1024 if sys.platform == 'darwin' else 1), 1)
+
+
+def seed_history(app_module):
+    """Isi eksekusi di memory dan arsip supaya /api/tests/history punya data"""
+    for index in range(HISTORY_ARCHIVED):
+        app_module.execution_archive.add({
+            'execution_id': f'archived_{index}',
+            'test_file': 'test_login.py',
+            'status': 'completed' if index % 7 else 'failed',
+            'queued_time': f'2024-01-01T{index // 3600 % 24:02d}:{index // 60 % 60:02d}:{index % 60:02d}',
+            'exit_code': 0 if index % 7 else 1,
+        })
+    for index in range(HISTORY_IN_MEMORY):
+        app_module.test_executions[f'exec_{index}'] = {
+            'test_file': 'test_login.py',
+            'test_type': 'pytest',
+            'status': 'completed',
+            'queued_time': f'2024-01-02T00:{index // 60:02d}:{index % 60:02d}',
+            'start_time': None,
+            'end_time': None,
+            'exit_code': 0,
+        }
+
+
+def run_worker(log_dir, output_dir, requests_count):
+    """Jalan di subprocess: import app dengan folder sintetis lalu ukur"""
+    os.environ['QA_DASHBOARD_LOG_FOLDER'] = log_dir
+    os.environ['QA_DASHBOARD_OUTPUT_FOLDER'] = output_dir
+    sys.path.insert(0, DASHBOARD_DIR)
+    import app as app_module
+
+    results = {'baseline_rss_mb': peak_rss_mb()}
+
+    files = [os.path.join(log_dir, name) for name in sorted(os.listdir(log_dir))
+             if name.endswith(('.json', '.log'))]
+    start = time.perf_counter()
+    lines = 0
+    for path in files:
+        if path.endswith('.json'):
+            lines += len(app_module.LogParser.parse_json_log(path))
+        else:
+            lines += len(app_module.LogParser.parse_text_log(path))
+    elapsed = time.perf_counter() - start
+    results['log_parser'] = {
+        'lines': lines,
+        'seconds': round(elapsed, 3),
+        'lines_per_sec': round(lines / elapsed) if elapsed else 0,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+    seed_history(app_module)
+    client = app_module.app.test_client()
+    for name, url in ENDPOINTS.items():
+        start = time.perf_counter()
+        response = client.get(url)
+        cold = time.perf_counter() - start
+        if response.status_code != 200:
+            raise RuntimeError(f'{url} returned {response.status_code}')
+
+        latencies = []
+        for _ in range(requests_count):
+            start = time.perf_counter()
+            client.get(url)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+
+        results[name] = {
+            'cold_ms': round(cold * 1000, 2),
+            'p50_ms': round(statistics.median(latencies) * 1000, 2),
+            'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+            'rps': round(len(latencies) / sum(latencies), 1),
+            'bytes': len(response.data),
+            'peak_rss_mb': peak_rss_mb(),
+        }
+
+    results['append'] = measure_append(client, log_dir)
+    return results
+
+
+def measure_append(client, log_dir):
+    """Append baris baru ke file JSON terakhir lalu ukur request pertama setelahnya"""
+    target = [name for name in sorted(os.listdir(log_dir)) if name.endswith('.json')][-1]
+    path = os.path.join(log_dir, target)
+    original_size = os.path.getsize(path)
+    suite = target.split('_', 1)[0]
+    rng = random.Random(7)
+    # Setelah semua timestamp dataset, supaya log baru selalu paling atas
+    timestamp = datetime(2030, 1, 1)
+    latencies = []
+    try:
+        for _ in range(APPEND_ROUNDS):
+            timestamp = generate_file(path, suite, APPEND_LINES, True, timestamp, rng, mode='a')
+            start = time.perf_counter()
+            response = client.get(ENDPOINTS['metrics'])
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                raise RuntimeError(f"{ENDPOINTS['metrics']} returned {response.status_code} after append")
+    finally:
+        # Dataset di --workdir dipakai ulang antar run, kembalikan ke ukuran semula
+        os.truncate(path, original_size)
+    latencies.sort()
+    return {
+        'lines': APPEND_ROUNDS * APPEND_LINES,
+        'p50_ms': round(statistics.median(latencies) * 1000, 2),
+        'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def run_size(size, num_files, store, requests_count, workdir):
+    log_dir = os.path.join(workdir, f'logs_{size}')
+    if not os.path.isdir(log_dir):
+        generate(log_dir, parse_size(size), num_files)
+    output_dir = os.path.join(workdir, f'executions_{size}_{store}')
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.makedirs(output_dir)
+    # Dataset sama dipakai ulang, tapi cache ingestor harus dingin
+    shutil.rmtree(os.path.join(log_dir, '.cache'), ignore_errors=True)
+
+    env = dict(os.environ, QA_DASHBOARD_STORE=store)
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--worker', log_dir, output_dir,
+         '--requests', str(requests_count)],
+        capture_output=True, text=True, env=env, cwd=DASHBOARD_DIR
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'Benchmark worker failed for {size}:\n{result.stderr}')
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance):
+    """Return list regresi terhadap baseline"""
+    regressions = []
+    for run_key, run in results.items():
+        for section, metrics in run.items():
+            if not isinstance(metrics, dict):
+                continue
+            base_metrics = baseline.get(run_key, {}).get(section, {})
+            for metric, value in metrics.items():
+                base = base_metrics.get(metric)
+                if not base:
+                    continue
+                if metric.endswith('_ms') and value - base < MIN_DELTA_MS:
+                    continue
+                if metric in LOWER_IS_BETTER and value > base * tolerance:
+                    regressions.append(f'{run_key} {section}.{metric}: {value} > {base} x {tolerance}')
+                elif metric == 'rps' and 1000 / value - 1000 / base < MIN_DELTA_MS:
+                    continue
+                elif metric in HIGHER_IS_BETTER and value < base / tolerance:
+                    regressions.append(f'{run_key} {section}.{metric}: {value} < {base} / {tolerance}')
+    return regressions
+
+
+def print_results(results):
+    for run_key, run in results.items():
+        print(f'\n{run_key}', file=sys.stderr)
+        parser = run['log_parser']
+        print(f"  LogParser            {parser['lines']:>10} lines  {parser['lines_per_sec']:>10} lines/s"
+              f"  peak RSS {parser['peak_rss_mb']} MB", file=sys.stderr)
+        for name in ENDPOINTS:
+            m = run[name]
+            print(f"  {name:<20} cold {m['cold_ms']:>9} ms  p50 {m['p50_ms']:>8} ms  p95 {m['p95_ms']:>8} ms"
+                  f"  {m['rps']:>8} req/s  peak RSS {m['peak_rss_mb']} MB", file=sys.stderr)
+        append = run['append']
+        print(f"  {'append':<20} {append['lines']:>10} lines  p50 {append['p50_ms']:>8} ms"
+              f"  p95 {append['p95_ms']:>8} ms  peak RSS {append['peak_rss_mb']} MB", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10k', help='Daftar ukuran dipisah koma: 10k,1m,10m')
+    parser.add_argument('--files', type=int, default=50)
+    parser.add_argument('--store', default='memory', choices=('memory', 'sqlite'))
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--workdir', help='Folder dataset (dipakai ulang antar run)')
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=1.5)
+    parser.add_argument('--worker', nargs=2, metavar=('LOG_DIR', 'OUTPUT_DIR'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(*args.worker, args.requests)))
+        return
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='qa-dashboard-bench-')
+    results = {}
+    try:
+        for size in args.sizes.split(','):
+            results[f'{size}-{args.store}'] = run_size(size, args.files, args.store, args.requests, workdir)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_results(results)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    if args.save_baseline:
+        baseline.update(results)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f'\nBaseline saved to {args.baseline}', file=sys.stderr)
+        return
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print('\nREGRESSIONS:', file=sys.stderr)
+        for regression in regressions:
+            print(f'  {regression}', file=sys.stderr)
+        sys.exit(1)
+    print('\nNo regressions against baseline' if baseline else '\nNo baseline to compare against',
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
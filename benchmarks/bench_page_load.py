@@ -0,0 +1,94 @@
+"""
+Benchmark waktu page load Chrome dengan dan tanpa fast profile
+
+Setiap URL dimuat beberapa kali per profile. Yang diukur: durasi
+driver.get() (tergantung pageLoadStrategy) serta domContentLoaded dan
+loadEventEnd dari Navigation Timing API.
+
+Jalankan:
+    python benchmarks/bench_page_load.py [--runs 5] [--url https://www.google.com ...]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.driver_factory import get_driver
+
+DEFAULT_URLS = [
+    "https://www.google.com",
+    "https://www.selenium.dev",
+    "https://en.wikipedia.org/wiki/Selenium_(software)",
+]
+
+NAVIGATION_TIMING_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+if (!nav) return [null, null, performance.getEntriesByType('resource').length];
+return [nav.domContentLoadedEventEnd, nav.loadEventEnd || null,
+        performance.getEntriesByType('resource').length];
+"""
+
+
+def measure(driver, urls, runs):
+    samples = {url: {"get": [], "dom_content_loaded": [], "load": [], "resources": []} for url in urls}
+    for _ in range(runs):
+        for url in urls:
+            driver.get("about:blank")
+            start = time.perf_counter()
+            driver.get(url)
+            elapsed = time.perf_counter() - start
+            dom_content_loaded, load, resources = driver.execute_script(NAVIGATION_TIMING_SCRIPT)
+
+            sample = samples[url]
+            sample["get"].append(elapsed * 1000)
+            if dom_content_loaded:
+                sample["dom_content_loaded"].append(dom_content_loaded)
+            if load:
+                sample["load"].append(load)
+            sample["resources"].append(resources)
+    return samples
+
+
+def run_profile(label, fast_profile, urls, runs):
+    driver = get_driver(fast_profile=fast_profile)
+    try:
+        samples = measure(driver, urls, runs)
+    finally:
+        driver.quit()
+
+    print(f"\n{label} (startup {driver.startup_time:.2f}s)", file=sys.stderr)
+    for url, sample in samples.items():
+        def median(values):
+            return f"{statistics.median(values):8.1f}" if values else "     n/a"
+        print(
+            f"  {url[:50]:<50} get {median(sample['get'])} ms"
+            f"  DCL {median(sample['dom_content_loaded'])} ms"
+            f"  load {median(sample['load'])} ms"
+            f"  resources {statistics.median(sample['resources']):.0f}",
+            file=sys.stderr
+        )
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--url", action="append", dest="urls")
+    args = parser.parse_args()
+    urls = args.urls or DEFAULT_URLS
+
+    default = run_profile("Default profile", False, urls, args.runs)
+    fast = run_profile("Fast profile", True, urls, args.runs)
+
+    print("\nSpeedup driver.get() (median):", file=sys.stderr)
+    for url in urls:
+        before = statistics.median(default[url]["get"])
+        after = statistics.median(fast[url]["get"])
+        print(f"  {url[:50]:<50} {before / after:5.2f}x", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Micro-benchmark overhead per call QADashboardLogger (mode JSON)
+
+Membandingkan cara lama (open/write/close + print untuk setiap log) dengan
+writer buffered yang menjaga file handle tetap terbuka.
+
+Jalankan:
+    python benchmarks/bench_qa_logger.py [--calls 20000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from test.qa_logger import QADashboardLogger
+
+
+def legacy_write_json_log(log_file, test_suite_name, level, message, **kwargs):
+    """Implementasi lama _write_json_log (sebelum BufferedJsonWriter)"""
+    log_entry = {
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'level': level,
+        'message': message,
+        'test_suite': test_suite_name,
+        **kwargs
+    }
+
+    with open(log_file, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(log_entry) + '\n')
+
+    print(f"[{log_entry['timestamp']}] {level}: {message}")
+
+
+def bench(label, calls, func):
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed / calls * 1e6:8.2f} us/call  ({calls} calls, {elapsed:.3f}s)",
+          file=sys.stderr)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        # Console echo dibuang ke devnull supaya yang terukur adalah overhead syscall
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                legacy_file = os.path.join(log_dir, 'legacy.json')
+                legacy = bench('legacy (open/close + print)', args.calls,
+                               lambda i: legacy_write_json_log(legacy_file, 'Bench', 'DEBUG', f'Step: {i}'))
+
+                logger = QADashboardLogger('BenchUnbuffered', log_dir=log_dir, buffer_size=0)
+                bench('persistent handle, flush/line', args.calls, lambda i: logger.log_step(f'{i}'))
+                logger.close()
+
+                logger = QADashboardLogger('BenchBuffered', log_dir=log_dir)
+                buffered = bench('buffered + print', args.calls, lambda i: logger.log_step(f'{i}'))
+                logger.close()
+
+                logger = QADashboardLogger('BenchQuiet', log_dir=log_dir, console=False)
+                quiet = bench('buffered, console=False', args.calls, lambda i: logger.log_step(f'{i}'))
+                logger.close()
+
+                # Async: yang terukur hanya biaya enqueue di thread pemanggil
+                logger = QADashboardLogger('BenchAsync', log_dir=log_dir, console=False,
+                                           async_mode=True, queue_size=args.calls)
+                async_enqueue = bench('async enqueue, console=False', args.calls,
+                                      lambda i: logger.log_step(f'{i}'))
+                logger.close()
+            finally:
+                sys.stdout = stdout
+
+    print(f"speedup buffered: {legacy / buffered:.1f}x, buffered + console=False: {legacy / quiet:.1f}x, "
+          f"async enqueue: {legacy / async_enqueue:.1f}x", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Generator log sintetis dengan format QADashboardLogger
+
+Menghasilkan campuran file JSONL (.json) dan text (.log) berisi alur test
+yang realistis: start test, step span, assertion, debug, hasil PASSED /
+FAILED / SKIPPED dengan durasi, dan summary.
+
+Jalankan:
+    python benchmarks/generate_logs.py OUTPUT_DIR [--lines 10k|1m|10m|N] [--files 50]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+SIZES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+
+SUITES = ['LoginTest', 'CheckoutTest', 'SearchTest', 'ProfileTest', 'CartTest', 'ApiSmokeTest']
+STEPS = [
+    'Opening login page', 'Entering credentials', 'Clicking login button',
+    'Searching product', 'Adding item to cart', 'Filling shipping form',
+    'Submitting order', 'Verifying confirmation', 'Uploading avatar',
+]
+ERRORS = [
+    'Element not found: #login-btn',
+    'TimeoutException: Timed out after 10s waiting for visible',
+    'AssertionError: expected 200, got 500',
+    'StaleElementReferenceException',
+]
+
+
+def parse_size(value):
+    value = value.lower()
+    if value in SIZES:
+        return SIZES[value]
+    return int(value.replace('_', ''))
+
+
+def test_records(rng, suite, test_index):
+    """Record (level, message, fields) untuk satu test case"""
+    test_name = f"test_{suite.lower()}_{test_index}"
+    yield 'INFO', f"Starting test: {test_name}", {}
+
+    total = 0.0
+    for step_id, step in enumerate(rng.sample(STEPS, rng.randint(2, 5)), 1):
+        duration = round(rng.lognormvariate(-0.5, 0.8), 6)
+        total += duration
+        yield 'DEBUG', f"Step: {step}", {}
+        yield 'INFO', f"Step done: {step} ({duration:.3f}s)", {
+            'step': step, 'step_id': step_id, 'step_parent': None, 'step_depth': 0,
+            'step_test': test_name, 'step_duration': duration, 'step_status': 'passed'
+        }
+        if rng.random() < 0.3:
+            yield 'DEBUG', f"Wait done: visible ('css selector', '#{step_id}') ({duration / 2:.3f}s)", {}
+
+    passed = rng.random() < 0.85
+    yield ('DEBUG' if passed else 'ERROR'), (
+        f"Assertion {'PASSED' if passed else 'FAILED'}: page title | Expected: Dashboard, Actual: "
+        f"{'Dashboard' if passed else 'Error'}"
+    ), {}
+
+    duration = round(total + rng.random(), 3)
+    roll = rng.random()
+    if roll < 0.05:
+        yield 'WARNING', f"Test SKIPPED: {test_name} | reason: feature flag off", {
+            'test_name': test_name, 'status': 'skipped', 'reason': 'feature flag off'
+        }
+    elif passed:
+        yield 'INFO', f"Test PASSED: {test_name} | duration: {duration}s", {
+            'test_name': test_name, 'status': 'passed', 'duration': duration
+        }
+    else:
+        error = rng.choice(ERRORS)
+        yield 'ERROR', f"Test FAILED: {test_name} | error: {error} | duration: {duration}s", {
+            'test_name': test_name, 'status': 'failed', 'error': error, 'duration': duration
+        }
+
+
+def generate_file(path, suite, num_lines, use_json, start, rng, mode='w'):
+    """Tulis satu file log sebanyak num_lines baris (mode='a' untuk append)"""
+    timestamp = start
+    written = 0
+    test_index = 0
+    with open(path, mode, encoding='utf-8') as f:
+        while written < num_lines:
+            test_index += 1
+            for level, message, fields in test_records(rng, suite, test_index):
+                if written >= num_lines:
+                    break
+                timestamp += timedelta(milliseconds=rng.randint(5, 900))
+                ts = timestamp.strftime('%Y-%m-%d %H:%M:%S')
+                if use_json:
+                    f.write(json.dumps({
+                        'timestamp': ts, 'level': level, 'message': message,
+                        'test_suite': suite, **fields
+                    }) + '\n')
+                else:
+                    # Format formatter text QADashboardLogger (datefmt tanpa milidetik)
+                    f.write(f"{ts} - {level} - {message}\n")
+                written += 1
+    return timestamp
+
+
+def generate(output_dir, num_lines, num_files=50, text_fraction=0.2, seed=42):
+    """
+    Generate num_lines baris log yang tersebar di num_files file.
+    Return list path file yang dibuat.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, 8, 0, 0)
+    num_files = max(1, min(num_files, num_lines))
+    paths = []
+
+    for index in range(num_files):
+        lines = num_lines // num_files + (1 if index < num_lines % num_files else 0)
+        suite = SUITES[index % len(SUITES)]
+        use_json = rng.random() >= text_fraction
+        run_start = start + timedelta(hours=index)
+        name = f"{suite}_{run_start:%Y%m%d_%H%M%S}_{index:04d}.{'json' if use_json else 'log'}"
+        path = os.path.join(output_dir, name)
+        generate_file(path, suite, lines, use_json, run_start, rng)
+        paths.append(path)
+
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('output_dir')
+    parser.add_argument('--lines', default='10k', help="10k, 1m, 10m atau jumlah baris")
+    parser.add_argument('--files', type=int, default=50)
+    parser.add_argument('--text-fraction', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    paths = generate(args.output_dir, parse_size(args.lines), args.files, args.text_fraction, args.seed)
+    size = sum(os.path.getsize(p) for p in paths)
+    print(f"Generated {len(paths)} files, {size / 1024 / 1024:.1f} MB in {args.output_dir}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,255 @@
+import time
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+# Hook XHR/fetch untuk menghitung request yang masih berjalan di halaman
+NETWORK_IDLE_SCRIPT = """
+if (!window.__qaPendingRequests) {
+    window.__qaPendingRequests = {count: 0};
+    const pending = window.__qaPendingRequests;
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        pending.count++;
+        this.addEventListener('loadend', () => pending.count--);
+        return originalSend.apply(this, arguments);
+    };
+    if (window.fetch) {
+        const originalFetch = window.fetch;
+        window.fetch = function() {
+            pending.count++;
+            return originalFetch.apply(this, arguments).finally(() => pending.count--);
+        };
+    }
+}
+return [
+    document.readyState,
+    window.__qaPendingRequests.count,
+    performance.getEntriesByType('resource').length
+];
+"""
+
+# Resolve banyak locator sekaligus dalam satu round-trip execute_script.
+# performance.timeOrigin berubah setiap page load, dipakai sebagai token cache.
+FIND_ELEMENTS_SCRIPT = """
+const specs = arguments[0];
+const mode = arguments[1];
+const attribute = arguments[2];
+function find(by, value) {
+    switch (by) {
+        case 'css selector': return document.querySelector(value);
+        case 'id': return document.getElementById(value);
+        case 'name': return document.getElementsByName(value)[0] || null;
+        case 'class name': return document.getElementsByClassName(value)[0] || null;
+        case 'tag name': return document.getElementsByTagName(value)[0] || null;
+        case 'xpath':
+            return document.evaluate(value, document, null,
+                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        case 'link text':
+            return Array.from(document.links).find(a => a.textContent.trim() === value) || null;
+        case 'partial link text':
+            return Array.from(document.links).find(a => a.textContent.includes(value)) || null;
+    }
+    return null;
+}
+const results = specs.map(([by, value]) => {
+    const element = find(by, value);
+    if (!element || mode === 'element') return element;
+    return mode === 'text' ? element.innerText : element.getAttribute(attribute);
+});
+return [String(performance.timeOrigin), results];
+"""
+
+PAGE_TOKEN_SCRIPT = "return String(performance.timeOrigin);"
+
+
 class BasePage:
 
-    def __init__(self, driver):
+    DEFAULT_TIMEOUT = 10
+    DEFAULT_POLL_INTERVAL = 0.2
+
+    # Locator yang dideklarasikan page object: {"nama": (By.X, "value")}
+    LOCATORS = {}
+
+    def __init__(self, driver, timeout=None, poll_interval=None, logger=None):
+        """
+        Args:
+            driver: Instance WebDriver
+            timeout: Timeout default (detik) untuk semua wait
+            poll_interval: Interval polling default (detik) untuk semua wait
+            logger: QADashboardLogger opsional untuk mencatat durasi setiap wait
+        """
         self.driver = driver
+        self.timeout = timeout or self.DEFAULT_TIMEOUT
+        self.poll_interval = poll_interval or self.DEFAULT_POLL_INTERVAL
+        self.logger = logger
+        self.wait_timings = []
+        self._element_cache = {}
+        self._page_token = None
 
     def get_title(self):
         return self.driver.title
+
+    def navigate(self, url):
+        """Buka URL dan kosongkan cache element milik halaman sebelumnya"""
+        self.invalidate_cache()
+        self.driver.get(url)
+
+    # ============================================
+    # LOCATOR & ELEMENT CACHE
+    # ============================================
+
+    def invalidate_cache(self):
+        self._element_cache.clear()
+        self._page_token = None
+
+    def refresh_if_navigated(self):
+        """Kosongkan cache kalau halaman sudah berganti (satu round-trip)"""
+        token = self.driver.execute_script(PAGE_TOKEN_SCRIPT)
+        if token != self._page_token:
+            self.invalidate_cache()
+            self._page_token = token
+
+    def _run_batch(self, names, mode="element", attribute=None):
+        specs = [list(self.LOCATORS[name]) for name in names]
+        token, results = self.driver.execute_script(FIND_ELEMENTS_SCRIPT, specs, mode, attribute)
+        return token, dict(zip(names, results))
+
+    def resolve_all(self, names=None):
+        """
+        Resolve banyak locator sekaligus dalam satu round-trip WebDriver.
+        Element yang ditemukan di-cache sampai halaman berganti; locator yang
+        tidak ketemu bernilai None.
+        """
+        names = list(names if names is not None else self.LOCATORS)
+        missing = [name for name in names if name not in self._element_cache]
+        if names and not missing:
+            # Semua dari cache: cek token halaman dulu supaya tidak mengembalikan
+            # element dari halaman sebelumnya (submit form, klik link, redirect)
+            self.refresh_if_navigated()
+            missing = [name for name in names if name not in self._element_cache]
+        if missing:
+            token, found = self._run_batch(missing)
+            if self._page_token is not None and token != self._page_token:
+                # Sudah pindah halaman: cache lama tidak valid, resolve ulang semuanya
+                self.invalidate_cache()
+                token, found = self._run_batch(names)
+            self._page_token = token
+            self._element_cache.update({name: el for name, el in found.items() if el is not None})
+
+        return {name: self._element_cache.get(name) for name in names}
+
+    def element(self, name):
+        """Ambil element dari locator yang dideklarasikan (pakai cache selama halaman sama)"""
+        element = self.resolve_all([name])[name]
+        if element is None:
+            raise NoSuchElementException(f"Element '{name}' not found with locator {self.LOCATORS[name]}")
+        return element
+
+    def read_texts(self, names=None):
+        """Ambil innerText banyak element dalam satu round-trip"""
+        names = list(names if names is not None else self.LOCATORS)
+        return self._run_batch(names, mode="text")[1]
+
+    def read_attributes(self, attribute, names=None):
+        """Ambil satu attribute dari banyak element dalam satu round-trip"""
+        names = list(names if names is not None else self.LOCATORS)
+        return self._run_batch(names, mode="attribute", attribute=attribute)[1]
+
+    # ============================================
+    # WAIT TOOLKIT
+    # ============================================
+
+    def wait_until(self, condition, description="custom condition", timeout=None, poll_interval=None):
+        """
+        Tunggu sampai condition(driver) mengembalikan nilai truthy.
+
+        Durasi wait yang sebenarnya dicatat di self.wait_timings (dan ke logger
+        kalau ada), termasuk wait yang timeout.
+        """
+        timeout = timeout or self.timeout
+        start = time.perf_counter()
+        success = False
+        try:
+            result = WebDriverWait(
+                self.driver, timeout, poll_frequency=poll_interval or self.poll_interval
+            ).until(condition, f"Timed out after {timeout}s waiting for {description}")
+            success = True
+            return result
+        finally:
+            self._record_wait(description, time.perf_counter() - start, timeout, success)
+
+    def _record_wait(self, description, elapsed, timeout, success):
+        self.wait_timings.append({
+            "wait": description,
+            "duration": round(elapsed, 4),
+            "timeout": timeout,
+            "success": success,
+        })
+        if self.logger:
+            status = "done" if success else "TIMEOUT"
+            self.logger.debug(
+                f"Wait {status}: {description} ({elapsed:.3f}s)",
+                wait=description, wait_duration=round(elapsed, 4), wait_success=success
+            )
+
+    def wait_for_visible(self, locator, **kwargs):
+        return self.wait_until(EC.visibility_of_element_located(locator), f"visible {locator}", **kwargs)
+
+    def wait_for_clickable(self, locator, **kwargs):
+        return self.wait_until(EC.element_to_be_clickable(locator), f"clickable {locator}", **kwargs)
+
+    def wait_for_invisible(self, locator, **kwargs):
+        return self.wait_until(EC.invisibility_of_element_located(locator), f"invisible {locator}", **kwargs)
+
+    def wait_for_url_change(self, old_url=None, **kwargs):
+        old_url = old_url or self.driver.current_url
+        return self.wait_until(EC.url_changes(old_url), f"url change from {old_url}", **kwargs)
+
+    def wait_for_url_contains(self, fragment, **kwargs):
+        return self.wait_until(EC.url_contains(fragment), f"url contains {fragment!r}", **kwargs)
+
+    def wait_for_title_change(self, old_title=None, **kwargs):
+        old_title = old_title if old_title is not None else self.driver.title
+        return self.wait_until(lambda d: d.title != old_title, f"title change from {old_title!r}", **kwargs)
+
+    def wait_for_title_contains(self, text, **kwargs):
+        return self.wait_until(EC.title_contains(text), f"title contains {text!r}", **kwargs)
+
+    def wait_for_network_idle(self, idle_time=0.5, **kwargs):
+        """
+        Tunggu sampai document complete, tidak ada XHR/fetch yang berjalan,
+        dan jumlah resource tidak bertambah selama idle_time detik.
+        """
+        state = {"resources": None, "since": None}
+
+        def network_idle(driver):
+            ready_state, pending, resources = driver.execute_script(NETWORK_IDLE_SCRIPT)
+            now = time.monotonic()
+            if ready_state != "complete" or pending > 0 or resources != state["resources"]:
+                state["resources"] = resources
+                state["since"] = now
+                return False
+            return now - state["since"] >= idle_time
+
+        return self.wait_until(network_idle, f"network idle {idle_time}s", **kwargs)
+
+    def is_visible(self, locator, timeout=0.5):
+        """Cek element tampil tanpa melempar TimeoutException"""
+        try:
+            self.wait_for_visible(locator, timeout=timeout)
+            return True
+        except TimeoutException:
+            return False
+
+    def wait_summary(self):
+        """Total durasi wait per deskripsi, diurutkan dari yang paling lama"""
+        summary = {}
+        for timing in self.wait_timings:
+            entry = summary.setdefault(timing["wait"], {"count": 0, "total": 0.0, "max": 0.0})
+            entry["count"] += 1
+            entry["total"] += timing["duration"]
+            entry["max"] = max(entry["max"], timing["duration"])
+        return dict(sorted(summary.items(), key=lambda item: -item[1]["total"]))
@@ -1,3 +1,5 @@
+from selenium.webdriver.common.by import By
+
 from pages.base_page import BasePage
 
 
@@ -5,5 +7,16 @@ class GooglePage(BasePage):
 
     URL = "https://www.google.com"
 
+    LOCATORS = {
+        "search_box": (By.NAME, "q"),
+        "search_button": (By.NAME, "btnK"),
+        "logo": (By.CSS_SELECTOR, "img[alt='Google']"),
+    }
+
     def open(self):
-        self.driver.get(self.URL)
+        self.navigate(self.URL)
+
+    def search(self, query):
+        search_box = self.element("search_box")
+        search_box.send_keys(query)
+        search_box.submit()
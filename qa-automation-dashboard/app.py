@@ -1,46 +1,273 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, Response, stream_with_context
 from flask_cors import CORS
+import base64
+import functools
+import gzip
+import heapq
 import json
 import os
 import re
+import socket
 import subprocess
 import threading
+from collections import Counter, defaultdict, deque
 from datetime import datetime
 from pathlib import Path
+import bulk_ingest
+from events import EventBroker
+from execution_archive import ExecutionArchive
+from execution_store import MemoryExecutionStore, SQLiteExecutionStore
+from log_index import LogIndexCache
+from log_store import SQLiteLogStore
+from output_buffer import OutputBuffer
+from response_cache import ResponseCache, fingerprint
+from rollups import ARCHIVED, GRANULARITIES, TestRollups
+from scheduler import TestScheduler, PROCESS_GROUP_KWARGS, kill_process_tree
+from sharding import collect_tests, load_test_history, plan_shards
+from sketch import HISTOGRAM_BOUNDS, DurationSketch, merge_sketches
+from step_profiler import StepProfiler
 import glob
+import itertools
 import time
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 app = Flask(__name__)
 CORS(app)
 
 # Konfigurasi
-LOG_FOLDER = os.path.join(os.path.dirname(__file__), 'logs')
+LOG_FOLDER = os.environ.get('QA_DASHBOARD_LOG_FOLDER', os.path.join(os.path.dirname(__file__), 'logs'))
 TEST_FOLDER = os.path.join(os.path.dirname(__file__), 'tests')
+CACHE_FOLDER = os.path.join(LOG_FOLDER, '.cache')
+OUTPUT_FOLDER = os.environ.get('QA_DASHBOARD_OUTPUT_FOLDER', os.path.join(os.path.dirname(__file__), 'executions'))
 os.makedirs(LOG_FOLDER, exist_ok=True)
 os.makedirs(TEST_FOLDER, exist_ok=True)
+os.makedirs(CACHE_FOLDER, exist_ok=True)
+os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+
+# Storage backend: 'memory' (default) atau 'sqlite'
+LOG_STORE = os.environ.get('QA_DASHBOARD_STORE', 'memory').lower()
+SQLITE_CACHE_FOLDER = os.path.join(CACHE_FOLDER, 'sqlite')
+INDEX_FOLDER = os.path.join(CACHE_FOLDER, 'index')
+LOG_DB_PATH = os.environ.get('QA_DASHBOARD_DB', os.path.join(SQLITE_CACHE_FOLDER, 'logs.db'))
+ROLLUP_DB_PATH = os.environ.get('QA_DASHBOARD_ROLLUP_DB', os.path.join(CACHE_FOLDER, 'rollups.db'))
+
+# State eksekusi: 'memory' (default, satu process) atau 'sqlite' (dibagi beberapa
+# worker process, lihat serve.py)
+EXECUTION_STORE = os.environ.get('QA_DASHBOARD_EXECUTION_STORE', 'memory').lower()
+EXECUTION_DB_PATH = os.environ.get('QA_DASHBOARD_EXECUTION_DB', os.path.join(OUTPUT_FOLDER, 'executions.db'))
+# Role process: 'all' (API + scheduler), 'web' (API saja) atau 'scheduler'
+SERVER_ROLE = os.environ.get('QA_DASHBOARD_ROLE', 'all').lower()
+if SERVER_ROLE not in ('all', 'web', 'scheduler'):
+    raise ValueError(f"QA_DASHBOARD_ROLE must be 'all', 'web' or 'scheduler', got {SERVER_ROLE!r}")
+if SERVER_ROLE != 'all' and EXECUTION_STORE != 'sqlite':
+    raise ValueError(f"QA_DASHBOARD_ROLE={SERVER_ROLE} requires QA_DASHBOARD_EXECUTION_STORE=sqlite")
 
 # Global state untuk tracking test execution
-test_executions = {}
+if EXECUTION_STORE == 'sqlite':
+    test_executions = SQLiteExecutionStore(EXECUTION_DB_PATH)
+else:
+    test_executions = MemoryExecutionStore()
+
+# Output stdout/stderr per eksekusi (ring buffer + spill file)
+test_outputs = {}
+OUTPUT_MEMORY_LIMIT = int(os.environ.get('QA_DASHBOARD_OUTPUT_MEMORY', str(256 * 1024)))
+
+# Retention history: eksekusi yang sudah selesai dipindah ke arsip di disk
+HISTORY_MAX_ENTRIES = int(os.environ.get('QA_DASHBOARD_HISTORY_MAX_ENTRIES', '200'))
+HISTORY_MAX_BYTES = int(os.environ.get('QA_DASHBOARD_HISTORY_MAX_BYTES', str(64 * 1024 * 1024)))
+HISTORY_TTL = float(os.environ.get('QA_DASHBOARD_HISTORY_TTL', str(7 * 24 * 3600)))
+FINISHED_STATUSES = ('completed', 'failed', 'cancelled', 'timeout')
+execution_archive = ExecutionArchive(OUTPUT_FOLDER)
+_retention_lock = threading.Lock()
+
+# Scheduler: batasi jumlah test yang jalan bersamaan (default: jumlah CPU)
+MAX_WORKERS = int(os.environ.get('QA_DASHBOARD_MAX_WORKERS', '0')) or None
+DEFAULT_TEST_TIMEOUT = float(os.environ.get('QA_DASHBOARD_TEST_TIMEOUT', '0')) or None
+test_scheduler = TestScheduler(max_workers=MAX_WORKERS)
+_execution_sequence = itertools.count(1)
+
+# Mode shared: interval polling antrian SQLite dan batas heartbeat owner scheduler
+DISPATCH_INTERVAL = float(os.environ.get('QA_DASHBOARD_DISPATCH_INTERVAL', '0.5'))
+OWNER_TIMEOUT = float(os.environ.get('QA_DASHBOARD_OWNER_TIMEOUT', '10'))
+
+# Broker untuk push event SSE (status eksekusi & log baru)
+event_broker = EventBroker()
+LOG_TAIL_INTERVAL = float(os.environ.get('QA_DASHBOARD_TAIL_INTERVAL', '0.5'))
+
+def update_execution(execution_id, **fields):
+    """Update state eksekusi dan push transisinya ke client SSE"""
+    execution = test_executions.patch(execution_id, **fields)
+    if not test_executions.shared:
+        # Mode shared: event dikirim watcher di setiap worker (_watch_executions)
+        event_broker.publish('executions', 'execution', {
+            'execution_id': execution_id,
+            **execution
+        })
+    
+    if execution.get('status') in FINISHED_STATUSES and SERVER_ROLE != 'web':
+        enforce_retention()
+
+def output_path(execution_id, stream):
+    return os.path.join(OUTPUT_FOLDER, f'{execution_id}.{stream}')
+
+def read_output(execution_id, stream, since=0):
+    """Output sejak offset; eksekusi milik process lain dibaca dari spill file"""
+    outputs = test_outputs.get(execution_id)
+    if outputs:
+        return outputs[stream].read_text(since)
+    return OutputBuffer.read_spill(output_path(execution_id, stream), since)
+
+def output_size(execution_id, stream):
+    outputs = test_outputs.get(execution_id)
+    if outputs:
+        return outputs[stream].size
+    try:
+        return os.path.getsize(output_path(execution_id, stream))
+    except OSError:
+        return 0
+
+def execution_summary(execution_id, execution=None):
+    """Ringkasan eksekusi tanpa output (untuk history)"""
+    if execution is None:
+        execution = test_executions.get(execution_id)
+        if execution is None:
+            return None
+    
+    summary = {'execution_id': execution_id, **execution}
+    for stream in ('stdout', 'stderr'):
+        summary[f'{stream}_size'] = output_size(execution_id, stream)
+    return summary
+
+def execution_view(execution_id, since=0, stderr_since=0):
+    """State eksekusi + output sejak offset (byte) yang diminta"""
+    view = execution_summary(execution_id)
+    if view is None:
+        # Sudah di-evict dari memory, load dari arsip
+        view = execution_archive.get(execution_id)
+        if view is None:
+            return None
+        view['archived'] = True
+        view['stdout'], view['stdout_offset'] = execution_archive.read_output(execution_id, 'stdout', since)
+        view['stderr'], view['stderr_offset'] = execution_archive.read_output(execution_id, 'stderr', stderr_since)
+        return view
+    
+    view['stdout'], view['stdout_offset'] = read_output(execution_id, 'stdout', since)
+    view['stderr'], view['stderr_offset'] = read_output(execution_id, 'stderr', stderr_since)
+    return view
+
+def enforce_retention():
+    """
+    Evict eksekusi yang sudah selesai ke arsip kalau melewati batas jumlah
+    entry, total byte output di memory, atau umur (TTL).
+    """
+    with _retention_lock:
+        finished = [
+            (execution.get('end_time') or execution.get('queued_time') or '', execution_id)
+            for execution_id, execution in list(test_executions.items())
+            if execution.get('status') in FINISHED_STATUSES
+        ]
+        finished.sort()
+        
+        total_bytes = sum(
+            buffer.memory_size for outputs in list(test_outputs.values()) for buffer in outputs.values()
+        )
+        expired_before = datetime.fromtimestamp(time.time() - HISTORY_TTL).isoformat()
+        remaining = len(test_executions)
+        
+        for finished_at, execution_id in finished:
+            if (remaining <= HISTORY_MAX_ENTRIES and total_bytes <= HISTORY_MAX_BYTES
+                    and finished_at >= expired_before):
+                break
+            
+            summary = execution_summary(execution_id)
+            outputs = test_outputs.pop(execution_id, None)
+            if outputs:
+                total_bytes -= sum(buffer.memory_size for buffer in outputs.values())
+            test_executions.pop(execution_id, None)
+            remaining -= 1
+            
+            try:
+                execution_archive.add(summary)
+            except OSError as e:
+                print(f"Error archiving execution {execution_id}: {e}")
 
 class LogParser:
     """Parser untuk file log dengan berbagai format"""
     
+    # Milidetik opsional: QADashboardLogger menulis datefmt '%Y-%m-%d %H:%M:%S' tanpa ',mmm'
+    TEXT_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2}\s\d{2}:\d{2}:\d{2})(?:,\d+)?\s-\s(\w+)\s-\s(.+)')
+    
+    # Segment arsip dari rotasi QADashboardLogger (<nama>.<NNN>.json.gz / .zst)
+    LOG_EXTENSIONS = ('.log', '.json')
+    COMPRESSED_EXTENSIONS = ('.gz', '.zst')
+    
+    @staticmethod
+    def is_compressed(file_path):
+        return str(file_path).endswith(LogParser.COMPRESSED_EXTENSIONS)
+    
+    @staticmethod
+    def is_log_file(file_path):
+        name = str(file_path)
+        if LogParser.is_compressed(name):
+            name = os.path.splitext(name)[0]
+        return name.endswith(LogParser.LOG_EXTENSIONS)
+    
+    @staticmethod
+    def is_json(file_path):
+        name = str(file_path)
+        if LogParser.is_compressed(name):
+            name = os.path.splitext(name)[0]
+        return name.endswith('.json')
+    
+    @staticmethod
+    def open_log(file_path, mode='r'):
+        """Buka file log, segment .gz / .zst di-decompress secara streaming"""
+        binary = 'b' in mode
+        kwargs = {} if binary else {'encoding': 'utf-8', 'errors': 'replace'}
+        file_path = str(file_path)
+        if file_path.endswith('.gz'):
+            return gzip.open(file_path, 'rb' if binary else 'rt', **kwargs)
+        if file_path.endswith('.zst'):
+            if zstandard is None:
+                raise OSError(f"zstandard is required to read {file_path}")
+            return zstandard.open(file_path, 'rb' if binary else 'rt', **kwargs)
+        return open(file_path, 'rb' if binary else 'r', **kwargs)
+    
+    @staticmethod
+    def parse_text_line(line):
+        """Parse satu baris log text, return None kalau tidak match"""
+        match = LogParser.TEXT_PATTERN.match(line.strip())
+        if not match:
+            return None
+        timestamp, level, message = match.groups()
+        return {
+            'timestamp': timestamp,
+            'level': level,
+            'message': message
+        }
+    
+    @staticmethod
+    def parse_json_line(line):
+        """Parse satu baris JSONL, return None kalau bukan JSON valid"""
+        try:
+            return json.loads(line.strip())
+        except json.JSONDecodeError:
+            return None
+    
     @staticmethod
     def parse_text_log(file_path):
         logs = []
-        pattern = r'(\d{4}-\d{2}-\d{2}\s\d{2}:\d{2}:\d{2}),\d+\s-\s(\w+)\s-\s(.+)'
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with LogParser.open_log(file_path) as f:
                 for line in f:
-                    match = re.match(pattern, line.strip())
-                    if match:
-                        timestamp, level, message = match.groups()
-                        logs.append({
-                            'timestamp': timestamp,
-                            'level': level,
-                            'message': message
-                        })
+                    log_entry = LogParser.parse_text_line(line)
+                    if log_entry:
+                        logs.append(log_entry)
         except Exception as e:
             print(f"Error parsing {file_path}: {e}")
         
@@ -50,194 +277,1243 @@ class LogParser:
     def parse_json_log(file_path):
         logs = []
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with LogParser.open_log(file_path) as f:
                 for line in f:
-                    try:
-                        log_entry = json.loads(line.strip())
+                    log_entry = LogParser.parse_json_line(line)
+                    if log_entry is not None:
                         logs.append(log_entry)
-                    except json.JSONDecodeError:
-                        continue
         except Exception as e:
             print(f"Error parsing JSON log {file_path}: {e}")
         
         return logs
-
-class TestMetricsAnalyzer:
-    """Analyzer untuk metrik test automation"""
     
     @staticmethod
-    def analyze_test_results(logs):
-        metrics = {
-            'total_tests': 0,
-            'passed': 0,
-            'failed': 0,
-            'errors': 0,
-            'warnings': 0,
-            'total_duration': 0,
-            'test_cases': [],
-            'execution_timeline': []
-        }
+    def parse_line(file_path, line):
+        """Parse satu baris (bytes atau str) sesuai format file"""
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', errors='replace')
+        if LogParser.is_json(file_path):
+            return LogParser.parse_json_line(line)
+        return LogParser.parse_text_line(line)
+    
+    @staticmethod
+    def read_page(file_path, start_line=0, count=100, timestamp=None):
+        """
+        Baca count baris mulai dari start_line (atau dari baris pertama dengan
+        timestamp >= timestamp) lewat line index + mmap. Hanya baris yang
+        dikembalikan yang di-decode.
+        
+        Segment terkompresi tidak bisa di-mmap, jadi di-decompress secara
+        streaming sampai baris yang diminta.
+        
+        Return (entries, total_lines) - setiap entry punya field 'line'.
+        """
+        if LogParser.is_compressed(file_path):
+            return LogParser._read_compressed_page(file_path, start_line, count, timestamp)
+        
+        index = log_indexes.get(file_path)
+        if timestamp:
+            start_line = index.find_timestamp(timestamp)
         
-        for log in logs:
-            level = log.get('level', '').upper()
+        entries = []
+        for number, line in enumerate(index.read_lines(start_line, count), start_line):
+            log_entry = LogParser.parse_line(file_path, line)
+            if log_entry is not None:
+                log_entry['line'] = number
+                entries.append(log_entry)
+        return entries, index.line_count
+    
+    @staticmethod
+    def _read_compressed_page(file_path, start_line, count, timestamp):
+        timestamp = timestamp.replace('T', ' ') if timestamp else None
+        entries = []
+        total_lines = 0
+        with LogParser.open_log(file_path) as f:
+            for number, line in enumerate(f):
+                total_lines += 1
+                if len(entries) >= count or (not timestamp and number < start_line):
+                    continue
+                log_entry = LogParser.parse_line(file_path, line)
+                if log_entry is None:
+                    continue
+                if timestamp and not entries and str(log_entry.get('timestamp', '')).replace('T', ' ') < timestamp:
+                    continue
+                log_entry['line'] = number
+                entries.append(log_entry)
+        return entries, total_lines
+
+class LogIngestor:
+    """
+    Ingest log file secara incremental.
+    
+    Setiap file diingat berdasarkan path + inode + size/mtime beserta byte offset
+    terakhir yang sudah diparse, sehingga refresh berikutnya hanya membaca baris
+    yang baru di-append. Hanya metadata itu (bukan entry) yang disimpan di
+    cache_folder, jadi menulis cache tetap O(1) per append; setelah restart
+    entry di-parse ulang dari file sumber sampai offset tersimpan.
+    """
+    
+    CACHE_VERSION = 4
+    CACHE_FIELDS = ('path', 'inode', 'size', 'mtime', 'offset', 'version')
+    
+    def __init__(self, log_folder, cache_folder=None, keep_entries=True):
+        """
+        Args:
+            log_folder: Folder yang berisi file .log / .json
+            cache_folder: Folder untuk state per file (None = tidak dipersist)
+            keep_entries: False kalau entry cukup diteruskan ke listener
+                (misalnya SQLiteLogStore) tanpa disimpan di memory
+        """
+        self.log_folder = log_folder
+        self.cache_folder = cache_folder
+        self.keep_entries = keep_entries
+        self.files = {}
+        self.listeners = []
+        self.lock = threading.Lock()
+        # Fingerprint state folder log setelah refresh terakhir (untuk ETag)
+        self.fingerprint = None
+        self.last_modified = None
+    
+    def add_listener(self, listener):
+        """
+        Daftarkan consumer entry baru. Listener harus punya method
+        ingest(source_file, entries, offsets) dan discard(source_file).
+        Method remove(source_file) opsional: dipanggil kalau file dihapus dari
+        folder log (default: discard), discard untuk file yang di-rotate /
+        di-truncate dan akan dibaca ulang dari awal.
+        """
+        self.listeners.append(listener)
+    
+    def log_files(self):
+        return sorted(
+            path for path in glob.glob(os.path.join(self.log_folder, '*'))
+            if LogParser.is_log_file(path)
+        )
+    
+    def refresh(self):
+        """Scan folder log dan parse hanya data baru sejak refresh terakhir"""
+        with self.lock:
+            seen = set()
+            for path in self.log_files():
+                name = os.path.basename(path)
+                seen.add(name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                
+                state = self.files.get(name)
+                if state is None:
+                    state = self._load_state(name)
+                    if state is not None and not self._rewritten(path, state, stat):
+                        self._restore(path, state)
+                if state is None or self._rewritten(path, state, stat):
+                    # File baru, diganti (rotate), atau di-truncate -> baca ulang dari awal
+                    self._notify_discard(name)
+                    state = self._new_state(path, stat)
+                
+                self.files[name] = state
+                if state['size'] == stat.st_size and state['mtime'] == stat.st_mtime:
+                    continue
+                
+                changed = self._read_new(path, state)
+                state['size'] = stat.st_size
+                state['mtime'] = stat.st_mtime
+                if changed:
+                    self._save_state(name, state)
             
-            if level == 'ERROR':
-                metrics['errors'] += 1
-            elif level == 'WARNING':
-                metrics['warnings'] += 1
+            for name in set(self.files) - seen:
+                del self.files[name]
+                self._drop_state(name)
+                self._notify_remove(name)
             
-            message = log.get('message', '')
+            self.fingerprint = fingerprint(*(
+                (name, state['inode'], state['size'], state['mtime'])
+                for name, state in sorted(self.files.items())
+            ))
+            self.last_modified = max((state['mtime'] for state in self.files.values()), default=None)
+    
+    def warm(self, workers=None):
+        """
+        Cold start paralel: file yang belum punya state (cache kosong), dan di
+        mode memory juga file yang entry-nya harus di-parse ulang sampai offset
+        cache, di-parse di process pool, lalu sisanya dilanjutkan refresh() biasa.
+        Return jumlah file yang di-parse paralel.
+        """
+        with self.lock:
+            files = []
+            for path in self.log_files():
+                name = os.path.basename(path)
+                if name in self.files:
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                cached = self._load_state(name)
+                if cached is not None and (not self.keep_entries or self._rewritten(path, cached, stat)):
+                    # Tidak perlu di-parse ulang / harus dibaca dari awal oleh refresh()
+                    continue
+                files.append((path, stat, cached))
             
-            if 'PASSED' in message or 'SUCCESS' in message:
-                metrics['passed'] += 1
-                metrics['total_tests'] += 1
-            elif 'FAILED' in message or 'FAIL' in message:
-                metrics['failed'] += 1
-                metrics['total_tests'] += 1
+            parsed = bulk_ingest.parse_files(
+                [(path, cached['offset'] if cached else stat.st_size,
+                  LogParser.is_json(path), LogParser.is_compressed(path))
+                 for path, stat, cached in files],
+                LogParser.TEXT_PATTERN.pattern,
+                workers=workers
+            )
+            for (path, stat, cached), (_, entries, offsets, end_offset) in zip(files, parsed):
+                name = os.path.basename(path)
+                for log_entry in entries:
+                    log_entry['source_file'] = name
+                
+                state = cached
+                if state is None:
+                    state = self._new_state(path, stat)
+                    state.update(size=stat.st_size, mtime=stat.st_mtime, offset=end_offset)
+                if self.keep_entries:
+                    state['entries'], state['offsets'] = entries, offsets
+                self.files[name] = state
+                if cached is None:
+                    # File baru: buang sisa state lama (mis. sidecar index).
+                    # File dari cache tidak berubah, sidecar-nya tetap dipakai.
+                    self._notify_discard(name)
+                self._notify_ingest(name, entries, offsets)
+                if cached is None:
+                    self._save_state(name, state)
+        
+        self.refresh()
+        return len(files)
+    
+    def _notify_ingest(self, name, entries, offsets):
+        if not entries:
+            return
+        for listener in self.listeners:
+            listener.ingest(name, entries, offsets)
+    
+    def _notify_discard(self, name):
+        for listener in self.listeners:
+            listener.discard(name)
+    
+    def _notify_remove(self, name):
+        for listener in self.listeners:
+            getattr(listener, 'remove', listener.discard)(name)
+    
+    def entries(self, file_filter=None):
+        """Iterate semua entry yang sudah di-ingest"""
+        for name, state in list(self.files.items()):
+            if file_filter and file_filter not in name:
+                continue
+            yield from state['entries']
+    
+    def scan(self, cursor=None, file_filter=None, level=None, test_suite=None, since=None, until=None):
+        """
+        Yield (key, entry) terbaru dulu dengan k-way merge antar file.
+        
+        Setiap file sudah urut waktu (append-only), jadi cukup dibaca mundur lalu
+        di-merge, tanpa sort global. key = (timestamp, source_file, offset) dan
+        dipakai sebagai cursor pagination: hanya entry dengan key < cursor yang
+        di-yield. Filter diterapkan selama scan.
+        """
+        level = level.upper() if level else None
+        streams = []
+        for name, state in list(self.files.items()):
+            if file_filter and file_filter not in name:
+                continue
+            streams.append(self._scan_file(name, state, cursor, level, test_suite, since, until))
+        
+        return heapq.merge(*streams, key=lambda item: item[0], reverse=True)
+    
+    @staticmethod
+    def _scan_file(name, state, cursor, level, test_suite, since, until):
+        entries, offsets = state['entries'], state['offsets']
+        for i in range(len(offsets) - 1, -1, -1):
+            log_entry = entries[i]
+            timestamp = str(log_entry.get('timestamp', ''))
+            key = (timestamp, name, offsets[i])
             
-            duration_match = re.search(r'duration[:\s]+(\d+\.?\d*)\s*(s|ms|sec)', message, re.IGNORECASE)
-            if duration_match:
-                duration = float(duration_match.group(1))
-                unit = duration_match.group(2)
-                if unit in ['ms']:
-                    duration = duration / 1000
-                metrics['total_duration'] += duration
+            if cursor and key >= cursor:
+                continue
+            if until and timestamp > until:
+                continue
+            if since and timestamp < since:
+                # Sisa file lebih lama dari batas waktu
+                break
+            if level and str(log_entry.get('level', '')).upper() != level:
+                continue
+            if test_suite and log_entry.get('test_suite') != test_suite:
+                continue
             
-            test_match = re.search(r'test[_\s](\w+)|Test Case[:\s]+([^\s]+)', message, re.IGNORECASE)
-            if test_match:
-                test_name = test_match.group(1) or test_match.group(2)
-                status = 'passed' if 'PASSED' in message or 'SUCCESS' in message else 'failed'
-                metrics['test_cases'].append({
-                    'name': test_name,
-                    'status': status,
-                    'timestamp': log.get('timestamp', '')
-                })
+            yield key, log_entry
+    
+    @staticmethod
+    def encode_cursor(key):
+        return base64.urlsafe_b64encode(json.dumps(list(key)).encode('utf-8')).decode('ascii')
+    
+    @staticmethod
+    def decode_cursor(token):
+        """Decode cursor dari query string, raise ValueError kalau tidak valid"""
+        try:
+            timestamp, name, offset = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+            return (str(timestamp), str(name), int(offset))
+        except (TypeError, ValueError, UnicodeError):
+            raise ValueError(f'Invalid cursor: {token}')
+    
+    def _new_state(self, path, stat):
+        return {
+            'path': path,
+            'inode': stat.st_ino,
+            'size': -1,
+            'mtime': None,
+            'offset': 0,
+            'entries': [],
+            'offsets': [],
+            'version': self.CACHE_VERSION
+        }
+    
+    @staticmethod
+    def _rewritten(path, state, stat):
+        """File diganti (rotate) atau di-truncate sejak state dibuat"""
+        if state['inode'] != stat.st_ino:
+            return True
+        if LogParser.is_compressed(path):
+            # Segment arsip immutable (offset-nya dihitung dari data yang sudah
+            # di-decompress); kalau berubah setelah dibaca berarti ditulis ulang
+            return state['offset'] > 0 and (state['size'], state['mtime']) != (stat.st_size, stat.st_mtime)
+        return stat.st_size < state['offset']
+    
+    def _restore(self, path, state):
+        """Isi ulang entry state dari cache dengan parse file sumber sampai offset tersimpan"""
+        if not self.keep_entries:
+            # Entry sudah ada di listener yang persisten (SQLiteLogStore)
+            return
+        end, state['offset'] = state['offset'], 0
+        if LogParser.is_compressed(path):
+            restored = self._read_compressed(path, state)
+        else:
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read(end)
+            except OSError as e:
+                print(f"Error reading {path}: {e}")
+                data = None
+            restored = data is not None
+            if restored:
+                self._ingest_lines(path, state, data.splitlines(keepends=True))
+        if not restored:
+            # Paksa refresh membaca sisa file
+            state['size'] = -1
+    
+    def _read_new(self, path, state):
+        """Baca byte setelah offset terakhir, hanya baris yang sudah lengkap"""
+        if LogParser.is_compressed(path):
+            return self._read_compressed(path, state)
+        
+        try:
+            with open(path, 'rb') as f:
+                f.seek(state['offset'])
+                data = f.read()
+        except OSError as e:
+            print(f"Error reading {path}: {e}")
+            return False
+        
+        end = data.rfind(b'\n')
+        if end < 0:
+            # Belum ada baris lengkap, tunggu sampai writer selesai menulis
+            return False
+        
+        self._ingest_lines(path, state, data[:end + 1].splitlines(keepends=True))
+        return True
+    
+    def _read_compressed(self, path, state):
+        """Segment arsip dibaca sekali secara streaming (decompress per chunk)"""
+        try:
+            with LogParser.open_log(path, 'rb') as f:
+                self._ingest_lines(path, state, f)
+        except (OSError, EOFError) as e:
+            print(f"Error reading {path}: {e}")
+            return False
+        return True
+    
+    def _ingest_lines(self, path, state, lines):
+        parse_line = LogParser.parse_json_line if LogParser.is_json(path) else LogParser.parse_text_line
+        name = os.path.basename(path)
+        line_offset = state['offset']
+        new_entries, new_offsets = [], []
+        for line in lines:
+            log_entry = parse_line(line.decode('utf-8', errors='replace'))
+            if isinstance(log_entry, dict):
+                log_entry['source_file'] = name
+                new_entries.append(log_entry)
+                new_offsets.append(line_offset)
+            line_offset += len(line)
+        
+        if self.keep_entries:
+            state['entries'].extend(new_entries)
+            state['offsets'].extend(new_offsets)
+        self._notify_ingest(name, new_entries, new_offsets)
+        state['offset'] = line_offset
+    
+    def _cache_path(self, name):
+        return os.path.join(self.cache_folder, name + '.json')
+    
+    def _load_state(self, name):
+        if not self.cache_folder:
+            return None
+        # JSON, bukan pickle: folder log bisa ditulis oleh producer log mana pun
+        try:
+            with open(self._cache_path(name), 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if not isinstance(state, dict) or state.get('version') != self.CACHE_VERSION:
+            return None
+        if not all(isinstance(state.get(field), int) for field in ('inode', 'size', 'offset')):
+            return None
+        if not isinstance(state.get('mtime'), (int, float, type(None))):
+            return None
+        state.update(entries=[], offsets=[])
+        return state
+    
+    def _save_state(self, name, state):
+        if not self.cache_folder:
+            return
+        tmp_path = f'{self._cache_path(name)}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({field: state[field] for field in self.CACHE_FIELDS}, f)
+            os.replace(tmp_path, self._cache_path(name))
+        except OSError as e:
+            print(f"Error saving ingest cache for {name}: {e}")
+    
+    def _drop_state(self, name):
+        if not self.cache_folder:
+            return
+        try:
+            os.remove(self._cache_path(name))
+        except OSError:
+            pass
+
+class MetricsAggregator:
+    """
+    Aggregator metrik yang stateful.
+    
+    Entry baru di-fold ke running counter (total, per level, per suite, per
+    test) saat di-ingest, sehingga /api/metrics cukup membaca state yang sudah
+    ada. Kontribusi setiap source file disimpan terpisah supaya bisa dikurangi
+    lagi kalau file tersebut di-rotate atau dihapus.
+    """
+    
+    RESULT_PATTERN = re.compile(r'Test (PASSED|FAILED|SKIPPED):\s*([^\s|]+)')
+    DURATION_PATTERN = re.compile(r'duration[:\s]+(\d+\.?\d*)\s*(s|ms|sec)', re.IGNORECASE)
+    STATUSES = ('passed', 'failed', 'skipped')
+    
+    def __init__(self, max_test_cases=100):
+        self.lock = threading.Lock()
+        self.file_counts = defaultdict(Counter)
+        self.totals = Counter()
+        self.levels = Counter()
+        self.suites = defaultdict(Counter)
+        self.tests = defaultdict(Counter)
+        self.test_cases = deque(maxlen=max_test_cases)
+        # Sketch durasi per source file: {source_file: {(kind, name): DurationSketch}}
+        self.file_sketches = defaultdict(dict)
+        # Sketch gabungan semua file, di-update bersamaan dengan sketch per file.
+        # Selama key hanya ada di satu file, sketch gabungan = sketch file itu
+        # (objek sama); key di combined_sketches punya sketch gabungan sendiri.
+        self.sketches = {}
+        self.combined_sketches = set()
+        # Statistik per suite / test di snapshot, dihitung ulang hanya untuk yang berubah
+        self.group_stats = {'suite': {}, 'test': {}}
+        self.dirty = set()
+        self._snapshot = None
+    
+    def ingest(self, source_file, entries, offsets=None):
+        """Fold entry baru ke dalam state"""
+        with self.lock:
+            counts = self.file_counts[source_file]
+            for log_entry in entries:
+                self._fold(counts, source_file, log_entry)
+            self._snapshot = None
+    
+    def discard(self, source_file):
+        """Hapus kontribusi satu source file dari state"""
+        with self.lock:
+            sketches = self.file_sketches.pop(source_file, None)
+            if sketches:
+                # Gabung ulang hanya sketch yang ikut berisi data file ini
+                contributors = defaultdict(list)
+                for other in self.file_sketches.values():
+                    for key in sketches.keys() & other.keys():
+                        contributors[key].append(other[key])
+                for key in sketches:
+                    self.combined_sketches.discard(key)
+                    others = contributors.get(key)
+                    if not others:
+                        self.sketches.pop(key, None)
+                    elif len(others) == 1:
+                        self.sketches[key] = others[0]
+                    else:
+                        self.sketches[key] = merge_sketches(others)
+                        self.combined_sketches.add(key)
+            counts = self.file_counts.pop(source_file, None)
+            if not counts:
+                return
+            for key, value in counts.items():
+                self._apply(key, -value)
+                if isinstance(key, tuple) and key[0] != 'level':
+                    self.dirty.add(key[:2])
+            self.test_cases = deque(
+                (tc for tc in self.test_cases if tc['source_file'] != source_file),
+                maxlen=self.test_cases.maxlen
+            )
+            self._snapshot = None
+    
+    def _apply(self, key, value):
+        if isinstance(key, str):
+            self.totals[key] += value
+            return
         
-        if metrics['total_tests'] > 0:
-            metrics['pass_rate'] = round((metrics['passed'] / metrics['total_tests']) * 100, 2)
-            metrics['fail_rate'] = round((metrics['failed'] / metrics['total_tests']) * 100, 2)
-            metrics['avg_duration'] = round(metrics['total_duration'] / metrics['total_tests'], 2)
+        kind, name, field = key
+        target = {'level': self.levels, 'suite': self.suites, 'test': self.tests}[kind]
+        if kind == 'level':
+            target[name] += value
         else:
-            metrics['pass_rate'] = 0
-            metrics['fail_rate'] = 0
-            metrics['avg_duration'] = 0
+            target[name][field] += value
+        
+        # Bersihkan key yang sudah kosong setelah discard (sisa float di 'duration' diabaikan)
+        if kind != 'level' and not any(target[name][status] > 0 for status in self.STATUSES):
+            del target[name]
+        elif kind == 'level' and target[name] <= 0:
+            del target[name]
+    
+    def _add(self, counts, key, value=1):
+        counts[key] += value
+        self._apply(key, value)
+    
+    @classmethod
+    def extract_result(cls, log_entry):
+        """
+        Ambil (status, test_name, duration) dari entry.
+        
+        Pakai field terstruktur yang ditulis QADashboardLogger, fallback ke
+        parsing message untuk log text yang tidak punya field tersebut.
+        """
+        if 'status' in log_entry:
+            status = str(log_entry.get('status') or '').lower()
+            if status not in cls.STATUSES:
+                return None, None, None
+            duration = log_entry.get('duration')
+            duration = float(duration) if isinstance(duration, (int, float)) else None
+            return status, log_entry.get('test_name'), duration
+        
+        message = str(log_entry.get('message', ''))
+        match = cls.RESULT_PATTERN.search(message)
+        if not match:
+            return None, None, None
+        
+        duration = None
+        duration_match = cls.DURATION_PATTERN.search(message)
+        if duration_match:
+            duration = float(duration_match.group(1))
+            if duration_match.group(2) == 'ms':
+                duration = duration / 1000
+        return match.group(1).lower(), match.group(2), duration
+    
+    def _fold(self, counts, source_file, log_entry):
+        level = str(log_entry.get('level', '')).upper()
+        self._add(counts, ('level', level, None))
+        if level == 'ERROR':
+            self._add(counts, 'errors')
+        elif level == 'WARNING':
+            self._add(counts, 'warnings')
+        
+        status, test_name, duration = self.extract_result(log_entry)
+        if status is None:
+            return
         
-        return metrics
+        suite = log_entry.get('test_suite') or source_file
+        test_name = test_name or 'unknown'
+        self._add(counts, status)
+        self._add(counts, ('suite', suite, status))
+        self._add(counts, ('test', test_name, status))
+        self.dirty.update((('suite', suite), ('test', test_name)))
+        if duration is not None and status != 'skipped':
+            self._add(counts, 'total_duration', duration)
+            self._add(counts, ('suite', suite, 'duration'), duration)
+            self._add(counts, ('test', test_name, 'duration'), duration)
+            sketches = self.file_sketches[source_file]
+            for key in (('all', None), ('suite', suite), ('test', test_name)):
+                sketch = sketches.get(key)
+                if sketch is None:
+                    sketch = sketches[key] = DurationSketch()
+                sketch.add(duration)
+                merged = self.sketches.get(key)
+                if merged is None:
+                    self.sketches[key] = sketch
+                elif merged is not sketch:
+                    if key not in self.combined_sketches:
+                        # File kedua untuk key ini: pisahkan sketch gabungan
+                        merged = self.sketches[key] = DurationSketch().merge(merged)
+                        self.combined_sketches.add(key)
+                    merged.add(duration)
+        
+        self.test_cases.append({
+            'name': test_name,
+            'status': status,
+            'duration': duration,
+            'test_suite': suite,
+            'timestamp': log_entry.get('timestamp', ''),
+            'source_file': source_file
+        })
+    
+    @staticmethod
+    def _summarize(counter):
+        passed = counter['passed']
+        failed = counter['failed']
+        total = passed + failed
+        return {
+            'total_tests': total,
+            'passed': passed,
+            'failed': failed,
+            'skipped': counter['skipped'],
+            'total_duration': round(counter['duration'], 3),
+            'pass_rate': round(passed / total * 100, 2) if total else 0,
+            'avg_duration': round(counter['duration'] / total, 2) if total else 0
+        }
+    
+    def _refresh_group_stats(self):
+        """Hitung ulang statistik suite / test yang berubah sejak snapshot terakhir"""
+        empty = DurationSketch()
+        for kind, name in self.dirty:
+            counters = self.suites if kind == 'suite' else self.tests
+            if name in counters:
+                self.group_stats[kind][name] = {
+                    **self._summarize(counters[name]),
+                    **self.sketches.get((kind, name), empty).summary()
+                }
+            else:
+                self.group_stats[kind].pop(name, None)
+        self.dirty.clear()
+    
+    def snapshot(self):
+        """Return metrik saat ini; di-cache sampai ada entry baru"""
+        with self.lock:
+            if self._snapshot is not None:
+                return self._snapshot
+            
+            self._refresh_group_stats()
+            empty = DurationSketch()
+            
+            passed = self.totals['passed']
+            failed = self.totals['failed']
+            total_tests = passed + failed
+            total_duration = self.totals['total_duration']
+            
+            metrics = {
+                'total_tests': total_tests,
+                'passed': passed,
+                'failed': failed,
+                'skipped': self.totals['skipped'],
+                'errors': self.totals['errors'],
+                'warnings': self.totals['warnings'],
+                'total_duration': round(total_duration, 3),
+                'levels': dict(self.levels),
+                'suites': dict(self.group_stats['suite']),
+                'tests': dict(self.group_stats['test']),
+                'test_cases': list(reversed(self.test_cases)),
+                'execution_timeline': [],
+                'histogram_bounds': HISTOGRAM_BOUNDS,
+                **self.sketches.get(('all', None), empty).summary()
+            }
+            
+            if total_tests > 0:
+                metrics['pass_rate'] = round((passed / total_tests) * 100, 2)
+                metrics['fail_rate'] = round((failed / total_tests) * 100, 2)
+                metrics['avg_duration'] = round(total_duration / total_tests, 2)
+            else:
+                metrics['pass_rate'] = 0
+                metrics['fail_rate'] = 0
+                metrics['avg_duration'] = 0
+            
+            self._snapshot = metrics
+            return metrics
+
+class TestMetricsAnalyzer:
+    """Analyzer untuk metrik test automation"""
+    
+    @staticmethod
+    def analyze_test_results(logs):
+        """Hitung metrik dari list log sekali jalan (tanpa state)"""
+        aggregator = MetricsAggregator(max_test_cases=None)
+        aggregator.ingest('', logs)
+        return aggregator.snapshot()
 
 class TestRunner:
     """Class untuk menjalankan test automation"""
     
     @staticmethod
-    def run_python_test(test_file, execution_id):
+    def _run_command(command, execution_id, timeout=None):
+        """Jalankan command test sebagai process group yang bisa di-cancel / timeout"""
+        TestRunner._run_commands([command], execution_id, timeout)
+    
+    @staticmethod
+    def _run_commands(commands, execution_id, timeout=None, shards=None):
+        """
+        Jalankan satu atau beberapa command (shard) paralel dalam satu eksekusi.
+        Output shard digabung per baris dengan prefix [shard N].
+        """
+        update_execution(execution_id, status='running', start_time=datetime.now().isoformat())
+        
+        outputs = {
+            stream: OutputBuffer(output_path(execution_id, stream), OUTPUT_MEMORY_LIMIT)
+            for stream in ('stdout', 'stderr')
+        }
+        test_outputs[execution_id] = outputs
+        
+        processes, readers = [], []
+        try:
+            for index, command in enumerate(commands):
+                process = subprocess.Popen(
+                    command,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    cwd=os.path.dirname(os.path.abspath(__file__)),
+                    **PROCESS_GROUP_KWARGS
+                )
+                test_scheduler.register_process(execution_id, process)
+                processes.append(process)
+                
+                # Drain pipe secara incremental supaya output bisa dibaca selagi test berjalan
+                for stream in ('stdout', 'stderr'):
+                    pipe = getattr(process, stream)
+                    if len(commands) > 1:
+                        target, args = outputs[stream].drain_lines, (pipe, f'[shard {index + 1}] '.encode())
+                    else:
+                        target, args = outputs[stream].drain, (pipe,)
+                    readers.append(threading.Thread(target=target, args=args, daemon=True))
+        except Exception:
+            # Shard berikutnya gagal start: matikan shard yang sudah jalan sebelum
+            # error dilaporkan (caller menandai eksekusi failed)
+            for process in processes:
+                kill_process_tree(process)
+                process.wait()
+                process.stdout.close()
+                process.stderr.close()
+            test_scheduler.unregister_process(execution_id)
+            for buffer in outputs.values():
+                buffer.close()
+            raise
+        
+        for reader in readers:
+            reader.start()
+        
+        status = 'completed'
+        deadline = time.monotonic() + timeout if timeout else None
+        try:
+            for process in processes:
+                remaining = max(deadline - time.monotonic(), 0) if deadline else None
+                try:
+                    process.wait(timeout=remaining)
+                except subprocess.TimeoutExpired:
+                    status = 'timeout'
+                    for running_process in processes:
+                        kill_process_tree(running_process)
+                        running_process.wait()
+                    break
+        finally:
+            test_scheduler.unregister_process(execution_id)
+            for reader in readers:
+                reader.join()
+            for buffer in outputs.values():
+                buffer.close()
+        
+        if test_scheduler.is_cancelled(execution_id):
+            status = 'cancelled'
+        
+        exit_codes = [process.returncode for process in processes]
+        fields = {}
+        if shards is not None:
+            for shard, exit_code in zip(shards, exit_codes):
+                shard['exit_code'] = exit_code
+            fields['shards'] = shards
+        
+        update_execution(
+            execution_id,
+            status=status,
+            end_time=datetime.now().isoformat(),
+            exit_code=next((code for code in exit_codes if code != 0), 0),
+            **fields
+        )
+    
+    @staticmethod
+    def run_python_test(test_file, execution_id, timeout=None):
         """Run Python test file"""
         try:
             test_path = os.path.join(TEST_FOLDER, test_file)
-            
-            # Update status
-            test_executions[execution_id]['status'] = 'running'
-            test_executions[execution_id]['start_time'] = datetime.now().isoformat()
-            
-            # Run test menggunakan subprocess
-            result = subprocess.run(
-                ['python', test_path],
-                capture_output=True,
-                text=True,
-                cwd=os.path.dirname(os.path.abspath(__file__))
-            )
-            
-            # Update hasil
-            test_executions[execution_id]['status'] = 'completed'
-            test_executions[execution_id]['end_time'] = datetime.now().isoformat()
-            test_executions[execution_id]['exit_code'] = result.returncode
-            test_executions[execution_id]['stdout'] = result.stdout
-            test_executions[execution_id]['stderr'] = result.stderr
-            
+            TestRunner._run_command(['python', test_path], execution_id, timeout)
         except Exception as e:
-            test_executions[execution_id]['status'] = 'failed'
-            test_executions[execution_id]['error'] = str(e)
+            update_execution(execution_id, status='failed', error=str(e))
     
     @staticmethod
-    def run_pytest_test(test_file, execution_id):
+    def run_pytest_test(test_file, execution_id, timeout=None):
         """Run Pytest test file"""
         try:
             test_path = os.path.join(TEST_FOLDER, test_file)
-            
-            test_executions[execution_id]['status'] = 'running'
-            test_executions[execution_id]['start_time'] = datetime.now().isoformat()
-            
             # Run pytest dengan output verbose
-            result = subprocess.run(
-                ['pytest', test_path, '-v', '--tb=short'],
-                capture_output=True,
-                text=True,
-                cwd=os.path.dirname(os.path.abspath(__file__))
-            )
+            TestRunner._run_command(['pytest', test_path, '-v', '--tb=short'], execution_id, timeout)
+        except Exception as e:
+            update_execution(execution_id, status='failed', error=str(e))
+    
+    @staticmethod
+    def run_sharded_pytest_test(test_file, execution_id, timeout=None, num_shards=2):
+        """
+        Run Pytest test file paralel di beberapa process. Test dibagi ke shard
+        berdasarkan durasi historis, yang terakhir gagal dijalankan duluan.
+        """
+        try:
+            test_path = os.path.join(TEST_FOLDER, test_file)
+            node_ids = collect_tests(test_path, cwd=os.path.dirname(os.path.abspath(__file__)))
+            if not node_ids:
+                TestRunner._run_command(['pytest', test_path, '-v', '--tb=short'], execution_id, timeout)
+                return
             
-            test_executions[execution_id]['status'] = 'completed'
-            test_executions[execution_id]['end_time'] = datetime.now().isoformat()
-            test_executions[execution_id]['exit_code'] = result.returncode
-            test_executions[execution_id]['stdout'] = result.stdout
-            test_executions[execution_id]['stderr'] = result.stderr
+            log_ingestor.refresh()
+            durations, failed = load_test_history(metrics_source.snapshot(), test_rollups.last_statuses())
+            shards = plan_shards(node_ids, durations, failed, num_shards)
             
+            commands = [['pytest', '-v', '--tb=short', *shard['tests']] for shard in shards]
+            shard_info = [
+                {
+                    'shard': index + 1,
+                    'tests': len(shard['tests']),
+                    'previously_failed': shard['previously_failed'],
+                    'estimated_duration': shard['estimated_duration']
+                }
+                for index, shard in enumerate(shards)
+            ]
+            TestRunner._run_commands(commands, execution_id, timeout, shards=shard_info)
         except Exception as e:
-            test_executions[execution_id]['status'] = 'failed'
-            test_executions[execution_id]['error'] = str(e)
+            update_execution(execution_id, status='failed', error=str(e))
+
+# Runner per nama, supaya eksekusi di antrian shared bisa dijalankan process lain
+TEST_RUNNERS = {
+    'python': TestRunner.run_python_test,
+    'pytest': TestRunner.run_pytest_test,
+    'pytest_sharded': TestRunner.run_sharded_pytest_test
+}
+
+def runner_slots(runner, args):
+    """Jumlah slot scheduler (process paralel) yang dipakai satu eksekusi"""
+    if runner == 'pytest_sharded':
+        return args[3]
+    return 1
+
+if LOG_STORE == 'sqlite':
+    # Entry langsung masuk SQLite; query dan agregasi dijalankan di database.
+    # State offset disimpan terpisah dari mode memory karena entry tidak ikut dipersist.
+    os.makedirs(SQLITE_CACHE_FOLDER, exist_ok=True)
+    log_store = SQLiteLogStore(LOG_DB_PATH, MetricsAggregator.extract_result)
+    log_ingestor = LogIngestor(LOG_FOLDER, SQLITE_CACHE_FOLDER, keep_entries=False)
+    log_ingestor.add_listener(log_store)
+    log_source = metrics_source = log_store
+else:
+    log_store = None
+    log_ingestor = LogIngestor(LOG_FOLDER, CACHE_FOLDER)
+    metrics_aggregator = MetricsAggregator()
+    log_ingestor.add_listener(metrics_aggregator)
+    log_source, metrics_source = log_ingestor, metrics_aggregator
+
+log_indexes = LogIndexCache(INDEX_FOLDER)
+log_ingestor.add_listener(log_indexes)
+
+step_profiler = StepProfiler()
+if log_store is not None:
+    # Entry lama tidak di-ingest ulang di mode sqlite, isi profiler dari database
+    for source_file, group in itertools.groupby(log_store.step_entries(), key=lambda row: row[0]):
+        step_profiler.ingest(source_file, [log_entry for _, log_entry in group])
+log_ingestor.add_listener(step_profiler)
+
+# Rollup dipersist, jadi trend tidak bergantung pada log mentah yang masih ada
+test_rollups = TestRollups(MetricsAggregator.extract_result, db_path=ROLLUP_DB_PATH)
+if log_store is not None and not test_rollups.files:
+    # Database rollup baru: isi sekali dari entry yang sudah ada di log store
+    for source_file, group in itertools.groupby(log_store.result_entries(), key=lambda row: row[0]):
+        test_rollups.ingest(source_file, [log_entry for _, log_entry in group])
+# File log yang dihapus selagi dashboard mati: pindahkan rollup-nya ke arsip
+for source_file in set(test_rollups.files) - {ARCHIVED} - {
+        os.path.basename(path) for path in log_ingestor.log_files()}:
+    test_rollups.remove(source_file)
+log_ingestor.add_listener(test_rollups)
+log_ingestor.add_listener(event_broker)
+
+_log_tailer = None
+_log_tailer_lock = threading.Lock()
+
+def _tail_logs():
+    """Refresh ingestor secara periodik selama ada client SSE yang subscribe log"""
+    while True:
+        if event_broker.has_subscribers('logs'):
+            try:
+                log_ingestor.refresh()
+            except Exception as e:
+                print(f"Error tailing logs: {e}")
+        time.sleep(LOG_TAIL_INTERVAL)
+
+def _ensure_log_tailer():
+    global _log_tailer
+    with _log_tailer_lock:
+        if _log_tailer is None:
+            _log_tailer = threading.Thread(target=_tail_logs, daemon=True)
+            _log_tailer.start()
+
+_execution_watcher = None
+
+def _watch_executions():
+    """Mode shared: push perubahan eksekusi dari process mana pun ke client SSE process ini"""
+    version = test_executions.version
+    while True:
+        time.sleep(LOG_TAIL_INTERVAL)
+        if not event_broker.has_subscribers('executions'):
+            version = test_executions.version
+            continue
+        try:
+            for version, execution_id, execution in test_executions.changes_since(version):
+                event_broker.publish('executions', 'execution', {
+                    'execution_id': execution_id,
+                    **execution
+                })
+        except Exception as e:
+            print(f"Error watching executions: {e}")
+
+def _ensure_execution_watcher():
+    global _execution_watcher
+    with _log_tailer_lock:
+        if _execution_watcher is None:
+            _execution_watcher = threading.Thread(target=_watch_executions, daemon=True)
+            _execution_watcher.start()
+
+def _run_claimed(execution_id, runner, args):
+    try:
+        # Mulai jalan: owner pengganti tidak boleh mengembalikannya ke antrian
+        test_executions.start(execution_id)
+        TEST_RUNNERS[runner](*args)
+    finally:
+        test_executions.release(execution_id)
+
+def _dispatch_once():
+    """Satu putaran owner: ambil antrian shared, teruskan cancel, publish statistik"""
+    # Hanya sebanyak slot yang kosong, sisanya tetap di antrian bersama
+    for execution_id, runner, args, priority in test_executions.claim(test_scheduler.idle_slots(), runner_slots):
+        test_scheduler.submit(execution_id, _run_claimed, (execution_id, runner, args),
+                              priority=priority, slots=runner_slots(runner, args))
+    for execution_id in test_executions.cancel_requests():
+        if test_scheduler.cancel(execution_id) == 'queued':
+            # Belum mulai, jadi _run_claimed tidak akan dipanggil
+            test_executions.release(execution_id)
+            update_execution(execution_id, status='cancelled', end_time=datetime.now().isoformat())
+    test_executions.save_stats(test_scheduler.stats())
+
+def run_execution_dispatcher():
+    """
+    Loop owner scheduler untuk mode shared (blocking). Hanya satu process
+    yang memegang peran owner; process lain menunggu dan mengambil alih
+    kalau heartbeat owner berhenti lebih dari OWNER_TIMEOUT.
+    """
+    owner = f'{socket.gethostname()}:{os.getpid()}'
+    owning = False
+    while True:
+        try:
+            if test_executions.acquire_owner(owner, OWNER_TIMEOUT):
+                if not owning:
+                    owning = True
+                    failed, cancelled = test_executions.recover()
+                    for execution_id in failed:
+                        update_execution(
+                            execution_id,
+                            status='failed',
+                            end_time=datetime.now().isoformat(),
+                            error='Scheduler process stopped before the execution finished'
+                        )
+                    for execution_id in cancelled:
+                        update_execution(execution_id, status='cancelled', end_time=datetime.now().isoformat())
+                _dispatch_once()
+            else:
+                owning = False
+        except Exception as e:
+            print(f"Error dispatching executions: {e}")
+        time.sleep(DISPATCH_INTERVAL)
+
+def start_execution_dispatcher():
+    """Jalankan run_execution_dispatcher di background thread (mode shared, role all/scheduler)"""
+    if not test_executions.shared or SERVER_ROLE == 'web':
+        return None
+    dispatcher = threading.Thread(target=run_execution_dispatcher, daemon=True)
+    dispatcher.start()
+    return dispatcher
+
+def _positive_int(value):
+    value = int(value)
+    if value <= 0:
+        raise ValueError(f'Expected positive integer, got {value}')
+    return value
+
+# Body JSON yang sudah di-serialize per URL, valid selama fingerprint state sama
+response_cache = ResponseCache()
+
+def log_state_fingerprint():
+    """Refresh log lalu return (fingerprint, last_modified) folder log"""
+    log_ingestor.refresh()
+    return log_ingestor.fingerprint, log_ingestor.last_modified
+
+def execution_state_fingerprint():
+    """(fingerprint, None) state eksekusi + output eksekusi yang sedang berjalan + arsip"""
+    running_output = sum(
+        output_size(execution_id, stream)
+        for execution_id in test_executions.ids_with_status('running') for stream in ('stdout', 'stderr')
+    )
+    return fingerprint(
+        test_executions.version, len(test_executions), running_output, execution_archive.count()
+    ), None
+
+def cached_response(state_fingerprint):
+    """
+    Decorator endpoint GET: jawab dari cache selama fingerprint state sama,
+    kirim ETag / Last-Modified (304 kalau client masih punya versi terbaru)
+    dan kompres body besar dengan br / gzip sesuai Accept-Encoding.
+    Response error dan streaming tidak di-cache.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            token, last_modified = state_fingerprint()
+            key = request.full_path
+            entry = response_cache.get(key, token)
+            if entry is None:
+                response = app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                entry = response_cache.put(key, token, response.get_data(), response.mimetype, last_modified)
+            
+            encoding = ResponseCache.choose_encoding(request.headers.get('Accept-Encoding', ''), len(entry.body))
+            response = Response(entry.encode(encoding), mimetype=entry.mimetype)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+            response.vary.add('Accept-Encoding')
+            response.cache_control.no_cache = True
+            response.set_etag(entry.etag(encoding))
+            response.last_modified = entry.last_modified
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
 
 @app.route('/')
 def index():
-    return render_template('dashboard.html')
+    return render_template('dashboard.html', max_workers=test_scheduler.max_workers)
 
 @app.route('/api/logs')
+@cached_response(log_state_fingerprint)
 def get_logs():
-    level_filter = request.args.get('level', None)
-    file_filter = request.args.get('file', None)
+    """
+    List log terbaru dulu.
     
-    all_logs = []
-    log_files = glob.glob(os.path.join(LOG_FOLDER, '*.log')) + \
-                glob.glob(os.path.join(LOG_FOLDER, '*.json'))
+    Query params: level, file, test_suite, since, until (timestamp
+    'YYYY-MM-DD HH:MM:SS'), limit + cursor untuk pagination, dan
+    format=ndjson untuk streaming satu entry per baris.
+    """
+    try:
+        limit = request.args.get('limit', None)
+        limit = _positive_int(limit) if limit else None
+        cursor = request.args.get('cursor', None)
+        cursor = LogIngestor.decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     
-    for log_file in log_files:
-        if file_filter and file_filter not in os.path.basename(log_file):
-            continue
-        
-        if log_file.endswith('.json'):
-            logs = LogParser.parse_json_log(log_file)
-        else:
-            logs = LogParser.parse_text_log(log_file)
+    results = log_source.scan(
+        cursor=cursor,
+        file_filter=request.args.get('file', None),
+        level=request.args.get('level', None),
+        test_suite=request.args.get('test_suite', None),
+        since=request.args.get('since', None),
+        until=request.args.get('until', None)
+    )
+    
+    if request.args.get('format') == 'ndjson':
+        def generate():
+            last_key = None
+            for i, (key, log_entry) in enumerate(results):
+                if limit and i >= limit:
+                    yield json.dumps({'next_cursor': LogIngestor.encode_cursor(last_key)}) + '\n'
+                    return
+                last_key = key
+                yield json.dumps(log_entry) + '\n'
         
-        for log in logs:
-            log['source_file'] = os.path.basename(log_file)
-            all_logs.append(log)
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    
+    logs = []
+    next_cursor = None
+    for key, log_entry in results:
+        if limit and len(logs) >= limit:
+            next_cursor = LogIngestor.encode_cursor(last_key)
+            break
+        last_key = key
+        logs.append(log_entry)
     
-    if level_filter:
-        all_logs = [log for log in all_logs if log.get('level', '').upper() == level_filter.upper()]
+    return jsonify({
+        'success': True,
+        'count': len(logs),
+        'logs': logs,
+        'next_cursor': next_cursor
+    })
+
+@app.route('/api/logs/file/<filename>')
+def get_log_file_page(filename):
+    """
+    Baca satu file log mulai dari nomor baris atau timestamp tertentu
+    tanpa membaca baris-baris sebelumnya.
+    
+    Query params: line (default 0) atau timestamp, limit (default 100).
+    """
+    file_path = os.path.join(LOG_FOLDER, os.path.basename(filename))
+    if not LogParser.is_log_file(filename) or not os.path.isfile(file_path):
+        return jsonify({
+            'success': False,
+            'error': f'Log file not found: {filename}'
+        }), 404
+    
+    try:
+        line = int(request.args.get('line', 0))
+        if line < 0:
+            raise ValueError(f'Expected non-negative line, got {line}')
+        limit = _positive_int(request.args.get('limit', 100))
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     
-    all_logs.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+    timestamp = request.args.get('timestamp', None)
+    logs, total_lines = LogParser.read_page(file_path, line, limit, timestamp)
+    if logs:
+        start_line = logs[0]['line']
+    elif timestamp:
+        # Tidak ada baris dengan timestamp >= timestamp: halaman terakhir
+        start_line = total_lines
+    else:
+        start_line = min(line, total_lines)
+    end_line = logs[-1]['line'] + 1 if logs else start_line
     
     return jsonify({
         'success': True,
-        'count': len(all_logs),
-        'logs': all_logs
+        'file': os.path.basename(file_path),
+        'total_lines': total_lines,
+        'start_line': start_line,
+        'count': len(logs),
+        'logs': logs,
+        'next_line': end_line if end_line < total_lines else None
     })
 
 @app.route('/api/metrics')
+@cached_response(log_state_fingerprint)
 def get_metrics():
-    all_logs = []
-    log_files = glob.glob(os.path.join(LOG_FOLDER, '*.log')) + \
-                glob.glob(os.path.join(LOG_FOLDER, '*.json'))
+    metrics = metrics_source.snapshot()
     
-    for log_file in log_files:
-        if log_file.endswith('.json'):
-            logs = LogParser.parse_json_log(log_file)
-        else:
-            logs = LogParser.parse_text_log(log_file)
-        all_logs.extend(logs)
+    return jsonify({
+        'success': True,
+        'metrics': metrics
+    })
+
+@app.route('/api/metrics/steps')
+def get_step_metrics():
+    """
+    Ranking step paling lambat lintas run.
+    
+    Query params: sort (p50, p90, p99, max, mean, total, count; default p90),
+    limit (default 50), test (filter per test).
+    """
+    sort = request.args.get('sort', 'p90')
+    try:
+        limit = _positive_int(request.args.get('limit', 50))
+        if sort not in StepProfiler.SORT_FIELDS:
+            raise ValueError(f'sort must be one of {StepProfiler.SORT_FIELDS}, got {sort!r}')
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     
-    metrics = TestMetricsAnalyzer.analyze_test_results(all_logs)
+    log_ingestor.refresh()
+    steps = step_profiler.snapshot(sort=sort, limit=limit, test_name=request.args.get('test', None))
     
     return jsonify({
         'success': True,
-        'metrics': metrics
+        'count': len(steps),
+        'steps': steps
+    })
+
+@app.route('/api/metrics/trends')
+def get_metric_trends():
+    """
+    Trend pass/fail dan durasi per jam / per hari dari rollup.
+
+    Query params: granularity (hour, day; default day), test (default semua
+    test), since, until (timestamp atau tanggal, inklusif).
+    """
+    granularity = request.args.get('granularity', 'day')
+    if granularity not in GRANULARITIES:
+        return jsonify({
+            'success': False,
+            'error': f'granularity must be one of {tuple(GRANULARITIES)}, got {granularity!r}'
+        }), 400
+
+    log_ingestor.refresh()
+    trends = test_rollups.trends(
+        granularity=granularity,
+        test_name=request.args.get('test', None),
+        since=request.args.get('since', None),
+        until=request.args.get('until', None)
+    )
+
+    return jsonify({
+        'success': True,
+        'granularity': granularity,
+        'count': len(trends),
+        'trends': trends
+    })
+
+@app.route('/api/metrics/flaky')
+def get_flaky_tests():
+    """
+    Test dengan status paling sering berganti pass <-> fail.
+
+    Query params: window (jumlah run terakhir, default 20), min_runs (default 3),
+    min_score (0..1, default 0), limit (default 50).
+    """
+    try:
+        window = _positive_int(request.args.get('window', 20))
+        min_runs = _positive_int(request.args.get('min_runs', 3))
+        limit = _positive_int(request.args.get('limit', 50))
+        min_score = float(request.args.get('min_score', 0))
+        if window > test_rollups.max_runs:
+            raise ValueError(f'window must be <= {test_rollups.max_runs}, got {window}')
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+    log_ingestor.refresh()
+    tests = test_rollups.flaky_tests(window=window, min_runs=min_runs, min_score=min_score, limit=limit)
+
+    return jsonify({
+        'success': True,
+        'count': len(tests),
+        'tests': tests
     })
 
 @app.route('/api/tests/list')
@@ -250,10 +1526,15 @@ def list_tests():
     
     for test_file in py_files:
         stat = os.stat(test_file)
+        with open(test_file, 'r', encoding='utf-8', errors='replace') as f:
+            source = f.read()
+        # Script dengan __main__ dijalankan langsung, selain itu lewat pytest (bisa di-shard)
+        is_pytest = 'import pytest' in source or '__main__' not in source
+        
         test_files.append({
             'name': os.path.basename(test_file),
             'path': test_file,
-            'type': 'python',
+            'type': 'pytest' if is_pytest else 'python',
             'size': stat.st_size,
             'modified': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
         })
@@ -276,47 +1557,116 @@ def run_test():
             'error': 'test_file is required'
         }), 400
     
-    # Generate execution ID
-    execution_id = f"exec_{int(time.time())}_{test_file}"
+    try:
+        priority = int(data.get('priority', 0))
+        shards = int(data.get('shards', 1))
+        timeout = data.get('timeout', DEFAULT_TEST_TIMEOUT)
+        timeout = float(timeout) if timeout else None
+    except (TypeError, ValueError):
+        return jsonify({
+            'success': False,
+            'error': 'priority and shards must be integers and timeout a number of seconds'
+        }), 400
+    
+    # Setiap shard satu process, jadi dihitung terhadap kapasitas scheduler
+    if not 1 <= shards <= test_scheduler.max_workers:
+        return jsonify({
+            'success': False,
+            'error': f'shards must be between 1 and {test_scheduler.max_workers} (max workers)'
+        }), 400
+    
+    # Generate execution ID (pid: unik juga kalau beberapa worker process menerima request)
+    execution_id = f"exec_{int(time.time())}_{os.getpid()}_{next(_execution_sequence)}_{test_file}"
     
     # Initialize execution tracking
-    test_executions[execution_id] = {
+    test_executions[execution_id] = {}
+    update_execution(execution_id, **{
         'test_file': test_file,
         'test_type': test_type,
         'status': 'queued',
+        'priority': priority,
+        'num_shards': shards if test_type == 'pytest' else 1,
+        'timeout': timeout,
+        'queued_time': datetime.now().isoformat(),
         'start_time': None,
         'end_time': None,
         'exit_code': None,
-        'stdout': '',
-        'stderr': '',
         'error': None
-    }
+    })
     
-    # Run test di background thread
-    if test_type == 'pytest':
-        thread = threading.Thread(
-            target=TestRunner.run_pytest_test,
-            args=(test_file, execution_id)
-        )
+    # Masukkan ke antrian scheduler
+    if test_type == 'pytest' and shards > 1:
+        runner, args = 'pytest_sharded', (test_file, execution_id, timeout, shards)
+    elif test_type == 'pytest':
+        runner, args = 'pytest', (test_file, execution_id, timeout)
     else:
-        thread = threading.Thread(
-            target=TestRunner.run_python_test,
-            args=(test_file, execution_id)
-        )
+        runner, args = 'python', (test_file, execution_id, timeout)
+    if test_executions.shared:
+        # Dijalankan oleh process owner scheduler (run_execution_dispatcher)
+        test_executions.enqueue(execution_id, runner, args, priority=priority)
+    else:
+        test_scheduler.submit(execution_id, TEST_RUNNERS[runner], args,
+                              priority=priority, slots=runner_slots(runner, args))
+    
+    return jsonify({
+        'success': True,
+        'execution_id': execution_id,
+        'message': f'Test {test_file} queued'
+    })
+
+@app.route('/api/tests/cancel/<execution_id>', methods=['POST'])
+def cancel_test(execution_id):
+    """Cancel eksekusi yang masih di antrian atau sedang berjalan"""
+    if execution_id not in test_executions:
+        return jsonify({
+            'success': False,
+            'error': 'Execution not found'
+        }), 404
+    
+    if test_executions.shared:
+        previous_state = test_executions.cancel(execution_id)
+    else:
+        previous_state = test_scheduler.cancel(execution_id)
+    if previous_state is None:
+        return jsonify({
+            'success': False,
+            'error': 'Execution is not queued or running'
+        }), 409
     
-    thread.daemon = True
-    thread.start()
+    if previous_state == 'queued':
+        update_execution(execution_id, status='cancelled', end_time=datetime.now().isoformat())
     
     return jsonify({
         'success': True,
         'execution_id': execution_id,
-        'message': f'Test {test_file} started'
+        'message': f'Execution {execution_id} cancelled'
+    })
+
+@app.route('/api/tests/queue')
+def get_test_queue():
+    """Statistik antrian scheduler (queue depth, wait time, worker)"""
+    return jsonify({
+        'success': True,
+        'queue': test_executions.queue_stats() if test_executions.shared else test_scheduler.stats()
     })
 
 @app.route('/api/tests/status/<execution_id>')
 def get_test_status(execution_id):
-    """Get status eksekusi test"""
-    if execution_id not in test_executions:
+    """
+    Get status eksekusi test. Query param since / stderr_since (byte offset)
+    untuk mengambil hanya output baru sejak request sebelumnya.
+    """
+    try:
+        since = int(request.args.get('since', 0))
+        stderr_since = int(request.args.get('stderr_since', 0))
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'since and stderr_since must be integers'
+        }), 400
+    
+    execution = execution_view(execution_id, since, stderr_since)
+    if execution is None:
         return jsonify({
             'success': False,
             'error': 'Execution not found'
@@ -324,27 +1674,68 @@ def get_test_status(execution_id):
     
     return jsonify({
         'success': True,
-        'execution': test_executions[execution_id]
+        'execution': execution
     })
 
 @app.route('/api/tests/history')
+@cached_response(execution_state_fingerprint)
 def get_test_history():
-    """Get history semua eksekusi test"""
-    history = []
-    for exec_id, exec_data in test_executions.items():
-        history.append({
-            'execution_id': exec_id,
-            **exec_data
-        })
+    """
+    Get history eksekusi test (ringkasan tanpa output, terbaru dulu).
+    Query params: limit, offset, archived=1 untuk ikut menampilkan arsip.
+    """
+    try:
+        limit = _positive_int(request.args.get('limit', 50))
+        offset = int(request.args.get('offset', 0))
+        if offset < 0:
+            raise ValueError(f'Expected non-negative offset, got {offset}')
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    include_archived = request.args.get('archived') in ('1', 'true')
+    
+    history = [execution_summary(execution_id, execution) for execution_id, execution in test_executions.items()]
     
-    # Sort by start time (terbaru dulu)
-    history.sort(key=lambda x: x.get('start_time', ''), reverse=True)
+    # Sort by waktu masuk antrian (terbaru dulu)
+    history.sort(key=lambda x: x.get('queued_time') or x.get('start_time') or '', reverse=True)
+    total = len(history)
+    page = history[offset:offset + limit]
+    
+    if include_archived:
+        total += execution_archive.count()
+        if len(page) < limit:
+            archive_offset = max(offset - len(history), 0)
+            page += execution_archive.list(archive_offset, limit - len(page))
     
     return jsonify({
         'success': True,
-        'history': history
+        'history': page,
+        'total': total,
+        'next_offset': offset + limit if offset + limit < total else None
     })
 
+@app.route('/api/stream')
+def stream_events():
+    """
+    Server-Sent Events: push transisi status eksekusi ('execution') dan
+    baris log baru ('log'). Query param channels=executions,logs.
+    
+    Event 'log' berisi {source_file, entries, skipped, end_offset}; kalau
+    skipped > 0 hanya entry terakhir yang dikirim.
+    """
+    channels = request.args.get('channels', 'executions,logs').split(',')
+    if 'logs' in channels:
+        _ensure_log_tailer()
+    if 'executions' in channels and test_executions.shared:
+        _ensure_execution_watcher()
+    
+    response = Response(stream_with_context(event_broker.stream(channels)), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @app.route('/api/health')
 def health_check():
     return jsonify({
@@ -354,4 +1745,8 @@ def health_check():
     })
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5005)
\ No newline at end of file
+    # Parse log yang belum ter-cache secara paralel sebelum mulai melayani request
+    log_ingestor.warm()
+    start_execution_dispatcher()
+    # Reloader debug menjalankan process kedua; owner scheduler harus satu
+    app.run(debug=True, host='0.0.0.0', port=5005, use_reloader=not test_executions.shared)
\ No newline at end of file
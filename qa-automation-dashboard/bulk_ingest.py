@@ -0,0 +1,146 @@
+"""
+Parse paralel untuk cold start QA Automation Dashboard
+
+File log (dan potongan file besar) dibagi ke process pool supaya parse
+JSONL/text saat cache masih kosong memakai semua core. Modul ini sengaja
+tidak meng-import app.py, jadi worker process tidak ikut menjalankan setup
+dashboard.
+"""
+
+import gzip
+import json
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+# Di bawah ukuran total ini overhead process pool lebih besar dari hasilnya
+PARALLEL_THRESHOLD = 8 * 1024 * 1024
+
+_patterns = {}
+
+
+def _parse_lines(lines, start_offset, is_json, text_pattern):
+    pattern = _patterns.get(text_pattern)
+    if pattern is None:
+        pattern = _patterns[text_pattern] = re.compile(text_pattern)
+
+    entries, offsets = [], []
+    offset = start_offset
+    for line in lines:
+        text = line.decode('utf-8', errors='replace').strip()
+        log_entry = None
+        if is_json:
+            try:
+                log_entry = json.loads(text)
+            except json.JSONDecodeError:
+                pass
+        else:
+            match = pattern.match(text)
+            if match:
+                timestamp, level, message = match.groups()
+                log_entry = {'timestamp': timestamp, 'level': level, 'message': message}
+        if isinstance(log_entry, dict):
+            entries.append(log_entry)
+            offsets.append(offset)
+        offset += len(line)
+    return entries, offsets, offset
+
+
+def parse_chunk(path, start, end, is_json, text_pattern):
+    """
+    Parse baris lengkap di byte range [start, end) file plain.
+    Return (entries, offsets, offset setelah baris lengkap terakhir).
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    last_newline = data.rfind(b'\n')
+    if last_newline < 0:
+        return [], [], start
+    return _parse_lines(data[:last_newline + 1].splitlines(keepends=True), start, is_json, text_pattern)
+
+
+def parse_compressed(path, is_json, text_pattern):
+    """Parse seluruh segment .gz / .zst secara streaming"""
+    if path.endswith('.zst'):
+        if zstandard is None:
+            raise OSError(f"zstandard is required to read {path}")
+        opener = zstandard.open
+    else:
+        opener = gzip.open
+    with opener(path, 'rb') as f:
+        return _parse_lines(f, 0, is_json, text_pattern)
+
+
+def plan_chunks(path, size, chunk_size):
+    """Potong file di batas baris, masing-masing kira-kira chunk_size byte"""
+    bounds = [0]
+    with open(path, 'rb') as f:
+        while bounds[-1] + chunk_size < size:
+            f.seek(bounds[-1] + chunk_size)
+            f.readline()
+            position = f.tell()
+            if position >= size:
+                break
+            bounds.append(position)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _pool_context():
+    # fork: worker tidak perlu meng-import ulang modul __main__ (app.py)
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def parse_files(files, text_pattern, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Parse banyak file sekaligus.
+
+    Args:
+        files: List (path, size, is_json, compressed)
+        text_pattern: Regex (string) baris log text, sama dengan LogParser.TEXT_PATTERN
+        workers: Jumlah process (default: jumlah CPU); 1 = serial di process ini
+        chunk_size: Ukuran potongan file plain yang besar
+
+    Yield (path, entries, offsets, end_offset) per file, urutan sesuai files.
+    """
+    tasks = []
+    for path, size, is_json, compressed in files:
+        if compressed:
+            tasks.append((path, [(parse_compressed, (path, is_json, text_pattern))]))
+        else:
+            tasks.append((path, [
+                (parse_chunk, (path, start, end, is_json, text_pattern))
+                for start, end in plan_chunks(path, size, chunk_size)
+            ]))
+
+    workers = workers or os.cpu_count() or 1
+    total_size = sum(size for _, size, _, _ in files)
+    if workers == 1 or total_size < PARALLEL_THRESHOLD:
+        for path, chunks in tasks:
+            yield (path, *_merge([func(*args) for func, args in chunks]))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as executor:
+        futures = [(path, [executor.submit(func, *args) for func, args in chunks]) for path, chunks in tasks]
+        for path, chunk_futures in futures:
+            yield (path, *_merge([future.result() for future in chunk_futures]))
+
+
+def _merge(results):
+    entries, offsets = [], []
+    end_offset = 0
+    for chunk_entries, chunk_offsets, chunk_end in results:
+        entries.extend(chunk_entries)
+        offsets.extend(chunk_offsets)
+        end_offset = chunk_end
+    return entries, offsets, end_offset
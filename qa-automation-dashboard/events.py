@@ -0,0 +1,89 @@
+"""
+Event broker untuk Server-Sent Events (SSE) di QA Automation Dashboard
+
+Perubahan status eksekusi test dan baris log baru di-publish sekali ke
+broker, lalu diteruskan ke setiap client /api/stream yang sedang terbuka.
+"""
+
+import json
+import queue
+import threading
+
+
+class EventBroker:
+    """Fan-out event ke semua subscriber SSE"""
+
+    def __init__(self, max_queue_size=1000, max_log_entries=200):
+        """
+        Args:
+            max_queue_size: Jumlah event yang di-buffer per subscriber
+            max_log_entries: Entry terbaru maksimum per event 'log'; sisanya
+                hanya dikirim jumlahnya (client memuat ulang lewat /api/logs)
+        """
+        self.max_queue_size = max_queue_size
+        self.max_log_entries = max_log_entries
+        self.subscribers = {}
+        self.lock = threading.Lock()
+
+    def subscribe(self, channels):
+        """Daftarkan subscriber baru, return queue miliknya"""
+        q = queue.Queue(maxsize=self.max_queue_size)
+        with self.lock:
+            self.subscribers[q] = set(channels)
+        return q
+
+    def unsubscribe(self, q):
+        with self.lock:
+            self.subscribers.pop(q, None)
+
+    def has_subscribers(self, channel=None):
+        with self.lock:
+            if channel is None:
+                return bool(self.subscribers)
+            return any(channel in channels for channels in self.subscribers.values())
+
+    def publish(self, channel, event, data):
+        """Kirim event ke subscriber channel; client yang terlalu lambat di-skip"""
+        message = self.format_event(event, data)
+        with self.lock:
+            targets = [q for q, channels in self.subscribers.items() if channel in channels]
+        for q in targets:
+            try:
+                q.put_nowait(message)
+            except queue.Full:
+                pass
+
+    def ingest(self, source_file, entries, offsets):
+        """
+        Listener LogIngestor: teruskan entry baru sebagai event 'log'.
+
+        Batch besar (file baru, cold start) dipotong ke max_log_entries entry
+        terakhir supaya event tetap kecil dan cepat di-encode di thread request.
+        """
+        if self.has_subscribers('logs'):
+            self.publish('logs', 'log', {
+                'source_file': source_file,
+                'entries': entries[-self.max_log_entries:],
+                'skipped': max(len(entries) - self.max_log_entries, 0),
+                'end_offset': offsets[-1] if offsets else None
+            })
+
+    def discard(self, source_file):
+        pass
+
+    @staticmethod
+    def format_event(event, data):
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    def stream(self, channels, heartbeat=15):
+        """Generator SSE untuk satu client, dengan heartbeat comment"""
+        q = self.subscribe(channels)
+        try:
+            yield ': connected\n\n'
+            while True:
+                try:
+                    yield q.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ': heartbeat\n\n'
+        finally:
+            self.unsubscribe(q)
@@ -0,0 +1,119 @@
+"""
+Arsip eksekusi test untuk QA Automation Dashboard
+
+Eksekusi lama yang dikeluarkan dari memory disimpan sebagai satu baris JSON
+ringkas di archive.jsonl, sedangkan output stdout/stderr-nya dikompres gzip.
+Detail dan output hanya dibaca dari disk saat satu eksekusi diminta.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import threading
+
+
+class ExecutionArchive:
+    """Arsip append-only untuk ringkasan eksekusi + output terkompresi"""
+
+    STREAMS = ('stdout', 'stderr')
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.archive_path = os.path.join(folder, 'archive.jsonl')
+        self.index = None
+        self.indexed_size = 0
+        self.lock = threading.Lock()
+
+    def _load_index(self):
+        """
+        Index execution_id -> byte offset di archive.jsonl. Dibangun sekali lalu
+        hanya baris yang di-append (oleh process ini atau process lain) yang dibaca.
+        """
+        try:
+            size = os.path.getsize(self.archive_path)
+        except OSError:
+            size = 0
+        if self.index is not None and size == self.indexed_size:
+            return self.index
+        if self.index is None or size < self.indexed_size:
+            self.index, self.indexed_size = {}, 0
+
+        try:
+            with open(self.archive_path, 'rb') as f:
+                f.seek(self.indexed_size)
+                offset = self.indexed_size
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        # Baris terakhir masih ditulis process lain
+                        break
+                    try:
+                        self.index[json.loads(line)['execution_id']] = offset
+                    except (ValueError, KeyError):
+                        pass
+                    offset += len(line)
+                self.indexed_size = offset
+        except FileNotFoundError:
+            pass
+        return self.index
+
+    def output_path(self, execution_id, stream):
+        return os.path.join(self.folder, f'{execution_id}.{stream}')
+
+    def add(self, summary):
+        """Arsipkan satu eksekusi dan kompres file output-nya"""
+        execution_id = summary['execution_id']
+        for stream in self.STREAMS:
+            path = self.output_path(execution_id, stream)
+            if not os.path.exists(path):
+                continue
+            with open(path, 'rb') as src, gzip.open(path + '.gz', 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(path)
+
+        line = (json.dumps(summary) + '\n').encode('utf-8')
+        with self.lock:
+            index = self._load_index()
+            with open(self.archive_path, 'ab') as f:
+                offset = f.tell()
+                f.write(line)
+            if offset == self.indexed_size:
+                index[execution_id] = offset
+                self.indexed_size = offset + len(line)
+
+    def __contains__(self, execution_id):
+        with self.lock:
+            return execution_id in self._load_index()
+
+    def count(self):
+        with self.lock:
+            return len(self._load_index())
+
+    def get(self, execution_id):
+        """Ringkasan eksekusi yang diarsipkan, atau None"""
+        with self.lock:
+            offset = self._load_index().get(execution_id)
+        if offset is None:
+            return None
+
+        with open(self.archive_path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def list(self, offset=0, limit=50):
+        """Ringkasan eksekusi terarsip, yang terakhir diarsipkan dulu"""
+        with self.lock:
+            ids = list(self._load_index())
+        ids.reverse()
+        return [summary for summary in map(self.get, ids[offset:offset + limit]) if summary]
+
+    def read_output(self, execution_id, stream, since=0):
+        """Return (text sejak offset since, offset berikutnya) dari output terkompresi"""
+        path = self.output_path(execution_id, stream) + '.gz'
+        try:
+            with gzip.open(path, 'rb') as f:
+                f.seek(max(since, 0))
+                data = f.read()
+                return data.decode('utf-8', errors='replace'), f.tell()
+        except FileNotFoundError:
+            return '', since
@@ -0,0 +1,307 @@
+"""
+Store state eksekusi test untuk QA Automation Dashboard
+
+MemoryExecutionStore menyimpan state di memory satu process (mode default).
+SQLiteExecutionStore menyimpan state eksekusi, antrian, permintaan cancel dan
+statistik scheduler di satu database SQLite (WAL), sehingga beberapa worker
+process bisa melayani API sementara hanya satu process scheduler (owner)
+yang menjalankan test.
+"""
+
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+
+
+class MemoryExecutionStore(dict):
+    """State eksekusi di dict process ini"""
+
+    shared = False
+
+    def __init__(self):
+        super().__init__()
+        self._versions = itertools.count(1)
+        self.version = 0
+
+    def patch(self, execution_id, **fields):
+        """Update field eksekusi, return state lengkapnya"""
+        execution = self[execution_id]
+        execution.update(fields)
+        self.version = next(self._versions)
+        return execution
+
+    def ids_with_status(self, status):
+        return [execution_id for execution_id, execution in list(self.items())
+                if execution.get('status') == status]
+
+
+class SQLiteExecutionStore(MutableMapping):
+    """State eksekusi + antrian bersama untuk beberapa process"""
+
+    shared = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS executions (
+            execution_id TEXT PRIMARY KEY,
+            status TEXT,
+            version INTEGER NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_executions_status ON executions(status);
+        CREATE INDEX IF NOT EXISTS idx_executions_version ON executions(version);
+        CREATE TABLE IF NOT EXISTS execution_queue (
+            sequence INTEGER PRIMARY KEY AUTOINCREMENT,
+            execution_id TEXT NOT NULL UNIQUE,
+            priority INTEGER NOT NULL,
+            runner TEXT NOT NULL,
+            args TEXT NOT NULL,
+            -- 0 = menunggu, 1 = diambil owner, 2 = sudah mulai jalan
+            claimed INTEGER NOT NULL DEFAULT 0,
+            cancel_requested INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS store_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        INSERT OR IGNORE INTO store_meta (key, value) VALUES ('version', '0');
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.local = threading.local()
+
+        conn = self._connect()
+        conn.execute('PRAGMA journal_mode=WAL')
+        with self._transaction() as conn:
+            for statement in self.SCHEMA.split(';'):
+                if statement.strip():
+                    conn.execute(statement)
+
+    def _connect(self):
+        """Satu koneksi per thread, transaksi diatur manual (BEGIN IMMEDIATE)"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self.local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Transaksi write yang langsung mengunci database (aman antar process)"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    @staticmethod
+    def _next_version(conn):
+        conn.execute("UPDATE store_meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'version'")
+        return int(conn.execute("SELECT value FROM store_meta WHERE key = 'version'").fetchone()[0])
+
+    @property
+    def version(self):
+        """Naik setiap kali ada eksekusi yang berubah, di process mana pun"""
+        row = self._connect().execute("SELECT value FROM store_meta WHERE key = 'version'").fetchone()
+        return int(row[0])
+
+    # --- State eksekusi (interface dict) ---
+
+    def __getitem__(self, execution_id):
+        row = self._connect().execute(
+            'SELECT data FROM executions WHERE execution_id = ?', (execution_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(execution_id)
+        return json.loads(row[0])
+
+    def __setitem__(self, execution_id, execution):
+        with self._transaction() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO executions (execution_id, status, version, data) VALUES (?, ?, ?, ?)',
+                (execution_id, execution.get('status'), self._next_version(conn), json.dumps(execution))
+            )
+
+    def __delitem__(self, execution_id):
+        with self._transaction() as conn:
+            if conn.execute('DELETE FROM executions WHERE execution_id = ?', (execution_id,)).rowcount == 0:
+                raise KeyError(execution_id)
+            self._next_version(conn)
+
+    def __iter__(self):
+        rows = self._connect().execute('SELECT execution_id FROM executions ORDER BY rowid').fetchall()
+        return iter([execution_id for execution_id, in rows])
+
+    def __len__(self):
+        return self._connect().execute('SELECT COUNT(*) FROM executions').fetchone()[0]
+
+    def __contains__(self, execution_id):
+        return self._connect().execute(
+            'SELECT 1 FROM executions WHERE execution_id = ?', (execution_id,)
+        ).fetchone() is not None
+
+    def items(self):
+        """Semua (execution_id, state) dengan satu query"""
+        rows = self._connect().execute('SELECT execution_id, data FROM executions ORDER BY rowid')
+        return [(execution_id, json.loads(data)) for execution_id, data in rows]
+
+    def patch(self, execution_id, **fields):
+        """Update field eksekusi secara atomik, return state lengkapnya"""
+        with self._transaction() as conn:
+            row = conn.execute('SELECT data FROM executions WHERE execution_id = ?', (execution_id,)).fetchone()
+            if row is None:
+                raise KeyError(execution_id)
+            execution = json.loads(row[0])
+            execution.update(fields)
+            conn.execute(
+                'UPDATE executions SET status = ?, version = ?, data = ? WHERE execution_id = ?',
+                (execution.get('status'), self._next_version(conn), json.dumps(execution), execution_id)
+            )
+        return execution
+
+    def ids_with_status(self, status):
+        rows = self._connect().execute('SELECT execution_id FROM executions WHERE status = ?', (status,))
+        return [execution_id for execution_id, in rows]
+
+    def changes_since(self, version):
+        """(version, execution_id, state) eksekusi yang berubah setelah version"""
+        rows = self._connect().execute(
+            'SELECT version, execution_id, data FROM executions WHERE version > ? ORDER BY version', (version,)
+        )
+        return [(row_version, execution_id, json.loads(data)) for row_version, execution_id, data in rows]
+
+    # --- Antrian bersama ---
+
+    def enqueue(self, execution_id, runner, args, priority=0):
+        """Masukkan eksekusi ke antrian; dijalankan oleh process owner scheduler"""
+        with self._transaction() as conn:
+            conn.execute(
+                'INSERT INTO execution_queue (execution_id, priority, runner, args) VALUES (?, ?, ?, ?)',
+                (execution_id, priority, runner, json.dumps(list(args)))
+            )
+
+    def claim(self, capacity, slots=lambda runner, args: 1):
+        """
+        Ambil eksekusi yang belum diambil owner, urut priority, selama total
+        slot-nya muat di capacity (sisanya tetap di antrian bersama, bisa
+        diambil owner pengganti). Return [(execution_id, runner, args, priority)].
+
+        Args:
+            capacity: Jumlah slot scheduler yang masih kosong
+            slots: Callable (runner, args) -> jumlah slot satu eksekusi
+        """
+        if capacity <= 0:
+            return []
+        claimed = []
+        with self._transaction() as conn:
+            rows = conn.execute(
+                'SELECT execution_id, runner, args, priority FROM execution_queue '
+                'WHERE claimed = 0 ORDER BY priority DESC, sequence'
+            )
+            for execution_id, runner, args, priority in rows:
+                args = json.loads(args)
+                needed = slots(runner, args)
+                if needed > capacity:
+                    # Jangan didahului eksekusi priority lebih rendah
+                    break
+                capacity -= needed
+                claimed.append((execution_id, runner, args, priority))
+                if not capacity:
+                    break
+            conn.executemany('UPDATE execution_queue SET claimed = 1 WHERE execution_id = ?',
+                             [(execution_id,) for execution_id, *_ in claimed])
+        return claimed
+
+    def start(self, execution_id):
+        """Tandai eksekusi yang diambil owner sudah mulai jalan"""
+        with self._transaction() as conn:
+            conn.execute('UPDATE execution_queue SET claimed = 2 WHERE execution_id = ?', (execution_id,))
+
+    def release(self, execution_id):
+        """Hapus eksekusi dari antrian setelah selesai dijalankan owner"""
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM execution_queue WHERE execution_id = ?', (execution_id,))
+
+    def cancel(self, execution_id):
+        """
+        Cancel dari process mana pun. Return 'queued' kalau eksekusi belum
+        diambil owner (langsung dihapus dari antrian), 'running' kalau cancel
+        diteruskan ke owner, atau None kalau eksekusi tidak aktif.
+        """
+        with self._transaction() as conn:
+            if conn.execute('DELETE FROM execution_queue WHERE execution_id = ? AND claimed = 0',
+                            (execution_id,)).rowcount:
+                return 'queued'
+            if conn.execute('UPDATE execution_queue SET cancel_requested = 1 WHERE execution_id = ?',
+                            (execution_id,)).rowcount:
+                return 'running'
+        return None
+
+    def cancel_requests(self):
+        """Execution ID yang minta di-cancel (flag langsung di-reset)"""
+        with self._transaction() as conn:
+            rows = conn.execute('SELECT execution_id FROM execution_queue WHERE cancel_requested = 1').fetchall()
+            conn.execute('UPDATE execution_queue SET cancel_requested = 0 WHERE cancel_requested = 1')
+        return [execution_id for execution_id, in rows]
+
+    # --- Owner scheduler ---
+
+    def acquire_owner(self, owner, timeout):
+        """
+        Klaim / perpanjang peran owner scheduler. Owner lain dianggap mati
+        kalau heartbeat-nya lebih lama dari timeout detik.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT value FROM store_meta WHERE key = 'owner'").fetchone()
+            if row is not None:
+                current = json.loads(row[0])
+                if current['owner'] != owner and now - current['heartbeat'] < timeout:
+                    return False
+            conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('owner', ?)",
+                (json.dumps({'owner': owner, 'heartbeat': now}),)
+            )
+        return True
+
+    def recover(self):
+        """
+        Dipanggil owner baru. Eksekusi yang sudah mulai jalan di owner lama
+        tidak akan pernah selesai, jadi dihapus dari antrian. Eksekusi yang
+        baru diambil (belum mulai) dikembalikan ke antrian, kecuali yang sudah
+        minta di-cancel (ikut dihapus).
+
+        Return (ID yang gagal, ID yang di-cancel).
+        """
+        with self._transaction() as conn:
+            failed = conn.execute('SELECT execution_id FROM execution_queue WHERE claimed = 2').fetchall()
+            cancelled = conn.execute(
+                'SELECT execution_id FROM execution_queue WHERE claimed = 1 AND cancel_requested = 1'
+            ).fetchall()
+            conn.execute('DELETE FROM execution_queue WHERE claimed = 2 OR (claimed = 1 AND cancel_requested = 1)')
+            conn.execute('UPDATE execution_queue SET claimed = 0 WHERE claimed = 1')
+        return [execution_id for execution_id, in failed], [execution_id for execution_id, in cancelled]
+
+    def save_stats(self, stats):
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES ('scheduler_stats', ?)",
+                         (json.dumps(stats),))
+
+    def queue_stats(self):
+        """Statistik terakhir dari owner + eksekusi yang belum diambil owner"""
+        conn = self._connect()
+        row = conn.execute("SELECT value FROM store_meta WHERE key = 'scheduler_stats'").fetchone()
+        stats = json.loads(row[0]) if row else {}
+        pending = conn.execute('SELECT COUNT(*) FROM execution_queue WHERE claimed = 0').fetchone()[0]
+        stats['queue_depth'] = stats.get('queue_depth', 0) + pending
+        owner = conn.execute("SELECT value FROM store_meta WHERE key = 'owner'").fetchone()
+        stats['owner'] = json.loads(owner[0]) if owner else None
+        return stats
@@ -0,0 +1,246 @@
+"""
+Index offset baris untuk akses acak ke file log QA Automation Dashboard
+
+Untuk setiap file log disimpan sidecar index berisi byte offset awal setiap
+baris dan timestamp baris pertama per blok. File dibaca lewat mmap, jadi
+dashboard bisa lompat ke nomor baris atau timestamp tertentu dan hanya
+men-decode baris yang dikembalikan.
+"""
+
+import bisect
+import json
+import mmap
+import os
+import re
+import threading
+from array import array
+
+
+class LogIndex:
+    """Index baris satu file log (incremental, dipersist ke sidecar file)"""
+
+    VERSION = 3
+    BLOCK_SIZE = 256
+    TIMESTAMP_PATTERN = re.compile(rb'(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2})')
+    # Timestamp blok disimpan fixed-width di sidecar, '' = spasi
+    TIMESTAMP_WIDTH = 19
+
+    def __init__(self, file_path, index_path=None):
+        """
+        Args:
+            file_path: File log yang di-index
+            index_path: Lokasi sidecar index (None = tidak dipersist). Offset
+                baris dan timestamp blok di-append ke index_path + '.offsets'
+                dan '.blocks', index_path sendiri hanya berisi header kecil.
+        """
+        self.file_path = file_path
+        self.index_path = index_path
+        self.lock = threading.Lock()
+        self._reset()
+        self._load()
+
+    def _reset(self, inode=None):
+        self.inode = inode
+        self.indexed_size = 0
+        self.line_offsets = array('Q')
+        self.block_timestamps = []
+        # Jumlah offset / blok yang sudah ada di sidecar
+        self.saved_lines = 0
+        self.saved_blocks = 0
+
+    @staticmethod
+    def sidecar_paths(index_path):
+        return index_path, f'{index_path}.offsets', f'{index_path}.blocks'
+
+    def _load(self):
+        if not self.index_path:
+            return
+        header_path, offsets_path, blocks_path = self.sidecar_paths(self.index_path)
+        try:
+            # Header JSON, bukan pickle: folder cache ada di dalam folder log
+            with open(header_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if not isinstance(state, dict) or state.get('version') != self.VERSION:
+                return
+            if not all(isinstance(state.get(field), int) and state[field] >= 0
+                       for field in ('inode', 'indexed_size', 'lines', 'blocks')):
+                return
+            # Sidecar bisa lebih panjang dari header (crash di tengah save), ambil yang tercatat saja
+            with open(offsets_path, 'rb') as f:
+                offsets = f.read(state['lines'] * 8)
+            with open(blocks_path, 'rb') as f:
+                blocks = f.read(state['blocks'] * self.TIMESTAMP_WIDTH)
+        except (OSError, ValueError):
+            return
+        if len(offsets) != state['lines'] * 8 or len(blocks) != state['blocks'] * self.TIMESTAMP_WIDTH:
+            return
+
+        self.inode = state['inode']
+        self.indexed_size = state['indexed_size']
+        self.line_offsets = array('Q')
+        self.line_offsets.frombytes(offsets)
+        width = self.TIMESTAMP_WIDTH
+        self.block_timestamps = [
+            blocks[i:i + width].decode('ascii', errors='replace').strip() for i in range(0, len(blocks), width)
+        ]
+        self.saved_lines = len(self.line_offsets)
+        self.saved_blocks = len(self.block_timestamps)
+
+    @staticmethod
+    def _append(path, saved_bytes, data):
+        """Tulis data setelah saved_bytes pertama (sisa save yang gagal dipotong)"""
+        with open(path, 'r+b' if saved_bytes else 'wb') as f:
+            f.seek(saved_bytes)
+            f.truncate()
+            f.write(data)
+
+    def _save(self):
+        """Append offset / timestamp blok baru ke sidecar, lalu tulis header"""
+        if not self.index_path:
+            return
+        header_path, offsets_path, blocks_path = self.sidecar_paths(self.index_path)
+        width = self.TIMESTAMP_WIDTH
+        tmp_path = f'{header_path}.{os.getpid()}.tmp'
+        try:
+            self._append(offsets_path, self.saved_lines * 8, self.line_offsets[self.saved_lines:].tobytes())
+            self._append(blocks_path, self.saved_blocks * width, ''.join(
+                timestamp.ljust(width) for timestamp in self.block_timestamps[self.saved_blocks:]
+            ).encode('ascii'))
+
+            state = {
+                'version': self.VERSION,
+                'inode': self.inode,
+                'indexed_size': self.indexed_size,
+                'lines': len(self.line_offsets),
+                'blocks': len(self.block_timestamps)
+            }
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, header_path)
+        except OSError as e:
+            print(f"Error saving log index {self.index_path}: {e}")
+            return
+        self.saved_lines = len(self.line_offsets)
+        self.saved_blocks = len(self.block_timestamps)
+
+    @property
+    def line_count(self):
+        return len(self.line_offsets)
+
+    def refresh(self):
+        """Index baris baru yang di-append sejak refresh terakhir"""
+        with self.lock:
+            stat = os.stat(self.file_path)
+            if stat.st_ino != self.inode or stat.st_size < self.indexed_size:
+                # File baru, di-rotate atau di-truncate -> index ulang dari awal
+                self._reset(stat.st_ino)
+            if stat.st_size == self.indexed_size:
+                return
+
+            with open(self.file_path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    self._index_range(mm, self.indexed_size, stat.st_size)
+            self._save()
+
+    def _index_range(self, mm, start, end):
+        offsets = self.line_offsets
+        pos = start
+        while pos < end:
+            newline = mm.find(b'\n', pos, end)
+            if newline == -1:
+                # Baris terakhir belum lengkap (masih ditulis), index di refresh berikutnya
+                break
+            if len(offsets) % self.BLOCK_SIZE == 0:
+                match = self.TIMESTAMP_PATTERN.search(mm, pos, min(newline, pos + 256))
+                if match:
+                    block_timestamp = match.group(1).decode('ascii')
+                else:
+                    # Baris tanpa timestamp: pakai timestamp blok sebelumnya supaya
+                    # block_timestamps tetap urut untuk bisect
+                    block_timestamp = self.block_timestamps[-1] if self.block_timestamps else ''
+                self.block_timestamps.append(block_timestamp)
+            offsets.append(pos)
+            pos = newline + 1
+        self.indexed_size = pos
+
+    def read_lines(self, start, count):
+        """Raw bytes baris [start, start + count) langsung dari mmap"""
+        with self.lock:
+            end = min(start + count, self.line_count)
+            if start >= end:
+                return []
+            offsets = self.line_offsets[start:end]
+            stop = self.line_offsets[end] if end < self.line_count else self.indexed_size
+
+        with open(self.file_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                chunk = mm[offsets[0]:stop]
+        base = offsets[0]
+        bounds = [offset - base for offset in offsets] + [stop - base]
+        return [chunk[bounds[i]:bounds[i + 1]] for i in range(len(offsets))]
+
+    def _line_timestamp(self, mm, line):
+        start = self.line_offsets[line]
+        match = self.TIMESTAMP_PATTERN.search(mm, start, start + 256)
+        return match.group(1).decode('ascii') if match else ''
+
+    def find_timestamp(self, timestamp):
+        """
+        Nomor baris pertama dengan timestamp >= timestamp.
+
+        Binary search di timestamp blok, lalu scan linear di dalam blok;
+        hanya timestamp baris yang diperiksa, bukan seluruh entry.
+        """
+        timestamp = timestamp.replace('T', ' ')
+        with self.lock:
+            if not self.line_count:
+                return 0
+            block = max(bisect.bisect_left(self.block_timestamps, timestamp) - 1, 0)
+            line = block * self.BLOCK_SIZE
+            with open(self.file_path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    while line < self.line_count:
+                        line_timestamp = self._line_timestamp(mm, line).replace('T', ' ')
+                        if line_timestamp and line_timestamp >= timestamp:
+                            break
+                        line += 1
+            return line
+
+
+class LogIndexCache:
+    """LogIndex per file log, sidecar disimpan di index_folder"""
+
+    def __init__(self, index_folder=None):
+        self.index_folder = index_folder
+        self.indexes = {}
+        self.lock = threading.Lock()
+        if index_folder:
+            os.makedirs(index_folder, exist_ok=True)
+
+    def get(self, file_path):
+        """LogIndex yang sudah di-refresh untuk file_path"""
+        with self.lock:
+            index = self.indexes.get(file_path)
+            if index is None:
+                index_path = None
+                if self.index_folder:
+                    index_path = os.path.join(self.index_folder, os.path.basename(file_path) + '.idx')
+                index = self.indexes[file_path] = LogIndex(file_path, index_path)
+        index.refresh()
+        return index
+
+    def ingest(self, source_file, entries, offsets):
+        # Index dibangun lazy saat file dibaca, bukan saat ingest
+        pass
+
+    def discard(self, source_file):
+        """Hapus index file yang dihapus / di-rotate (listener LogIngestor)"""
+        with self.lock:
+            for file_path in [path for path in self.indexes if os.path.basename(path) == source_file]:
+                del self.indexes[file_path]
+        if self.index_folder:
+            for path in LogIndex.sidecar_paths(os.path.join(self.index_folder, source_file + '.idx')):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
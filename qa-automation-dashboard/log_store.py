@@ -0,0 +1,299 @@
+"""
+SQLite storage backend untuk QA Automation Dashboard
+
+Entry log dari LogIngestor disimpan ke file SQLite lokal dengan index di
+kolom yang sering difilter, sehingga /api/logs dan /api/metrics cukup
+menjalankan query ber-index tanpa scan semua file log di Python.
+"""
+
+import json
+import sqlite3
+import threading
+from collections import defaultdict
+
+from sketch import HISTOGRAM_BOUNDS, DurationSketch
+
+
+class SQLiteLogStore:
+    """Log store berbasis SQLite (WAL mode, batched insert)"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS logs (
+            id INTEGER PRIMARY KEY,
+            source_file TEXT NOT NULL,
+            offset INTEGER NOT NULL,
+            timestamp TEXT NOT NULL DEFAULT '',
+            level TEXT NOT NULL DEFAULT '',
+            test_suite TEXT,
+            test_name TEXT,
+            status TEXT,
+            duration REAL,
+            data TEXT NOT NULL
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_logs_source ON logs(source_file, offset);
+        CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs(timestamp, source_file, id);
+        CREATE INDEX IF NOT EXISTS idx_logs_level ON logs(level, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_logs_test_suite ON logs(test_suite, status);
+        CREATE INDEX IF NOT EXISTS idx_logs_test_name ON logs(test_name, status);
+        CREATE INDEX IF NOT EXISTS idx_logs_status ON logs(status, timestamp);
+        CREATE TABLE IF NOT EXISTS duration_bins (
+            source_file TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            name TEXT NOT NULL,
+            bin INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            total REAL NOT NULL,
+            min_value REAL,
+            max_value REAL,
+            PRIMARY KEY (source_file, kind, name, bin)
+        );
+    """
+
+    # Bucket DurationSketch per file, di-update incremental dari baris yang baru di-insert
+    BIN_QUERY = """
+        INSERT INTO duration_bins (source_file, kind, name, bin, count, total, min_value, max_value)
+        SELECT source_file, ?, {name}, sketch_key(duration), COUNT(*), SUM(duration), MIN(duration), MAX(duration)
+        FROM logs
+        WHERE id > ? AND status IS NOT NULL AND status != 'skipped' AND duration IS NOT NULL
+        GROUP BY source_file, {name}, sketch_key(duration)
+        ON CONFLICT (source_file, kind, name, bin) DO UPDATE SET
+            count = count + excluded.count,
+            total = total + excluded.total,
+            min_value = min(min_value, excluded.min_value),
+            max_value = max(max_value, excluded.max_value)
+    """
+    BIN_NAMES = (('all', "''"), ('suite', 'test_suite'), ('test', 'test_name'))
+    # Bucket untuk durasi ~0 (log tidak terdefinisi)
+    ZERO_BIN = -(2 ** 31)
+
+    def __init__(self, db_path, extract_result, max_test_cases=100):
+        """
+        Args:
+            db_path: Lokasi file SQLite
+            extract_result: Callable entry -> (status, test_name, duration),
+                dipakai supaya kolom hasil test konsisten dengan MetricsAggregator
+            max_test_cases: Jumlah hasil test terbaru di snapshot metrics
+        """
+        self.db_path = db_path
+        self.extract_result = extract_result
+        self.max_test_cases = max_test_cases
+        self.local = threading.local()
+        self.write_lock = threading.Lock()
+        # Naik setiap ada write, dipakai sebagai key cache sketch durasi
+        self.generation = 0
+        self._sketch_cache = (None, None)
+
+        conn = self._connect()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript(self.SCHEMA)
+        conn.commit()
+        
+        # Database lama tanpa duration_bins: isi dari semua baris yang sudah ada
+        if conn.execute('SELECT 1 FROM duration_bins LIMIT 1').fetchone() is None:
+            with self.write_lock, conn:
+                self._update_bins(conn, 0)
+
+    def _connect(self):
+        """Satu koneksi per thread; WAL mengizinkan read paralel dengan write"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.create_function('sketch_key', 1, self._sketch_key, deterministic=True)
+            self.local.conn = conn
+        return conn
+
+    def ingest(self, source_file, entries, offsets):
+        """Insert batch entry baru dalam satu transaksi"""
+        rows = []
+        for log_entry, offset in zip(entries, offsets):
+            status, test_name, duration = self.extract_result(log_entry)
+            rows.append((
+                source_file,
+                offset,
+                str(log_entry.get('timestamp', '')),
+                str(log_entry.get('level', '')).upper(),
+                log_entry.get('test_suite') or source_file,
+                test_name or ('unknown' if status else None),
+                status,
+                duration,
+                json.dumps(log_entry)
+            ))
+
+        conn = self._connect()
+        with self.write_lock, conn:
+            # IMMEDIATE: worker process lain tidak bisa insert di antara MAX(id) dan insert
+            conn.execute('BEGIN IMMEDIATE')
+            last_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM logs').fetchone()[0]
+            # OR IGNORE: aman kalau batch yang sama ter-ingest ulang setelah crash
+            conn.executemany(
+                'INSERT OR IGNORE INTO logs (source_file, offset, timestamp, level, test_suite, '
+                'test_name, status, duration, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+            # Hanya baris yang benar-benar baru masuk ke sketch
+            self._update_bins(conn, last_id)
+            self.generation += 1
+
+    @classmethod
+    def _sketch_key(cls, duration):
+        if duration is None:
+            return None
+        if duration < DurationSketch.MIN_VALUE:
+            return cls.ZERO_BIN
+        return DurationSketch.key(duration)
+
+    def _update_bins(self, conn, after_id):
+        for kind, name in self.BIN_NAMES:
+            conn.execute(self.BIN_QUERY.format(name=name), (kind, after_id))
+
+    def discard(self, source_file):
+        conn = self._connect()
+        with self.write_lock, conn:
+            conn.execute('DELETE FROM logs WHERE source_file = ?', (source_file,))
+            conn.execute('DELETE FROM duration_bins WHERE source_file = ?', (source_file,))
+            self.generation += 1
+
+    def scan(self, cursor=None, file_filter=None, level=None, test_suite=None, since=None, until=None):
+        """Sama dengan LogIngestor.scan, tapi filter dan urutan dikerjakan SQLite"""
+        where, params = [], []
+        if cursor:
+            where.append('(timestamp, source_file, id) < (?, ?, ?)')
+            params.extend(cursor)
+        if file_filter:
+            where.append('instr(source_file, ?) > 0')
+            params.append(file_filter)
+        if level:
+            where.append('level = ?')
+            params.append(level.upper())
+        if test_suite:
+            where.append('test_suite = ?')
+            params.append(test_suite)
+        if since:
+            where.append('timestamp >= ?')
+            params.append(since)
+        if until:
+            where.append('timestamp <= ?')
+            params.append(until)
+
+        sql = 'SELECT timestamp, source_file, id, data FROM logs'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY timestamp DESC, source_file DESC, id DESC'
+
+        for timestamp, source_file, row_id, data in self._connect().execute(sql, params):
+            yield (timestamp, source_file, row_id), json.loads(data)
+
+    def step_entries(self):
+        """(source_file, entry) span step, untuk mengisi ulang StepProfiler setelah restart"""
+        sql = ("SELECT source_file, data FROM logs WHERE data LIKE '%\"step_duration\"%' "
+               "OR data LIKE '%Step done:%' OR data LIKE '%Step FAILED:%' ORDER BY source_file, id")
+        for source_file, data in self._connect().execute(sql):
+            yield source_file, json.loads(data)
+
+    def result_entries(self):
+        """(source_file, entry) hasil test dari kolom terindex, untuk mengisi ulang TestRollups"""
+        sql = ("SELECT source_file, timestamp, status, test_name, duration FROM logs "
+               "WHERE status IS NOT NULL ORDER BY source_file, id")
+        for source_file, timestamp, status, test_name, duration in self._connect().execute(sql):
+            yield source_file, {'timestamp': timestamp, 'status': status,
+                                'test_name': test_name, 'duration': duration}
+
+    @staticmethod
+    def _summarize(counter):
+        passed = counter.get('passed', 0)
+        failed = counter.get('failed', 0)
+        duration = counter.get('duration', 0) or 0
+        total = passed + failed
+        return {
+            'total_tests': total,
+            'passed': passed,
+            'failed': failed,
+            'skipped': counter.get('skipped', 0),
+            'total_duration': round(duration, 3),
+            'pass_rate': round(passed / total * 100, 2) if total else 0,
+            'avg_duration': round(duration / total, 2) if total else 0
+        }
+
+    def _grouped(self, column, sketches, kind):
+        groups = {}
+        sql = (f'SELECT {column}, status, COUNT(*), '
+               f"SUM(CASE WHEN status != 'skipped' THEN duration END) "
+               f'FROM logs WHERE status IS NOT NULL GROUP BY {column}, status')
+        for name, status, count, duration in self._connect().execute(sql):
+            counter = groups.setdefault(name, {})
+            counter[status] = count
+            counter['duration'] = counter.get('duration', 0) + (duration or 0)
+        empty = DurationSketch()
+        return {
+            name: {**self._summarize(counter), **sketches.get((kind, name), empty).summary()}
+            for name, counter in groups.items()
+        }
+
+    def _sketches(self, conn):
+        """Gabungkan bucket semua file jadi satu DurationSketch per (kind, name)"""
+        generation, sketches = self._sketch_cache
+        if generation == self.generation:
+            return sketches
+        generation = self.generation
+        
+        sketches = defaultdict(DurationSketch)
+        for kind, name, key, count, total, minimum, maximum in conn.execute(
+                'SELECT kind, name, bin, count, total, min_value, max_value FROM duration_bins'):
+            sketches[(kind, name)].add_bin(
+                None if key == self.ZERO_BIN else key, count, total, minimum, maximum
+            )
+        sketches = dict(sketches)
+        self._sketch_cache = (generation, sketches)
+        return sketches
+
+    def snapshot(self):
+        """Hitung metrik dengan query agregat ber-index"""
+        conn = self._connect()
+        sketches = self._sketches(conn)
+        empty = DurationSketch()
+        levels = dict(conn.execute('SELECT level, COUNT(*) FROM logs GROUP BY level'))
+
+        totals = {}
+        for status, count, duration in conn.execute(
+                'SELECT status, COUNT(*), SUM(duration) FROM logs '
+                'WHERE status IS NOT NULL GROUP BY status'):
+            totals[status] = count
+            if status != 'skipped':
+                totals['duration'] = totals.get('duration', 0) + (duration or 0)
+
+        test_cases = [
+            {
+                'name': test_name,
+                'status': status,
+                'duration': duration,
+                'test_suite': test_suite,
+                'timestamp': timestamp,
+                'source_file': source_file
+            }
+            for test_name, status, duration, test_suite, timestamp, source_file in conn.execute(
+                'SELECT test_name, status, duration, test_suite, timestamp, source_file FROM logs '
+                'WHERE status IS NOT NULL ORDER BY timestamp DESC, id DESC LIMIT ?',
+                (self.max_test_cases,))
+        ]
+
+        summary = self._summarize(totals)
+        return {
+            'total_tests': summary['total_tests'],
+            'passed': summary['passed'],
+            'failed': summary['failed'],
+            'skipped': summary['skipped'],
+            'errors': levels.get('ERROR', 0),
+            'warnings': levels.get('WARNING', 0),
+            'total_duration': summary['total_duration'],
+            'levels': levels,
+            'suites': self._grouped('test_suite', sketches, 'suite'),
+            'tests': self._grouped('test_name', sketches, 'test'),
+            'test_cases': test_cases,
+            'execution_timeline': [],
+            'pass_rate': summary['pass_rate'],
+            'fail_rate': round(summary['failed'] / summary['total_tests'] * 100, 2) if summary['total_tests'] else 0,
+            'avg_duration': summary['avg_duration'],
+            'histogram_bounds': HISTOGRAM_BOUNDS,
+            **sketches.get(('all', ''), empty).summary()
+        }
@@ -0,0 +1,99 @@
+"""
+Buffer output subprocess untuk QA Automation Dashboard
+
+Output test dibaca bertahap oleh reader thread, disimpan di ring buffer
+berukuran tetap di memory dan di-spill lengkap ke file, sehingga client bisa
+membaca hanya byte baru sejak offset terakhir.
+"""
+
+import threading
+
+
+class OutputBuffer:
+    """Ring buffer byte dengan offset absolut dan spill file di disk"""
+
+    def __init__(self, spill_path=None, max_memory=256 * 1024):
+        """
+        Args:
+            spill_path: File untuk menyimpan output lengkap (None = memory saja)
+            max_memory: Jumlah byte terakhir yang disimpan di memory
+        """
+        self.spill_path = spill_path
+        self.max_memory = max_memory
+        self.buffer = bytearray()
+        self.start = 0
+        self.size = 0
+        self.lock = threading.Lock()
+        self.spill = open(spill_path, 'wb') if spill_path else None
+
+    def write(self, data):
+        with self.lock:
+            if self.spill:
+                self.spill.write(data)
+                self.spill.flush()
+
+            self.buffer += data
+            self.size += len(data)
+            overflow = len(self.buffer) - self.max_memory
+            if overflow > 0:
+                del self.buffer[:overflow]
+                self.start += overflow
+
+    @property
+    def memory_size(self):
+        return len(self.buffer)
+
+    def read(self, since=0):
+        """Return (bytes sejak offset since, offset berikutnya)"""
+        with self.lock:
+            since = min(max(since, 0), self.size)
+            if since >= self.start:
+                return bytes(self.buffer[since - self.start:]), self.size
+            size = self.size
+            if not self.spill_path:
+                # Bagian awal sudah keluar dari ring buffer dan tidak di-spill
+                return bytes(self.buffer), size
+
+        with open(self.spill_path, 'rb') as f:
+            f.seek(since)
+            return f.read(size - since), size
+
+    def read_text(self, since=0):
+        data, offset = self.read(since)
+        return data.decode('utf-8', errors='replace'), offset
+
+    @staticmethod
+    def read_spill(spill_path, since=0):
+        """
+        read_text() langsung dari spill file, untuk process lain yang tidak
+        memegang buffer-nya. Return ('', 0) kalau file belum ada.
+        """
+        try:
+            with open(spill_path, 'rb') as f:
+                f.seek(max(since, 0))
+                data = f.read()
+                return data.decode('utf-8', errors='replace'), f.tell()
+        except FileNotFoundError:
+            return '', 0
+
+    def drain(self, pipe, chunk_size=64 * 1024):
+        """Baca pipe sampai EOF (dipanggil dari reader thread)"""
+        try:
+            for chunk in iter(lambda: pipe.read1(chunk_size), b''):
+                self.write(chunk)
+        finally:
+            pipe.close()
+
+    def drain_lines(self, pipe, prefix=b''):
+        """Baca pipe per baris dengan prefix, untuk menggabungkan output beberapa process"""
+        try:
+            for line in iter(pipe.readline, b''):
+                self.write(prefix + line)
+        finally:
+            pipe.close()
+
+    def close(self):
+        with self.lock:
+            if self.spill:
+                self.spill.close()
+                self.spill = None
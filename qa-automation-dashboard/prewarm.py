@@ -0,0 +1,48 @@
+"""
+Pre-warm cache log QA Automation Dashboard
+
+Parse semua file log yang belum ter-cache secara paralel (process pool),
+simpan state per file ke logs/.cache, dan bangun sidecar line index (.idx)
+untuk setiap file yang tidak terkompresi.
+
+Hanya berguna dengan QA_DASHBOARD_STORE=sqlite (default serve.py): entry
+tersimpan di database, jadi worker yang start setelahnya cukup membaca
+offset cache. Di mode memory app.py tetap harus parse ulang setiap file
+sampai offset cache saat start; yang tersisa hanya sidecar index.
+
+Jalankan:
+    QA_DASHBOARD_STORE=sqlite python prewarm.py [--workers N]
+"""
+
+import argparse
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=None, help='Jumlah process (default: jumlah CPU)')
+    args = parser.parse_args()
+
+    # Import di sini supaya worker process tidak ikut menjalankan setup app.py
+    import app
+
+    if app.LOG_STORE != 'sqlite':
+        print("Warning: QA_DASHBOARD_STORE is not sqlite; app.py will re-parse every log file at start anyway")
+
+    start = time.perf_counter()
+    warmed = app.log_ingestor.warm(workers=args.workers)
+    parsed = time.perf_counter()
+
+    indexed = 0
+    for path in app.log_ingestor.log_files():
+        if not app.LogParser.is_compressed(path):
+            app.log_indexes.get(path)
+            indexed += 1
+    end = time.perf_counter()
+
+    print(f"Pre-warmed {warmed} log files ({len(app.log_ingestor.files)} total) in {parsed - start:.2f}s, "
+          f"indexed {indexed} files in {end - parsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
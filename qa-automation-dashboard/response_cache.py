@@ -0,0 +1,113 @@
+"""
+Cache response JSON untuk endpoint dashboard
+
+Body response yang sudah di-serialize (dan versi gzip/brotli-nya) disimpan
+per URL bersama fingerprint state sumber datanya. Selama fingerprint sama,
+request berikutnya dijawab dari cache, atau 304 Not Modified kalau client
+mengirim ETag / tanggal yang masih berlaku.
+"""
+
+import gzip
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Body lebih kecil dari ini tidak dikompres (overhead header > penghematan)
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 5
+
+
+def fingerprint(*parts):
+    """Hash pendek yang stabil antar process (tidak memakai hash() Python)"""
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=12).hexdigest()
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class CachedResponse:
+    """Body ter-serialize satu URL untuk satu fingerprint"""
+
+    def __init__(self, token, etag, body, mimetype, last_modified):
+        self.token = token
+        self.etag_base = etag
+        self.body = body
+        self.mimetype = mimetype
+        self.last_modified = datetime.fromtimestamp(int(last_modified), timezone.utc)
+        self.encoded = {}
+        self.lock = threading.Lock()
+
+    def etag(self, encoding=None):
+        return f'{self.etag_base}-{encoding}' if encoding else self.etag_base
+
+    def encode(self, encoding):
+        """Body terkompres, dihitung sekali per encoding"""
+        if encoding is None:
+            return self.body
+        with self.lock:
+            body = self.encoded.get(encoding)
+            if body is None:
+                body = self.encoded[encoding] = compress(self.body, encoding)
+            return body
+
+
+class ResponseCache:
+    """LRU cache CachedResponse per key (path + query string)"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def choose_encoding(accept_encoding, size):
+        """
+        Encoding terbaik yang diterima client: br (kalau modul brotli ada),
+        lalu gzip; None untuk body kecil.
+        """
+        if size < MIN_COMPRESS_SIZE:
+            return None
+        if brotli is not None and 'br' in accept_encoding:
+            return 'br'
+        if 'gzip' in accept_encoding:
+            return 'gzip'
+        return None
+
+    def get(self, key, token):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry.token != token:
+                return None
+            self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, token, body, mimetype, last_modified=None):
+        """
+        Simpan body untuk fingerprint token. last_modified (epoch) None =
+        saat fingerprint ini pertama kali terlihat.
+        """
+        entry = CachedResponse(
+            token, fingerprint(key, token), body, mimetype,
+            last_modified if last_modified is not None else time.time()
+        )
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
@@ -0,0 +1,376 @@
+"""
+Rollup per jam / per hari dan deteksi flaky test untuk QA Automation Dashboard
+
+Hasil test di-fold ke bucket waktu (jumlah passed/failed/skipped + sketch
+durasi) saat di-ingest, sehingga trend berbulan-bulan cukup dibaca dari
+beberapa ratus baris rollup. Riwayat status terbaru per test dipakai untuk
+menghitung skor flakiness dari jumlah transisi pass <-> fail.
+
+Dengan db_path, rollup per file dipersist ke SQLite: setelah restart trend
+langsung tersedia tanpa scan ulang log mentah, dan rollup file log yang
+dihapus dipindah ke arsip alih-alih ikut hilang.
+"""
+
+import bisect
+import json
+import sqlite3
+import threading
+from collections import Counter, defaultdict, deque
+
+from sketch import DurationSketch
+
+GRANULARITIES = {'hour': 13, 'day': 10}
+# Hanya rollup (hour, test) yang dipersist; bucket day dan ALL_TESTS adalah
+# gabungannya dan dibangun ulang saat load
+PERSISTED_GRANULARITY = 'hour'
+# Key test untuk rollup gabungan semua test
+ALL_TESTS = '*'
+# Source file untuk rollup file log yang sudah dihapus (bukan nama file log yang valid)
+ARCHIVED = '(archived)'
+
+
+class TestRollups:
+    """Listener LogIngestor untuk rollup waktu dan riwayat status per test"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rollup_files (
+            source_file TEXT PRIMARY KEY,
+            offset INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS rollup_buckets (
+            source_file TEXT NOT NULL,
+            granularity TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            test_key TEXT NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (source_file, granularity, bucket, test_key)
+        );
+        CREATE TABLE IF NOT EXISTS rollup_runs (
+            source_file TEXT NOT NULL,
+            test_name TEXT NOT NULL,
+            runs TEXT NOT NULL,
+            PRIMARY KEY (source_file, test_name)
+        );
+    """
+
+    def __init__(self, extract_result, max_runs=50, db_path=None):
+        """
+        Args:
+            extract_result: Callable entry -> (status, test_name, duration),
+                sama dengan MetricsAggregator.extract_result
+            max_runs: Jumlah run terakhir per test (per file dan gabungan) untuk flakiness
+            db_path: File SQLite untuk mempersist rollup (None = hanya di memory)
+        """
+        self.extract_result = extract_result
+        self.max_runs = max_runs
+        self.lock = threading.Lock()
+        # source_file -> {'buckets': {(granularity, bucket, test_key): rollup},
+        # 'runs': {test_name: deque}, 'offset': offset entry terakhir yang di-fold}
+        self.files = {}
+        # Total gabungan semua file, di-update incremental saat ingest:
+        # (granularity, test_key) -> {bucket: rollup} dan test_name -> run terurut.
+        # Selama bucket hanya diisi satu file, rollup gabungan = rollup file itu
+        # (objek sama); key di combined punya rollup gabungan sendiri.
+        self.merged_buckets = defaultdict(dict)
+        self.combined = set()
+        self.merged_runs = defaultdict(list)
+
+        self.conn = None
+        if db_path:
+            # Satu koneksi, semua akses di bawah self.lock
+            self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.executescript(self.SCHEMA)
+            self.conn.commit()
+            self._load()
+
+    @staticmethod
+    def bucket(timestamp, granularity):
+        """'2024-01-01 08:15:00' -> '2024-01-01 08' (hour) / '2024-01-01' (day)"""
+        return str(timestamp).replace('T', ' ')[:GRANULARITIES[granularity]]
+
+    @staticmethod
+    def _new_rollup():
+        return {'counts': Counter(), 'sketch': DurationSketch()}
+
+    def _new_state(self):
+        return {'buckets': {}, 'runs': defaultdict(lambda: deque(maxlen=self.max_runs)), 'offset': -1}
+
+    @classmethod
+    def _combine(cls, rollups):
+        combined = cls._new_rollup()
+        for rollup in rollups:
+            combined['counts'].update(rollup['counts'])
+            combined['sketch'].merge(rollup['sketch'])
+        return combined
+
+    def ingest(self, source_file, entries, offsets=None):
+        with self.lock:
+            state = self.files.get(source_file)
+            if state is None:
+                state = self._new_state()
+
+            start = 0
+            if offsets and state['offset'] >= 0:
+                # File yang di-parse ulang setelah restart: entry sampai offset
+                # tersimpan sudah ada di rollup
+                start = bisect.bisect_right(offsets, state['offset'])
+            dirty_buckets, dirty_runs = set(), set()
+
+            for i in range(start, len(entries)):
+                log_entry = entries[i]
+                status, test_name, duration = self.extract_result(log_entry)
+                if status is None:
+                    continue
+                test_name = test_name or 'unknown'
+                timestamp = str(log_entry.get('timestamp', ''))
+
+                for granularity in GRANULARITIES:
+                    bucket = self.bucket(timestamp, granularity)
+                    for test_key in (test_name, ALL_TESTS):
+                        key = (granularity, bucket, test_key)
+                        rollup = state['buckets'].get(key)
+                        if rollup is None:
+                            rollup = state['buckets'][key] = self._new_rollup()
+                        series = self.merged_buckets[(granularity, test_key)]
+                        merged = series.get(bucket)
+                        if merged is None:
+                            merged = series[bucket] = rollup
+                        elif merged is not rollup and key not in self.combined:
+                            # File kedua untuk bucket ini: pisahkan rollup gabungan
+                            merged = series[bucket] = self._combine([merged])
+                            self.combined.add(key)
+                        for target in ((rollup,) if merged is rollup else (rollup, merged)):
+                            target['counts'][status] += 1
+                            if duration is not None and status != 'skipped':
+                                target['sketch'].add(duration)
+                        dirty_buckets.add(key)
+
+                if status != 'skipped':
+                    state['runs'][test_name].append((timestamp, status))
+                    runs = self.merged_runs[test_name]
+                    bisect.insort(runs, (timestamp, status))
+                    if len(runs) > self.max_runs:
+                        del runs[0]
+                    dirty_runs.add(test_name)
+
+            if offsets:
+                state['offset'] = max(state['offset'], offsets[-1])
+            if state['buckets']:
+                self.files[source_file] = state
+                if dirty_buckets:
+                    self._save(source_file, state, dirty_buckets, dirty_runs)
+
+    def discard(self, source_file):
+        """
+        File di-rotate / di-truncate dan akan dibaca ulang dari awal: buang
+        kontribusinya. Hanya bucket / test milik file itu yang dihitung ulang.
+        """
+        with self.lock:
+            state = self.files.pop(source_file, None)
+            if state is None:
+                return
+            self._delete(source_file)
+            self._remerge(state['buckets'].keys(), state['runs'])
+
+    def remove(self, source_file):
+        """File log dihapus: rollup-nya dipindah ke arsip supaya riwayat tetap ada"""
+        with self.lock:
+            state = self.files.pop(source_file, None)
+            if state is None:
+                return
+            archive = self.files.setdefault(ARCHIVED, self._new_state())
+            for key, rollup in state['buckets'].items():
+                # Objek baru: rollup lama bisa sedang dipakai sebagai rollup gabungan
+                previous = archive['buckets'].get(key)
+                archive['buckets'][key] = self._combine([previous, rollup] if previous else [rollup])
+            for test_name, runs in state['runs'].items():
+                archive['runs'][test_name] = deque(
+                    sorted([*archive['runs'].get(test_name, ()), *runs])[-self.max_runs:],
+                    maxlen=self.max_runs
+                )
+            self._delete(source_file)
+            self._save(ARCHIVED, archive, state['buckets'], state['runs'])
+            self._remerge(state['buckets'].keys(), state['runs'])
+
+    def _remerge(self, keys, test_names):
+        """Hitung ulang rollup gabungan dan run gabungan untuk keys / test_names"""
+        test_names = set(test_names)
+        for test_name in test_names:
+            self.merged_runs.pop(test_name, None)
+
+        contributors = defaultdict(list)
+        for other in self.files.values():
+            for key in keys & other['buckets'].keys():
+                contributors[key].append(other['buckets'][key])
+            for test_name in test_names.intersection(other['runs']):
+                self.merged_runs[test_name].extend(other['runs'][test_name])
+        for test_name in test_names.intersection(self.merged_runs):
+            runs = self.merged_runs[test_name]
+            runs.sort()
+            del runs[:-self.max_runs]
+
+        for key in keys:
+            granularity, bucket, test_key = key
+            series = self.merged_buckets[(granularity, test_key)]
+            self.combined.discard(key)
+            rollups = contributors.get(key)
+            if not rollups:
+                series.pop(bucket, None)
+            elif len(rollups) == 1:
+                series[bucket] = rollups[0]
+            else:
+                series[bucket] = self._combine(rollups)
+                self.combined.add(key)
+
+        for key in [key for key, series in self.merged_buckets.items() if not series]:
+            del self.merged_buckets[key]
+
+    # ============================================
+    # PERSISTENCE
+    # ============================================
+
+    def _load(self):
+        """Isi state dari database (dipanggil sekali di __init__)"""
+        offsets = dict(self.conn.execute('SELECT source_file, offset FROM rollup_files'))
+        for source_file, granularity, bucket, test_key, data in self.conn.execute(
+                'SELECT source_file, granularity, bucket, test_key, data FROM rollup_buckets'):
+            if source_file not in offsets or granularity != PERSISTED_GRANULARITY:
+                continue
+            state = self.files.get(source_file)
+            if state is None:
+                state = self.files[source_file] = self._new_state()
+                state['offset'] = offsets[source_file]
+            data = json.loads(data)
+            rollup = {'counts': Counter(data['counts']), 'sketch': DurationSketch.from_dict(data['sketch'])}
+            for derived in GRANULARITIES:
+                for key in ((derived, self.bucket(bucket, derived), test_key),
+                            (derived, self.bucket(bucket, derived), ALL_TESTS)):
+                    target = state['buckets'].get(key)
+                    if target is None:
+                        target = state['buckets'][key] = self._new_rollup()
+                    target['counts'].update(rollup['counts'])
+                    target['sketch'].merge(rollup['sketch'])
+        for source_file, test_name, runs in self.conn.execute(
+                'SELECT source_file, test_name, runs FROM rollup_runs'):
+            if source_file in self.files:
+                self.files[source_file]['runs'][test_name].extend(tuple(run) for run in json.loads(runs))
+
+        keys, test_names = set(), set()
+        for state in self.files.values():
+            keys.update(state['buckets'])
+            test_names.update(state['runs'])
+        self._remerge(keys, test_names)
+
+    def _save(self, source_file, state, keys, test_names):
+        """Tulis nilai absolut rollup / run yang berubah (idempotent antar process)"""
+        if self.conn is None:
+            return
+        try:
+            with self.conn:
+                self.conn.execute('BEGIN IMMEDIATE')
+                row = self.conn.execute('SELECT offset FROM rollup_files WHERE source_file = ?',
+                                        (source_file,)).fetchone()
+                if row is not None and row[0] > state['offset']:
+                    # Process lain (worker serve.py) sudah menyimpan state yang lebih baru
+                    return
+                self.conn.execute('INSERT OR REPLACE INTO rollup_files (source_file, offset) VALUES (?, ?)',
+                                  (source_file, state['offset']))
+                self.conn.executemany(
+                    'INSERT OR REPLACE INTO rollup_buckets (source_file, granularity, bucket, test_key, data) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    [(source_file, *key, json.dumps({
+                        'counts': state['buckets'][key]['counts'],
+                        'sketch': state['buckets'][key]['sketch'].to_dict()
+                    })) for key in keys if key[0] == PERSISTED_GRANULARITY and key[2] != ALL_TESTS]
+                )
+                self.conn.executemany(
+                    'INSERT OR REPLACE INTO rollup_runs (source_file, test_name, runs) VALUES (?, ?, ?)',
+                    [(source_file, test_name, json.dumps(list(state['runs'][test_name])))
+                     for test_name in test_names]
+                )
+        except sqlite3.Error as e:
+            print(f"Error saving rollups for {source_file}: {e}")
+
+    def _delete(self, source_file):
+        if self.conn is None:
+            return
+        try:
+            with self.conn:
+                for table in ('rollup_files', 'rollup_buckets', 'rollup_runs'):
+                    self.conn.execute(f'DELETE FROM {table} WHERE source_file = ?', (source_file,))
+        except sqlite3.Error as e:
+            print(f"Error deleting rollups for {source_file}: {e}")
+
+    def trends(self, granularity='day', test_name=None, since=None, until=None):
+        """Deret rollup urut waktu untuk satu test (atau semua test)"""
+        since = self.bucket(since, granularity) if since else None
+        until = self.bucket(until, granularity) if until else None
+        rows = []
+        with self.lock:
+            series = self.merged_buckets.get((granularity, test_name or ALL_TESTS), {})
+            for bucket in sorted(series):
+                if (since and bucket < since) or (until and bucket[:len(until)] > until):
+                    continue
+                counter, sketch = series[bucket]['counts'], series[bucket]['sketch']
+                passed, failed = counter['passed'], counter['failed']
+                total = passed + failed
+                p50, p90, p99 = sketch.quantiles((0.5, 0.9, 0.99))
+                rows.append({
+                    'bucket': bucket,
+                    'passed': passed,
+                    'failed': failed,
+                    'skipped': counter['skipped'],
+                    'total_tests': total,
+                    'pass_rate': round(passed / total * 100, 2) if total else 0,
+                    'avg_duration': round(sketch.total / sketch.count, 3) if sketch.count else 0,
+                    'p50_duration': round(p50, 3),
+                    'p90_duration': round(p90, 3),
+                    'p99_duration': round(p99, 3)
+                })
+        return rows
+
+    def last_statuses(self):
+        """Status run terakhir (passed / failed) per test dari semua file"""
+        with self.lock:
+            return {test_name: runs[-1][1] for test_name, runs in self.merged_runs.items() if runs}
+
+    @staticmethod
+    def flakiness(statuses):
+        """
+        Skor 0..1: proporsi run berurutan yang statusnya berganti
+        (pass -> fail atau fail -> pass). Selalu pass / selalu fail = 0.
+        """
+        if len(statuses) < 2:
+            return 0.0
+        transitions = sum(1 for previous, current in zip(statuses, statuses[1:]) if previous != current)
+        return transitions / (len(statuses) - 1)
+
+    def flaky_tests(self, window=20, min_runs=3, min_score=0.0, limit=50):
+        """Test diurutkan dari skor flakiness tertinggi pada window run terakhir"""
+        with self.lock:
+            runs = [(test_name, test_runs[-window:]) for test_name, test_runs in self.merged_runs.items()]
+
+        results = []
+        for test_name, test_runs in runs:
+            statuses = [status for _, status in test_runs]
+            if len(statuses) < min_runs:
+                continue
+            score = self.flakiness(statuses)
+            if score < min_score:
+                continue
+            failures = statuses.count('failed')
+            results.append({
+                'test_name': test_name,
+                'flakiness': round(score, 3),
+                'runs': len(statuses),
+                'failures': failures,
+                'fail_rate': round(failures / len(statuses) * 100, 2),
+                'last_status': statuses[-1],
+                'last_run': test_runs[-1][0],
+                'recent_statuses': statuses
+            })
+
+        results.sort(key=lambda r: (-r['flakiness'], -r['failures'], r['test_name']))
+        return results[:limit]
@@ -0,0 +1,199 @@
+"""
+Scheduler eksekusi test untuk QA Automation Dashboard
+
+Membatasi jumlah test yang berjalan bersamaan dengan worker pool, menyimpan
+sisanya di priority queue, dan mendukung cancel/timeout yang mematikan
+seluruh process tree (test runner + chromedriver + Chrome).
+"""
+
+import itertools
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+
+# Jalankan test di process group/session sendiri supaya bisa di-kill satu pohon
+if os.name == 'nt':
+    PROCESS_GROUP_KWARGS = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    PROCESS_GROUP_KWARGS = {'start_new_session': True}
+
+
+def kill_process_tree(process, grace_period=5):
+    """Matikan process beserta semua child process-nya"""
+    if process.poll() is not None:
+        return
+
+    try:
+        if os.name == 'nt':
+            subprocess.run(['taskkill', '/T', '/F', '/PID', str(process.pid)],
+                           capture_output=True)
+            return
+
+        os.killpg(process.pid, signal.SIGTERM)
+        try:
+            process.wait(timeout=grace_period)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+class TestScheduler:
+    """Worker pool dengan priority queue untuk eksekusi test"""
+
+    def __init__(self, max_workers=None, wait_samples=200):
+        """
+        Args:
+            max_workers: Jumlah test process paralel maksimum (default: jumlah CPU)
+            wait_samples: Jumlah sampel wait time terakhir untuk statistik
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.queue = queue.PriorityQueue()
+        self.sequence = itertools.count()
+        self.lock = threading.Lock()
+        # Slot = satu test process; eksekusi sharded memakai satu slot per shard
+        self.slots_available = threading.Condition(self.lock)
+        self.free_slots = self.max_workers
+        self.slot_tickets = itertools.count()
+        self.next_ticket = 0
+        # execution_id -> (waktu masuk antrian, jumlah slot)
+        self.queued = {}
+        # execution_id -> jumlah slot yang dipakai
+        self.running = {}
+        self.processes = {}
+        self.cancelled = set()
+        self.wait_times = deque(maxlen=wait_samples)
+        self.completed = 0
+        self.workers = []
+
+    def _ensure_workers(self):
+        with self.lock:
+            while len(self.workers) < self.max_workers:
+                worker = threading.Thread(target=self._worker, daemon=True)
+                worker.start()
+                self.workers.append(worker)
+
+    def submit(self, execution_id, func, args=(), priority=0, slots=1):
+        """
+        Masukkan eksekusi ke antrian.
+
+        Priority lebih besar dijalankan lebih dulu; priority sama diproses FIFO.
+        slots = jumlah process yang dijalankan eksekusi ini (misalnya jumlah
+        shard), maksimal max_workers.
+        """
+        if not 1 <= slots <= self.max_workers:
+            raise ValueError(f"slots must be between 1 and {self.max_workers}, got {slots}")
+        with self.lock:
+            self.queued[execution_id] = (time.monotonic(), slots)
+        self.queue.put((-priority, next(self.sequence), execution_id, func, args, slots))
+        self._ensure_workers()
+
+    def _acquire_slots(self, slots):
+        """
+        Tunggu sampai slot cukup. Urut tiket (= urutan keluar priority queue),
+        jadi eksekusi sharded tidak terus didahului eksekusi satu slot.
+        """
+        with self.slots_available:
+            ticket = next(self.slot_tickets)
+            self.slots_available.wait_for(lambda: ticket == self.next_ticket and self.free_slots >= slots)
+            self.free_slots -= slots
+            self.next_ticket += 1
+            self.slots_available.notify_all()
+
+    def _release_slots(self, slots):
+        """Kembalikan slot (self.lock harus sedang dipegang)"""
+        self.free_slots += slots
+        self.slots_available.notify_all()
+
+    def _worker(self):
+        while True:
+            _, _, execution_id, func, args, slots = self.queue.get()
+            with self.lock:
+                skip = execution_id in self.cancelled or execution_id not in self.queued
+            if not skip:
+                # Tetap tercatat queued (bisa di-cancel) selama menunggu slot
+                self._acquire_slots(slots)
+            with self.lock:
+                queued = self.queued.pop(execution_id, None)
+                if execution_id in self.cancelled or queued is None:
+                    # Sudah di-cancel sewaktu masih di antrian
+                    self.cancelled.discard(execution_id)
+                    if not skip:
+                        self._release_slots(slots)
+                    continue
+                self.wait_times.append(time.monotonic() - queued[0])
+                self.running[execution_id] = slots
+
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"Error running execution {execution_id}: {e}")
+            finally:
+                with self.lock:
+                    self.running.pop(execution_id, None)
+                    self.cancelled.discard(execution_id)
+                    self.completed += 1
+                    self._release_slots(slots)
+
+    def cancel(self, execution_id):
+        """
+        Cancel eksekusi. Return 'queued' atau 'running' sesuai state sebelum
+        di-cancel, atau None kalau eksekusi tidak aktif.
+        """
+        with self.lock:
+            if execution_id in self.queued:
+                del self.queued[execution_id]
+                return 'queued'
+            if execution_id not in self.running:
+                return None
+            self.cancelled.add(execution_id)
+            processes = list(self.processes.get(execution_id, ()))
+
+        for process in processes:
+            kill_process_tree(process)
+        return 'running'
+
+    def is_cancelled(self, execution_id):
+        with self.lock:
+            return execution_id in self.cancelled
+
+    def register_process(self, execution_id, process):
+        """
+        Catat subprocess milik eksekusi supaya bisa di-kill saat cancel.
+        Satu eksekusi bisa punya beberapa process (misalnya shard paralel).
+        """
+        with self.lock:
+            self.processes.setdefault(execution_id, []).append(process)
+            cancelled = execution_id in self.cancelled
+        if cancelled:
+            kill_process_tree(process)
+
+    def unregister_process(self, execution_id):
+        with self.lock:
+            self.processes.pop(execution_id, None)
+
+    def idle_slots(self):
+        """Slot yang belum terpakai dan belum dipesan eksekusi di antrian"""
+        with self.lock:
+            return self.free_slots - sum(slots for _, slots in self.queued.values())
+
+    def stats(self):
+        """Statistik antrian untuk API"""
+        now = time.monotonic()
+        with self.lock:
+            waits = list(self.wait_times)
+            oldest = min((enqueued_at for enqueued_at, _ in self.queued.values()), default=None)
+            return {
+                'max_workers': self.max_workers,
+                'queue_depth': len(self.queued),
+                'running': len(self.running),
+                'busy_slots': self.max_workers - self.free_slots,
+                'completed': self.completed,
+                'oldest_queued_wait': round(now - oldest, 3) if oldest is not None else 0,
+                'avg_wait_time': round(sum(waits) / len(waits), 3) if waits else 0,
+                'max_wait_time': round(max(waits), 3) if waits else 0
+            }
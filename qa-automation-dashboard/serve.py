@@ -0,0 +1,120 @@
+"""
+Production serving QA Automation Dashboard dengan beberapa worker process
+
+Socket di-bind sekali lalu dipakai bersama oleh beberapa worker process
+(Werkzeug threaded server, role 'web') yang melayani API. State eksekusi,
+antrian, permintaan cancel dan statistik scheduler disimpan di SQLite
+(QA_DASHBOARD_EXECUTION_STORE=sqlite), sehingga request status / history bisa
+dijawab worker mana pun. Hanya satu process scheduler (role 'scheduler') yang
+menjalankan test; process scheduler cadangan otomatis mengambil alih kalau
+owner berhenti.
+
+Log store default ikut memakai SQLite supaya worker tidak masing-masing
+menyimpan semua entry log di memory.
+
+Jalankan (POSIX):
+    python serve.py [--host 0.0.0.0] [--port 5005] [--workers 4]
+    python serve.py --no-scheduler      # scheduler dijalankan di process lain
+    python serve.py --scheduler-only    # hanya owner scheduler, tanpa HTTP
+
+Dengan WSGI server lain (misalnya gunicorn), jalankan worker dengan
+QA_DASHBOARD_EXECUTION_STORE=sqlite QA_DASHBOARD_ROLE=web lalu satu
+`python serve.py --scheduler-only`.
+"""
+
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+DASHBOARD_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_web_worker(host, port, fd):
+    """Worker HTTP di socket yang di-bind process induk"""
+    from werkzeug.serving import make_server
+
+    import app
+
+    server = make_server(host, port, app.app, threaded=True, fd=fd)
+    print(f"[web {os.getpid()}] serving on http://{host}:{port}")
+    server.serve_forever()
+
+
+def run_scheduler():
+    import app
+
+    print(f"[scheduler {os.getpid()}] waiting for executions")
+    app.run_execution_dispatcher()
+
+
+def spawn(args, role, pass_fds=()):
+    env = dict(os.environ, QA_DASHBOARD_ROLE=role)
+    return subprocess.Popen([sys.executable, os.path.abspath(__file__), *args],
+                            env=env, cwd=DASHBOARD_DIR, pass_fds=pass_fds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5005)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Jumlah worker HTTP')
+    parser.add_argument('--no-scheduler', action='store_true', help='Jangan jalankan owner scheduler')
+    parser.add_argument('--scheduler-only', action='store_true', help='Hanya jalankan owner scheduler')
+    parser.add_argument('--skip-prewarm', action='store_true', help='Jangan parse cache log sebelum start')
+    parser.add_argument('--worker-fd', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--scheduler', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    os.environ['QA_DASHBOARD_EXECUTION_STORE'] = 'sqlite'
+    os.environ.setdefault('QA_DASHBOARD_STORE', 'sqlite')
+
+    if args.worker_fd is not None:
+        run_web_worker(args.host, args.port, args.worker_fd)
+        return
+    if args.scheduler:
+        run_scheduler()
+        return
+    if os.name == 'nt':
+        parser.error('multi-process serving needs fd passing (POSIX only); use app.py on Windows')
+
+    if not args.skip_prewarm:
+        # Sekali di sini, supaya worker tidak parse cold start yang sama bersamaan
+        subprocess.run([sys.executable, os.path.join(DASHBOARD_DIR, 'prewarm.py')], cwd=DASHBOARD_DIR, check=True)
+
+    processes = []
+    if not args.no_scheduler:
+        processes.append(spawn(['--scheduler'], 'scheduler'))
+
+    if not args.scheduler_only:
+        sock = socket.create_server((args.host, args.port), backlog=128)
+        sock.set_inheritable(True)
+        fd = sock.fileno()
+        for _ in range(args.workers):
+            processes.append(spawn(['--host', args.host, '--port', str(args.port), '--worker-fd', str(fd)],
+                                   'web', pass_fds=(fd,)))
+        print(f"Serving on http://{args.host}:{args.port} with {args.workers} worker(s)")
+
+    def shutdown(*_):
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+        for process in processes:
+            process.wait()
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    try:
+        # Salah satu process berhenti -> hentikan semuanya (supervisor di luar yang restart)
+        while all(process.poll() is None for process in processes):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Sharding test pytest untuk eksekusi paralel di QA Automation Dashboard
+
+Test hasil collect dibagi ke N shard yang seimbang berdasarkan durasi
+historis (field duration dari QADashboardLogger). Test yang terakhir gagal
+dijalankan lebih dulu di shard-nya supaya feedback lebih cepat.
+"""
+
+import heapq
+import statistics
+import subprocess
+
+DEFAULT_TEST_DURATION = 1.0
+
+
+def collect_tests(test_path, cwd=None, timeout=120):
+    """Collect node id pytest untuk satu file / folder test"""
+    result = subprocess.run(
+        ['pytest', '--collect-only', '-q', test_path],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        timeout=timeout
+    )
+    return [line.strip() for line in result.stdout.splitlines() if '::' in line]
+
+
+def _history_key(node_id, history):
+    """Cocokkan node id dengan nama test di log (node id penuh atau nama fungsi)"""
+    if node_id in history:
+        return node_id
+    name = node_id.rsplit('::', 1)[-1]
+    if name in history:
+        return name
+    return name.split('[', 1)[0]
+
+
+def load_test_history(metrics, last_status):
+    """
+    Ambil (durasi rata-rata per test, set test yang terakhir gagal).
+
+    Args:
+        metrics: Snapshot /api/metrics (durasi per test)
+        last_status: Status run terakhir per test untuk semua test
+            (TestRollups.last_statuses), bukan hanya test_cases terbaru
+    """
+    durations = {
+        name: stats['avg_duration']
+        for name, stats in metrics.get('tests', {}).items()
+        if stats.get('total_tests') and stats.get('avg_duration')
+    }
+    failed = {name for name, status in last_status.items() if status == 'failed'}
+
+    return durations, failed
+
+
+def plan_shards(node_ids, durations, failed, num_shards):
+    """
+    Bagi test ke shard dengan greedy LPT (durasi terpanjang dulu ke shard
+    paling ringan). Return list shard: {'tests', 'estimated_duration'}.
+    """
+    known = [durations[key] for key in durations]
+    default = statistics.median(known) if known else DEFAULT_TEST_DURATION
+
+    tests = []
+    for node_id in node_ids:
+        key = _history_key(node_id, durations)
+        failed_key = _history_key(node_id, failed)
+        tests.append((node_id, durations.get(key, default), failed_key in failed))
+
+    num_shards = max(1, min(num_shards, len(tests)))
+    shards = [{'tests': [], 'failed_first': [], 'estimated_duration': 0.0} for _ in range(num_shards)]
+    heap = [(0.0, index) for index in range(num_shards)]
+
+    for node_id, duration, was_failed in sorted(tests, key=lambda t: -t[1]):
+        load, index = heapq.heappop(heap)
+        shard = shards[index]
+        (shard['failed_first'] if was_failed else shard['tests']).append(node_id)
+        shard['estimated_duration'] = load + duration
+        heapq.heappush(heap, (load + duration, index))
+
+    # Test yang terakhir gagal dijalankan duluan di shard-nya
+    return [
+        {
+            'tests': shard['failed_first'] + shard['tests'],
+            'previously_failed': len(shard['failed_first']),
+            'estimated_duration': round(shard['estimated_duration'], 3)
+        }
+        for shard in shards
+    ]
@@ -0,0 +1,163 @@
+"""
+Streaming quantile sketch untuk durasi test di QA Automation Dashboard
+
+DurationSketch memetakan setiap durasi ke bucket logaritmik (gaya DDSketch)
+sehingga percentile punya error relatif yang terbatas tanpa menyimpan semua
+sampel. Sketch bisa di-merge, jadi sketch per file / per time bucket cukup
+digabung saat snapshot.
+"""
+
+import bisect
+import math
+from collections import defaultdict
+
+# Batas atas bucket histogram yang ditampilkan (detik); bucket terakhir = sisanya
+HISTOGRAM_BOUNDS = (0.5, 1, 2, 5, 10, 30, 60, 120, 300)
+
+
+class DurationSketch:
+    """Sketch durasi dengan error relatif maksimum relative_accuracy"""
+
+    RELATIVE_ACCURACY = 0.01
+    # Durasi di bawah ini dihitung sebagai nol (dan durasi negatif tidak valid)
+    MIN_VALUE = 1e-6
+
+    gamma = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    log_gamma = math.log(gamma)
+
+    def __init__(self):
+        # defaultdict lebih murah dibuat daripada Counter (sketch dibuat per test / step / bucket)
+        self.bins = defaultdict(int)
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def key(cls, value):
+        return math.ceil(math.log(value) / cls.log_gamma)
+
+    @classmethod
+    def bin_value(cls, key):
+        """Nilai representatif bucket (error relatif <= RELATIVE_ACCURACY)"""
+        return 2 * cls.gamma ** key / (cls.gamma + 1)
+
+    def add(self, value, count=1):
+        # Hot path saat ingest (beberapa sketch per hasil test): key() di-inline
+        value = float(value)
+        if value < self.MIN_VALUE:
+            self.zero_count += count
+            value = max(value, 0.0)
+        else:
+            self.bins[math.ceil(math.log(value) / self.log_gamma)] += count
+        self.count += count
+        self.total += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def add_bin(self, key, count, total=0.0, minimum=None, maximum=None):
+        """Tambah isi bucket yang sudah jadi (misalnya dari tabel SQLite); key None = nol"""
+        if key is None:
+            self.zero_count += count
+        else:
+            self.bins[key] += count
+        self.count += count
+        self.total += total
+        if minimum is not None:
+            self.min = minimum if self.min is None else min(self.min, minimum)
+        if maximum is not None:
+            self.max = maximum if self.max is None else max(self.max, maximum)
+
+    def merge(self, other):
+        bins = self.bins
+        for key, count in other.bins.items():
+            bins[key] += count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def quantiles(self, qs):
+        """Beberapa percentile sekaligus dalam satu pass bucket terurut"""
+        if not self.count:
+            return [0] * len(qs)
+        results = []
+        keys = iter(sorted(self.bins))
+        seen = self.zero_count
+        value = 0.0
+        for q in qs:
+            rank = q * (self.count - 1)
+            while seen <= rank:
+                key = next(keys, None)
+                if key is None:
+                    value = self.max
+                    break
+                seen += self.bins[key]
+                # Jangan keluar dari rentang nilai yang benar-benar pernah dilihat
+                value = min(max(self.bin_value(key), self.min), self.max)
+            results.append(value)
+        return results
+
+    def quantile(self, q):
+        return self.quantiles([q])[0]
+
+    def histogram(self, bounds=HISTOGRAM_BOUNDS):
+        """
+        Jumlah sampel per bucket: counts[i] untuk durasi < bounds[i] (dan >= bound
+        sebelumnya), elemen terakhir untuk durasi >= bounds[-1].
+        """
+        counts = [0] * (len(bounds) + 1)
+        counts[0] += self.zero_count
+        for key, count in self.bins.items():
+            counts[bisect.bisect_right(bounds, self.bin_value(key))] += count
+        return counts
+
+    def summary(self):
+        """Field percentile + histogram untuk response /api/metrics"""
+        p50, p90, p99 = self.quantiles((0.5, 0.9, 0.99))
+        return {
+            'p50_duration': round(p50, 3),
+            'p90_duration': round(p90, 3),
+            'p99_duration': round(p99, 3),
+            'max_duration': round(self.max or 0, 3),
+            'duration_histogram': self.histogram()
+        }
+
+    def to_dict(self):
+        """Bentuk JSON-serializable (untuk dipersist, mis. TestRollups)"""
+        return {
+            'bins': [[key, count] for key, count in self.bins.items()],
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls()
+        for key, count in data['bins']:
+            sketch.bins[int(key)] += int(count)
+        sketch.zero_count = int(data['zero_count'])
+        sketch.count = int(data['count'])
+        sketch.total = float(data['total'])
+        sketch.min = data['min']
+        sketch.max = data['max']
+        return sketch
+
+
+def merge_sketches(sketches):
+    if len(sketches) == 1:
+        return sketches[0]
+    merged = DurationSketch()
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
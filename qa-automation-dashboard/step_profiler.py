@@ -0,0 +1,133 @@
+"""
+Profiler durasi step test untuk QA Automation Dashboard
+
+Mengumpulkan record span step dari QADashboardLogger (field step_duration)
+dan meranking step paling lambat lintas run dengan percentile, supaya
+kelihatan interaksi halaman mana yang mendominasi runtime test. Durasi
+disimpan sebagai DurationSketch + count/total, jadi total dan percentile
+mencakup semua span, bukan hanya sampel terbaru.
+"""
+
+import re
+import threading
+from collections import defaultdict
+
+from sketch import DurationSketch
+
+
+class StepProfiler:
+    """Listener LogIngestor yang menyimpan sketch durasi per (test, step)"""
+
+    # Fallback untuk log text: "Step done: Entering credentials (1.234s)"
+    STEP_PATTERN = re.compile(r'Step (done|FAILED): (.+) \((\d+\.?\d*)s\)$')
+    SORT_FIELDS = ('p50', 'p90', 'p99', 'max', 'mean', 'total', 'count')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Per source file: {(test, step): {'sketch': DurationSketch, 'failures': n}}
+        self.files = defaultdict(dict)
+        # (test, step) -> source file yang berisi step itu
+        self.key_files = defaultdict(set)
+        # Statistik gabungan per step, di-merge ulang saat snapshot hanya
+        # untuk step yang berubah
+        self.stats = {}
+        self.dirty = set()
+
+    @classmethod
+    def extract_step(cls, log_entry):
+        """Ambil (test, step, duration, failed) dari entry, None kalau bukan span step"""
+        if 'step_duration' in log_entry:
+            try:
+                duration = float(log_entry['step_duration'])
+            except (TypeError, ValueError):
+                return None
+            return (
+                log_entry.get('step_test'),
+                log_entry.get('step'),
+                duration,
+                log_entry.get('step_status') == 'failed'
+            )
+
+        match = cls.STEP_PATTERN.search(str(log_entry.get('message', '')))
+        if match:
+            return None, match.group(2), float(match.group(3)), match.group(1) == 'FAILED'
+        return None
+
+    @staticmethod
+    def _new_samples():
+        return {'sketch': DurationSketch(), 'failures': 0}
+
+    def ingest(self, source_file, entries, offsets=None):
+        with self.lock:
+            steps = self.files[source_file]
+            for log_entry in entries:
+                step = self.extract_step(log_entry)
+                if step is None:
+                    continue
+                test_name, name, duration, failed = step
+                key = (test_name, name)
+                samples = steps.get(key)
+                if samples is None:
+                    samples = steps[key] = self._new_samples()
+                    self.key_files[key].add(source_file)
+                samples['sketch'].add(duration)
+                samples['failures'] += failed
+                self.dirty.add(key)
+            if not steps:
+                del self.files[source_file]
+
+    def discard(self, source_file):
+        """Hapus kontribusi satu file; hanya step milik file itu yang digabung ulang"""
+        with self.lock:
+            steps = self.files.pop(source_file, None)
+            if steps is None:
+                return
+            for key in steps:
+                files = self.key_files[key]
+                files.discard(source_file)
+                if not files:
+                    del self.key_files[key]
+            self.dirty.update(steps)
+
+    @classmethod
+    def _combine(cls, entries):
+        combined = cls._new_samples()
+        for samples in entries:
+            combined['sketch'].merge(samples['sketch'])
+            combined['failures'] += samples['failures']
+        return combined
+
+    @staticmethod
+    def _stats(key, samples):
+        test_name, name = key
+        sketch = samples['sketch']
+        p50, p90, p99 = sketch.quantiles((0.5, 0.9, 0.99))
+        return {
+            'step': name,
+            'test_name': test_name,
+            'count': sketch.count,
+            'failures': samples['failures'],
+            'total': round(sketch.total, 3),
+            'mean': round(sketch.total / sketch.count, 3),
+            'p50': round(p50, 3),
+            'p90': round(p90, 3),
+            'p99': round(p99, 3),
+            'max': round(sketch.max, 3)
+        }
+
+    def snapshot(self, sort='p90', limit=50, test_name=None):
+        """Step paling lambat, diurutkan berdasarkan field sort (descending)"""
+        with self.lock:
+            for key in self.dirty:
+                entries = [self.files[source_file][key] for source_file in self.key_files.get(key, ())]
+                if not entries:
+                    self.stats.pop(key, None)
+                else:
+                    samples = entries[0] if len(entries) == 1 else self._combine(entries)
+                    self.stats[key] = self._stats(key, samples)
+            self.dirty.clear()
+            stats = list(self.stats.values())
+
+        if test_name:
+            stats = [s for s in stats if s['test_name'] == test_name]
+        return sorted(stats, key=lambda s: -s[sort])[:limit]
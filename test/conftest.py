@@ -0,0 +1,20 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Modul dashboard saling import sebagai modul top-level (from sketch import ...)
+DASHBOARD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'qa-automation-dashboard')
+sys.path.insert(0, DASHBOARD_DIR)
+
+# app.py membaca folder log / output saat di-import, arahkan ke folder sementara
+_dashboard_tmp = tempfile.mkdtemp(prefix='qa-dashboard-test-')
+os.environ.setdefault('QA_DASHBOARD_LOG_FOLDER', os.path.join(_dashboard_tmp, 'logs'))
+os.environ.setdefault('QA_DASHBOARD_OUTPUT_FOLDER', os.path.join(_dashboard_tmp, 'executions'))
+
+
+@pytest.fixture(scope="session")
+def dashboard():
+    import app
+    return app
@@ -3,12 +3,392 @@ QA Automation Logger - Terintegrasi dengan Dashboard
 Gunakan logger ini di script test automation Anda untuk mengirim data ke dashboard
 """
 
+import atexit
+import functools
+import gzip
+import itertools
 import logging
 import json
 import os
+import queue
+import shutil
+import threading
+import time
+import weakref
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+def compress_file(source, target, compression):
+    """Kompres source ke target (via file .tmp supaya atomic) lalu hapus source"""
+    tmp_path = f"{target}.tmp"
+    opener = gzip.open if compression == 'gzip' else zstandard.open
+    with open(source, 'rb') as src, opener(tmp_path, 'wb') as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    os.replace(tmp_path, target)
+    os.remove(source)
+
+
+class SegmentRotator:
+    """
+    Rotasi file log aktif berdasarkan ukuran / umur.
+    
+    Segment yang ditutup di-rename ke <nama>.<NNN>.<ext> lalu dikompres di
+    background thread menjadi <nama>.<NNN>.<ext>.gz (atau .zst). Selama
+    dikompres file bernama .part, jadi dashboard tidak pernah membaca segment
+    yang setengah jadi.
+    """
+    
+    COMPRESSIONS = ('auto', 'gzip', 'zstd', None)
+    
+    def __init__(self, file_path, max_bytes=0, max_age=0, compression='auto'):
+        """
+        Args:
+            file_path: File log aktif
+            max_bytes: Rotasi kalau segment melewati ukuran ini (0 = tidak dibatasi)
+            max_age: Rotasi kalau segment lebih tua dari max_age detik (0 = tidak dibatasi)
+            compression: 'auto' (zstd kalau tersedia, selain itu gzip), 'gzip',
+                'zstd' atau None untuk tidak dikompres
+        """
+        if compression not in self.COMPRESSIONS:
+            raise ValueError(f"compression must be one of {self.COMPRESSIONS}, got {compression!r}")
+        if compression == 'zstd' and zstandard is None:
+            raise ValueError("compression='zstd' requires the zstandard package")
+        if compression == 'auto':
+            compression = 'zstd' if zstandard is not None else 'gzip'
+        
+        self.file_path = Path(file_path)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compression = compression
+        self.size = self.file_path.stat().st_size if self.file_path.exists() else 0
+        self.opened_at = time.monotonic()
+        self.sequence = 0
+        self.pending = []
+    
+    def should_rotate(self, incoming=0):
+        if not self.size:
+            return False
+        if self.max_bytes and self.size + incoming > self.max_bytes:
+            return True
+        return bool(self.max_age) and time.monotonic() - self.opened_at >= self.max_age
+    
+    def _next_segment(self):
+        suffix = COMPRESSION_SUFFIXES.get(self.compression, '')
+        while True:
+            self.sequence += 1
+            segment = self.file_path.with_name(
+                f"{self.file_path.stem}.{self.sequence:03d}{self.file_path.suffix}"
+            )
+            candidates = (segment, Path(f"{segment}.part"), Path(f"{segment}{suffix}"))
+            if not any(path.exists() for path in candidates):
+                return segment
+    
+    def rotate(self):
+        """Pindahkan segment aktif (file harus sudah ditutup pemanggil)"""
+        if self.file_path.exists():
+            segment = self._next_segment()
+            if self.compression is None:
+                os.replace(self.file_path, segment)
+            else:
+                part_path = f"{segment}.part"
+                os.replace(self.file_path, part_path)
+                target = f"{segment}{COMPRESSION_SUFFIXES[self.compression]}"
+                worker = threading.Thread(
+                    target=self._compress, args=(part_path, target), daemon=True
+                )
+                worker.start()
+                self.pending = [t for t in self.pending if t.is_alive()] + [worker]
+        self.size = 0
+        self.opened_at = time.monotonic()
+    
+    def _compress(self, part_path, target):
+        try:
+            compress_file(part_path, target, self.compression)
+        except Exception as e:
+            print(f"QADashboardLogger error compressing {part_path}: {e}")
+    
+    def wait(self):
+        """Tunggu semua kompresi di background selesai"""
+        for worker in self.pending:
+            worker.join()
+        self.pending = []
+
+
+class SegmentFileHandler(logging.FileHandler):
+    """FileHandler untuk log text yang merotasi file lewat SegmentRotator"""
+    
+    def __init__(self, filename, rotator, encoding='utf-8'):
+        super().__init__(filename, encoding=encoding)
+        self.rotator = rotator
+    
+    def emit(self, record):
+        # Dipanggil di dalam lock handler
+        size = len(self.format(record)) + len(self.terminator)
+        if self.rotator.should_rotate(size):
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+            self.rotator.rotate()
+        super().emit(record)
+        self.rotator.size += size
+
+
+def _register_close(obj):
+    """
+    Daftarkan obj.close() ke atexit lewat weakref, supaya object yang sudah
+    tidak dipakai tetap bisa di-garbage-collect sebelum process exit.
+    Return callback-nya untuk atexit.unregister().
+    """
+    ref = weakref.ref(obj)
+    
+    def close():
+        target = ref()
+        if target is not None:
+            target.close()
+    
+    atexit.register(close)
+    return close
+
+
+class _WriterFlusher:
+    """
+    Satu background thread untuk semua BufferedJsonWriter: flush buffer yang
+    sudah tertahan flush_interval detik walaupun tidak ada write berikutnya.
+    Thread hanya tidur sampai deadline flush terdekat (atau sampai ada buffer
+    baru), jadi tidak ada polling saat idle.
+    """
+    
+    def __init__(self):
+        self.writers = weakref.WeakSet()
+        self.wakeup = threading.Event()
+        self.lock = threading.Lock()
+        self.thread = None
+    
+    def add(self, writer):
+        with self.lock:
+            self.writers.add(writer)
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="BufferedJsonWriter-flush", daemon=True)
+                self.thread.start()
+    
+    def _run(self):
+        while True:
+            self.wakeup.clear()
+            self.wakeup.wait(self._flush_due())
+    
+    def _flush_due(self):
+        """Flush writer yang lewat deadline; return detik ke deadline berikutnya"""
+        # Di method terpisah supaya thread tidak menahan referensi writer saat tidur
+        timeout = None
+        for writer in list(self.writers):
+            remaining = writer.flush_if_due(time.monotonic())
+            if remaining is not None and (timeout is None or remaining < timeout):
+                timeout = remaining
+        return timeout
+    
+    def close_all(self):
+        for writer in list(self.writers):
+            writer.close()
+
+
+_flusher = _WriterFlusher()
+atexit.register(_flusher.close_all)
+
+
+class BufferedJsonWriter:
+    """
+    Writer JSONL dengan file handle yang tetap terbuka.
+    
+    Baris log ditampung di memory dan di-flush ke disk kalau ukuran buffer
+    melewati buffer_size, baris tertua sudah tertahan flush_interval detik
+    (dicek background thread, jadi tetap jalan walaupun tidak ada write
+    lagi), atau saat diminta (misalnya log ERROR). Buffer juga di-flush saat
+    close(), saat writer di-garbage-collect dan saat process exit.
+    
+    Pakai acquire() / release() supaya beberapa logger yang menulis ke file
+    yang sama berbagi satu writer (satu file handle, baris tidak campur aduk).
+    """
+    
+    # file_path absolut -> writer yang masih dipakai
+    _shared = weakref.WeakValueDictionary()
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, file_path, buffer_size=64 * 1024, flush_interval=1.0, rotator=None):
+        """
+        Args:
+            file_path: File log tujuan (mode append)
+            buffer_size: Batas byte di buffer sebelum flush (0 = flush tiap baris)
+            flush_interval: Maksimal detik data tertahan di buffer (0 = tanpa flush berkala)
+            rotator: SegmentRotator opsional untuk rotasi ukuran / umur
+        """
+        self.file_path = file_path
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.rotator = rotator
+        self.buffer = []
+        self.buffered_bytes = 0
+        self.buffered_since = None
+        self.refs = 0
+        self.lock = threading.Lock()
+        self.file = open(file_path, 'a', encoding='utf-8')
+        _flusher.add(self)
+    
+    @classmethod
+    def acquire(cls, file_path, buffer_size=64 * 1024, flush_interval=1.0, rotator=None):
+        """Writer bersama untuk file_path; dibuat kalau belum ada yang terbuka"""
+        key = os.path.abspath(file_path)
+        with cls._shared_lock:
+            writer = cls._shared.get(key)
+            if writer is None or writer.file is None:
+                writer = cls(file_path, buffer_size, flush_interval, rotator)
+                cls._shared[key] = writer
+            writer.refs += 1
+            return writer
+    
+    def release(self):
+        """Lepas satu referensi acquire(); return True kalau file ikut ditutup"""
+        with self._shared_lock:
+            self.refs -= 1
+            if self.refs > 0:
+                return False
+        self.close()
+        return True
+    
+    def write(self, line, flush=False):
+        with self.lock:
+            if self.file is None:
+                raise ValueError(f"Writer for {self.file_path} is closed")
+            
+            started = not self.buffer
+            now = time.monotonic()
+            if started:
+                self.buffered_since = now
+            self.buffer.append(line)
+            self.buffered_bytes += len(line)
+            if (flush or self.buffered_bytes >= self.buffer_size
+                    or (self.flush_interval and now - self.buffered_since >= self.flush_interval)):
+                self._flush()
+                return
+        # Buffer baru terisi: bangunkan flusher supaya deadline-nya ikut dihitung
+        if started and self.flush_interval:
+            _flusher.wakeup.set()
+    
+    def flush_if_due(self, now):
+        """Flush kalau deadline lewat; return sisa detik ke deadline, None kalau tidak ada"""
+        with self.lock:
+            if self.file is None or not self.buffer or not self.flush_interval:
+                return None
+            remaining = self.buffered_since + self.flush_interval - now
+            if remaining > 0:
+                return remaining
+            self._flush()
+            return None
+    
+    def _flush(self):
+        if self.buffer:
+            if self.rotator and self.rotator.should_rotate(self.buffered_bytes):
+                self.file.close()
+                self.rotator.rotate()
+                self.file = open(self.file_path, 'a', encoding='utf-8')
+            self.file.write(''.join(self.buffer))
+            if self.rotator:
+                self.rotator.size += self.buffered_bytes
+            self.buffer = []
+            self.buffered_bytes = 0
+            self.buffered_since = None
+        self.file.flush()
+    
+    def flush(self):
+        with self.lock:
+            if self.file is not None:
+                self._flush()
+    
+    def close(self):
+        with self.lock:
+            if self.file is None:
+                return
+            self._flush()
+            self.file.close()
+            self.file = None
+    
+    def __del__(self):
+        # Logger dibuang tanpa close(): sisa buffer jangan sampai hilang
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class StepSpan:
+    """
+    Span timing untuk satu langkah test.
+
+    Bisa dipakai sebagai context manager atau decorator:
+
+        with logger.step("Entering credentials"):
+            ...
+
+        @logger.step("Open login page")
+        def open_login(driver): ...
+
+    Saat selesai, satu record ditulis dengan field step, step_id, step_parent,
+    step_depth, step_test, step_start/step_end (detik monotonic sejak logger
+    dibuat), step_duration dan step_status.
+    """
+
+    def __init__(self, qa_logger, description=None, test_name=None, log_start=True):
+        self.qa_logger = qa_logger
+        self.description = description
+        self.test_name = test_name
+        self.log_start = log_start
+        self.step_id = None
+        self.parent_id = None
+        self.depth = 0
+        self.start = None
+
+    def __enter__(self):
+        qa_logger = self.qa_logger
+        stack = qa_logger._step_stack()
+        self.step_id = next(qa_logger.step_ids)
+        self.parent_id = stack[-1].step_id if stack else None
+        self.depth = len(stack)
+        if self.test_name is None:
+            self.test_name = stack[-1].test_name if stack else qa_logger.current_test
+        stack.append(self)
+
+        if self.log_start:
+            qa_logger.debug(f"Step: {self.description}")
+        self.start = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.monotonic()
+        stack = self.qa_logger._step_stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        self.qa_logger._log_step_span(self, end, exc)
+        return False
+
+    def __call__(self, func):
+        description = self.description or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # Span baru per pemanggilan supaya nesting & timing tidak tercampur
+            with StepSpan(self.qa_logger, description, self.test_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+
 class QADashboardLogger:
     """
     Custom logger untuk QA Automation yang terintegrasi dengan dashboard
@@ -25,7 +405,16 @@ class QADashboardLogger:
     logger.log_test_fail("test_checkout", duration=3.2, error="Element not found")
     """
     
-    def __init__(self, test_suite_name, log_dir="logs", use_json=True):
+    # Level yang langsung di-flush ke disk
+    FLUSH_LEVELS = ('ERROR',)
+    
+    # Kebijakan saat antrian async penuh
+    BACKPRESSURE_POLICIES = ('block', 'drop_debug')
+    
+    def __init__(self, test_suite_name, log_dir="logs", use_json=True, console=True,
+                 buffer_size=64 * 1024, flush_interval=1.0,
+                 async_mode=False, queue_size=10000, backpressure='block',
+                 max_bytes=0, max_age=0, compression='auto'):
         """
         Inisialisasi logger
         
@@ -33,23 +422,57 @@ class QADashboardLogger:
             test_suite_name: Nama test suite
             log_dir: Direktori untuk menyimpan log
             use_json: True untuk format JSON, False untuk format text
+            console: True untuk menampilkan log ke console juga
+            buffer_size: Ukuran buffer (byte) writer JSON, 0 = flush tiap baris
+            flush_interval: Maksimal detik log JSON tertahan di buffer (di-flush
+                background thread walaupun tidak ada log berikutnya)
+            async_mode: True untuk menulis log dari background thread, sehingga
+                thread test hanya memasukkan record ke antrian
+            queue_size: Kapasitas antrian record di async_mode
+            backpressure: 'block' (tunggu antrian kosong) atau 'drop_debug'
+                (buang record DEBUG kalau antrian penuh)
+            max_bytes: Rotasi file log setelah sekian byte (0 = tanpa rotasi)
+            max_age: Rotasi file log setelah sekian detik (0 = tanpa rotasi)
+            compression: Kompresi segment yang sudah ditutup: 'auto' (zstd
+                kalau terpasang, selain itu gzip), 'gzip', 'zstd' atau None
         """
+        if backpressure not in self.BACKPRESSURE_POLICIES:
+            raise ValueError(f"backpressure must be one of {self.BACKPRESSURE_POLICIES}, got {backpressure!r}")
+        
         self.test_suite_name = test_suite_name
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
         self.use_json = use_json
+        self.console = console
         
         # Setup logger
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         log_ext = "json" if use_json else "log"
         self.log_file = self.log_dir / f"{test_suite_name}_{timestamp}.{log_ext}"
         
+        # Rotasi segment (opsional): segment lama dikompres, file aktif tetap log_file
+        self.rotator = None
+        if max_bytes or max_age:
+            self.rotator = SegmentRotator(self.log_file, max_bytes, max_age, compression)
+        
+        self.writer = None
+        self._released = False
+        self.file_handler = None
+        if use_json:
+            # Logger lain yang menulis ke file yang sama memakai writer (dan rotator) yang sama
+            self.writer = BufferedJsonWriter.acquire(self.log_file, buffer_size, flush_interval, self.rotator)
+            self.rotator = self.writer.rotator
+        
         # Setup Python logger untuk format text
         if not use_json:
             self.logger = logging.getLogger(test_suite_name)
             self.logger.setLevel(logging.DEBUG)
             
-            handler = logging.FileHandler(self.log_file, encoding='utf-8')
+            if self.rotator:
+                handler = SegmentFileHandler(self.log_file, self.rotator)
+            else:
+                handler = logging.FileHandler(self.log_file, encoding='utf-8')
+            self.file_handler = handler
             formatter = logging.Formatter(
                 '%(asctime)s - %(levelname)s - %(message)s',
                 datefmt='%Y-%m-%d %H:%M:%S'
@@ -58,59 +481,149 @@ class QADashboardLogger:
             self.logger.addHandler(handler)
             
             # Console handler
-            console = logging.StreamHandler()
-            console.setFormatter(formatter)
-            self.logger.addHandler(console)
+            if console:
+                console_handler = logging.StreamHandler()
+                console_handler.setFormatter(formatter)
+                self.logger.addHandler(console_handler)
         
         self.test_results = []
         self.start_time = datetime.now()
+        
+        # State step profiler
+        self.current_test = None
+        self.step_ids = itertools.count(1)
+        self.monotonic_origin = time.monotonic()
+        self._steps = threading.local()
+        
+        # Pipeline async: record diproses background thread
+        self.backpressure = backpressure
+        self.dropped = 0
+        self.queue = None
+        self.worker = None
+        if async_mode:
+            self.queue = queue.Queue(maxsize=queue_size)
+            self.worker = threading.Thread(
+                target=self._process_queue,
+                name=f"QADashboardLogger-{test_suite_name}",
+                daemon=True
+            )
+            self.worker.start()
+        self._atexit = None
+        if async_mode or self.rotator:
+            self._atexit = _register_close(self)
+    
+    def _log(self, level, message, **kwargs):
+        """Tulis log langsung, atau masukkan ke antrian di async_mode"""
+        created = time.time()
+        if self.queue is None:
+            self._emit(level, message, created, kwargs)
+            return
+        
+        record = (level, message, created, kwargs)
+        if level == 'DEBUG' and self.backpressure == 'drop_debug':
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+        else:
+            self.queue.put(record)
+    
+    def _process_queue(self):
+        """Loop background thread: serialisasi + I/O untuk setiap record"""
+        while True:
+            record = self.queue.get()
+            try:
+                if record is None:
+                    return
+                self._emit(*record)
+            except Exception as e:
+                print(f"QADashboardLogger error: {e}")
+            finally:
+                self.queue.task_done()
+    
+    def _emit(self, level, message, created, kwargs):
+        if self.use_json:
+            self._write_json_log(level, message, _created=created, **kwargs)
+        else:
+            self._write_text_log(level, message, created)
     
-    def _write_json_log(self, level, message, **kwargs):
+    def _write_text_log(self, level, message, created):
+        """Write log entry lewat logging handler (format text)"""
+        record = self.logger.makeRecord(
+            self.logger.name, logging.getLevelName(level), __file__, 0, message, None, None
+        )
+        # Pakai waktu saat log dipanggil, bukan saat diproses background thread
+        record.created = created
+        record.msecs = (created - int(created)) * 1000
+        self.logger.handle(record)
+    
+    def _write_json_log(self, level, message, _created=None, **kwargs):
         """Write log entry dalam format JSON"""
+        created = datetime.fromtimestamp(_created) if _created else datetime.now()
         log_entry = {
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp': created.strftime('%Y-%m-%d %H:%M:%S'),
             'level': level,
             'message': message,
             'test_suite': self.test_suite_name,
             **kwargs
         }
         
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(log_entry) + '\n')
+        self.writer.write(json.dumps(log_entry) + '\n', flush=level in self.FLUSH_LEVELS)
         
         # Print ke console
-        print(f"[{log_entry['timestamp']}] {level}: {message}")
+        if self.console:
+            print(f"[{log_entry['timestamp']}] {level}: {message}")
+    
+    def flush(self):
+        """Tunggu antrian async kosong lalu flush buffer ke disk"""
+        if self.worker is not None and self.worker.is_alive():
+            self.queue.join()
+        if self.writer:
+            self.writer.flush()
+    
+    def close(self):
+        """
+        Drain antrian async, flush dan tutup file log. Kalau rotasi aktif,
+        segment terakhir juga dikompres.
+        """
+        if self.worker is not None and self.worker.is_alive():
+            self.queue.put(None)
+            self.worker.join()
+        if self._atexit is not None:
+            atexit.unregister(self._atexit)
+            self._atexit = None
+        last = True
+        if self.writer and not self._released:
+            # Writer bersama baru ditutup (dan segment terakhirnya dirotasi) oleh logger terakhir
+            self._released = True
+            last = self.writer.release()
+        if self.rotator and last:
+            if self.file_handler:
+                self.logger.removeHandler(self.file_handler)
+                self.file_handler.close()
+            if self.rotator.size:
+                self.rotator.rotate()
+            self.rotator.wait()
     
     def info(self, message, **kwargs):
         """Log pesan INFO"""
-        if self.use_json:
-            self._write_json_log('INFO', message, **kwargs)
-        else:
-            self.logger.info(message)
+        self._log('INFO', message, **kwargs)
     
     def warning(self, message, **kwargs):
         """Log pesan WARNING"""
-        if self.use_json:
-            self._write_json_log('WARNING', message, **kwargs)
-        else:
-            self.logger.warning(message)
+        self._log('WARNING', message, **kwargs)
     
     def error(self, message, **kwargs):
         """Log pesan ERROR"""
-        if self.use_json:
-            self._write_json_log('ERROR', message, **kwargs)
-        else:
-            self.logger.error(message)
+        self._log('ERROR', message, **kwargs)
     
     def debug(self, message, **kwargs):
         """Log pesan DEBUG"""
-        if self.use_json:
-            self._write_json_log('DEBUG', message, **kwargs)
-        else:
-            self.logger.debug(message)
+        self._log('DEBUG', message, **kwargs)
     
     def log_test_start(self, test_name):
         """Log dimulainya sebuah test"""
+        self.current_test = test_name
         self.info(f"Starting test: {test_name}")
     
     def log_test_pass(self, test_name, duration=None):
@@ -161,8 +674,43 @@ class QADashboardLogger:
             self.error(message)
     
     def log_step(self, step_description):
-        """Log langkah test"""
+        """
+        Log langkah test.
+
+        Return StepSpan, jadi `with logger.log_step("..."):` sekaligus
+        mencatat durasi langkah tersebut.
+        """
         self.debug(f"Step: {step_description}")
+        return StepSpan(self, step_description, log_start=False)
+    
+    def step(self, description=None, test_name=None):
+        """Span timing langkah test (context manager / decorator)"""
+        return StepSpan(self, description, test_name)
+    
+    def _step_stack(self):
+        stack = getattr(self._steps, 'stack', None)
+        if stack is None:
+            stack = self._steps.stack = []
+        return stack
+    
+    def _log_step_span(self, span, end, error=None):
+        duration = end - span.start
+        status = 'failed' if error else 'passed'
+        message = f"Step {'FAILED' if error else 'done'}: {span.description} ({duration:.3f}s)"
+        self._log(
+            'ERROR' if error else 'INFO',
+            message,
+            step=span.description,
+            step_id=span.step_id,
+            step_parent=span.parent_id,
+            step_depth=span.depth,
+            step_test=span.test_name,
+            step_start=round(span.start - self.monotonic_origin, 6),
+            step_end=round(end - self.monotonic_origin, 6),
+            step_duration=round(duration, 6),
+            step_status=status,
+            step_error=str(error) if error else None
+        )
     
     def log_screenshot(self, test_name, screenshot_path):
         """Log lokasi screenshot"""
@@ -193,6 +741,7 @@ Total Duration: {total_duration:.2f}s
         """
         
         self.info(summary.strip())
+        self.flush()
         
         return {
             'test_suite': self.test_suite_name,
@@ -214,6 +763,7 @@ def example_selenium_integration():
     """
     from selenium import webdriver
     from selenium.webdriver.common.by import By
+    from pages.base_page import BasePage
     import time
     
     # Inisialisasi logger
@@ -224,6 +774,7 @@ def example_selenium_integration():
     try:
         # Setup driver
         driver = webdriver.Chrome()
+        page = BasePage(driver, logger=logger)
         logger.info("Chrome WebDriver initialized successfully")
         
         # Test Case 1: Login Test
@@ -235,14 +786,15 @@ def example_selenium_integration():
             logger.log_step("Navigating to login page")
             driver.get("https://example.com/login")
             
-            logger.log_step("Entering credentials")
-            driver.find_element(By.ID, "username").send_keys("testuser")
-            driver.find_element(By.ID, "password").send_keys("password123")
-            
-            logger.log_step("Clicking login button")
-            driver.find_element(By.ID, "login-btn").click()
+            # Span step: durasi tercatat di field step_duration
+            with logger.step("Entering credentials"):
+                driver.find_element(By.ID, "username").send_keys("testuser")
+                driver.find_element(By.ID, "password").send_keys("password123")
             
-            time.sleep(2)
+            with logger.step("Clicking login button"):
+                driver.find_element(By.ID, "login-btn").click()
+                # Explicit wait, bukan sleep tetap
+                page.wait_for_url_contains("dashboard")
             
             # Verify login
             logger.log_step("Verifying successful login")
@@ -267,7 +819,7 @@ def example_selenium_integration():
             search_box.send_keys("laptop")
             search_box.submit()
             
-            time.sleep(2)
+            page.wait_for_visible((By.CLASS_NAME, "product-item"))
             
             logger.log_step("Verifying search results")
             results = driver.find_elements(By.CLASS_NAME, "product-item")
@@ -307,12 +859,14 @@ def example_pytest_integration():
 import pytest
 from qa_logger import QADashboardLogger
 
-@pytest.fixture(scope="session")
-def qa_logger():
-    """Fixture untuk QA Dashboard Logger"""
+@pytest.fixture(scope="session", autouse=True)
+def qa_logger(request):
+    """Satu logger untuk seluruh session (satu file log, satu file handle)"""
     logger = QADashboardLogger("PytestTestSuite", use_json=True)
+    request.config.qa_logger = logger
     yield logger
     logger.generate_summary()
+    logger.close()
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -320,9 +874,9 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
     
-    if report.when == "call":
-        logger = QADashboardLogger("PytestTestSuite", use_json=True)
-        
+    # Pakai logger session yang sama, jangan buat logger baru per test
+    logger = getattr(item.config, "qa_logger", None)
+    if report.when == "call" and logger is not None:
         if report.passed:
             logger.log_test_pass(item.nodeid, duration=report.duration)
         elif report.failed:
@@ -6,16 +6,19 @@ import time
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from test.qa_logger import QADashboardLogger
+from pages.base_page import BasePage
 
 class TestSelenium:
     def __init__(self):
         self.logger = QADashboardLogger("SeleniumTest", use_json=True)
         self.driver = None
+        self.page = None
     
     def setup(self):
         self.logger.info("Initializing Chrome WebDriver")
         self.driver = webdriver.Chrome()
         self.driver.maximize_window()
+        self.page = BasePage(self.driver, logger=self.logger)
     
     def test_google_search(self):
         test_name = "test_google_search"
@@ -27,11 +30,11 @@ class TestSelenium:
             self.driver.get("https://www.google.com")
             
             self.logger.log_step("Entering search query")
-            search_box = self.driver.find_element(By.NAME, "q")
+            search_box = self.page.wait_for_visible((By.NAME, "q"))
             search_box.send_keys("Selenium Python")
             search_box.submit()
             
-            time.sleep(2)
+            self.page.wait_for_title_contains("Selenium")
             
             self.logger.log_step("Verifying results")
             assert "Selenium" in self.driver.title
@@ -0,0 +1,85 @@
+import gzip
+import json
+import os
+
+import pytest
+
+
+@pytest.fixture
+def client(dashboard):
+    dashboard.response_cache.clear()
+    for name in os.listdir(dashboard.LOG_FOLDER):
+        if name.startswith('api-'):
+            os.remove(os.path.join(dashboard.LOG_FOLDER, name))
+    return dashboard.app.test_client()
+
+
+def append_log(dashboard, name, count, start=0):
+    with open(os.path.join(dashboard.LOG_FOLDER, name), 'a', encoding='utf-8') as f:
+        for i in range(start, start + count):
+            f.write(json.dumps({
+                'timestamp': f'2024-01-01 10:{i // 60 % 60:02d}:{i % 60:02d}',
+                'level': 'INFO',
+                'message': f'Test PASSED: test_{i}',
+                'test_name': f'test_{i}',
+                'status': 'passed',
+                'duration': 0.5 + i
+            }) + '\n')
+
+
+def test_etag_not_modified_until_logs_change(dashboard, client):
+    append_log(dashboard, 'api-etag.json', 3)
+
+    first = client.get('/api/logs?file=api-etag')
+    assert first.status_code == 200
+    assert first.get_json()['count'] == 3
+    etag = first.headers['ETag']
+    assert first.headers['Last-Modified']
+    assert 'no-cache' in first.headers['Cache-Control']
+
+    cached = client.get('/api/logs?file=api-etag', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+
+    # Query string lain = entry cache lain
+    other = client.get('/api/logs?file=api-etag&limit=1')
+    assert other.status_code == 200
+    assert other.headers['ETag'] != etag
+
+    append_log(dashboard, 'api-etag.json', 1, start=3)
+    changed = client.get('/api/logs?file=api-etag', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.get_json()['count'] == 4
+    assert changed.headers['ETag'] != etag
+
+
+def test_if_modified_since(dashboard, client):
+    append_log(dashboard, 'api-modified.json', 2)
+    first = client.get('/api/metrics')
+    assert first.status_code == 200
+
+    cached = client.get('/api/metrics', headers={'If-Modified-Since': first.headers['Last-Modified']})
+    assert cached.status_code == 304
+
+
+def test_error_response_is_not_cached(dashboard, client):
+    response = client.get('/api/logs?limit=0')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+    assert 'ETag' not in response.headers
+    assert client.get('/api/logs?cursor=garbage').status_code == 400
+
+
+def test_gzip_body_has_own_etag(dashboard, client):
+    append_log(dashboard, 'api-gzip.json', 100)
+
+    plain = client.get('/api/logs?file=api-gzip')
+    compressed = client.get('/api/logs?file=api-gzip', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert json.loads(gzip.decompress(compressed.data)) == plain.get_json()
+    assert compressed.headers['ETag'] != plain.headers['ETag']
+
+    cached = client.get('/api/logs?file=api-gzip', headers={
+        'Accept-Encoding': 'gzip', 'If-None-Match': compressed.headers['ETag']})
+    assert cached.status_code == 304
@@ -0,0 +1,206 @@
+import json
+import os
+
+import pytest
+
+
+def write_lines(path, lines, mode='a'):
+    with open(path, mode, encoding='utf-8') as f:
+        f.write(''.join(lines))
+
+
+def json_line(i, timestamp='2024-01-01 10:00:00', **fields):
+    return json.dumps({'timestamp': timestamp, 'level': 'INFO', 'message': f'line {i}', **fields}) + '\n'
+
+
+def messages(ingestor):
+    return [log_entry['message'] for log_entry in ingestor.entries()]
+
+
+@pytest.fixture
+def ingestor(dashboard, tmp_path):
+    log_folder = tmp_path / 'logs'
+    log_folder.mkdir()
+    (tmp_path / 'cache').mkdir()
+    return dashboard.LogIngestor(str(log_folder), str(tmp_path / 'cache'))
+
+
+def test_append_only_reads_new_lines(dashboard, ingestor):
+    path = os.path.join(ingestor.log_folder, 'run.json')
+    write_lines(path, [json_line(i) for i in range(3)])
+    ingestor.refresh()
+    assert messages(ingestor) == ['line 0', 'line 1', 'line 2']
+
+    batches = []
+
+    class Listener:
+        def ingest(self, source_file, entries, offsets):
+            batches.append((source_file, [log_entry['message'] for log_entry in entries], offsets))
+
+        def discard(self, source_file):
+            batches.append(('discard', source_file))
+
+    ingestor.add_listener(Listener())
+    size = os.path.getsize(path)
+    write_lines(path, [json_line(3), json_line(4)])
+    ingestor.refresh()
+
+    assert messages(ingestor) == [f'line {i}' for i in range(5)]
+    assert batches == [('run.json', ['line 3', 'line 4'], [size, size + len(json_line(3))])]
+    assert ingestor.files['run.json']['offset'] == os.path.getsize(path)
+
+
+def test_partial_trailing_line_waits_for_newline(ingestor):
+    path = os.path.join(ingestor.log_folder, 'run.json')
+    line = json_line(1)
+    write_lines(path, [json_line(0), line[:10]])
+    ingestor.refresh()
+    assert messages(ingestor) == ['line 0']
+    assert ingestor.files['run.json']['offset'] == len(json_line(0))
+
+    write_lines(path, [line[10:]])
+    ingestor.refresh()
+    assert messages(ingestor) == ['line 0', 'line 1']
+
+
+def test_truncate_and_rotate_reread_from_start(ingestor):
+    path = os.path.join(ingestor.log_folder, 'run.json')
+    write_lines(path, [json_line(i) for i in range(4)])
+    ingestor.refresh()
+
+    discarded = []
+
+    class Listener:
+        def ingest(self, source_file, entries, offsets):
+            pass
+
+        def discard(self, source_file):
+            discarded.append(source_file)
+
+    ingestor.add_listener(Listener())
+
+    # Truncate: file lebih kecil dari offset terakhir
+    write_lines(path, [json_line('a')], mode='w')
+    ingestor.refresh()
+    assert messages(ingestor) == ['line a']
+    assert discarded == ['run.json']
+
+    # Rotate: file diganti (inode baru) dengan isi lebih panjang
+    rotated = path + '.tmp'
+    write_lines(rotated, [json_line(i) for i in 'bcdefg'], mode='w')
+    os.replace(rotated, path)
+    ingestor.refresh()
+    assert messages(ingestor) == [f'line {i}' for i in 'bcdefg']
+    assert discarded == ['run.json', 'run.json']
+
+
+def test_restart_restores_entries_from_cache(dashboard, ingestor):
+    path = os.path.join(ingestor.log_folder, 'run.log')
+    write_lines(path, ['2024-01-01 10:00:00 - INFO - first\n', '2024-01-01 10:00:01 - ERROR - second\n'])
+    ingestor.refresh()
+    assert os.path.exists(ingestor._cache_path('run.log'))
+
+    restarted = dashboard.LogIngestor(ingestor.log_folder, ingestor.cache_folder)
+    restarted.refresh()
+    assert messages(restarted) == ['first', 'second']
+    assert restarted.files['run.log']['offset'] == os.path.getsize(path)
+
+
+def write_paging_logs(log_folder):
+    # Beberapa entry punya timestamp sama (antar file dan di dalam file)
+    write_lines(os.path.join(log_folder, 'a.json'), [
+        json_line(i, timestamp=f'2024-01-01 10:00:{i // 2:02d}', test_suite='suite-a')
+        for i in range(0, 40, 2)
+    ], mode='w')
+    write_lines(os.path.join(log_folder, 'b.json'), [
+        json_line(i, timestamp=f'2024-01-01 10:00:{i // 2:02d}', test_suite='suite-b')
+        for i in range(1, 40, 2)
+    ] + [json_line(99, timestamp='2024-01-01 10:00:19', level='ERROR')], mode='w')
+
+
+def paginate(source, limit, **filters):
+    from app import LogIngestor
+
+    pages, cursor = [], None
+    while True:
+        page, last_key = [], None
+        for key, log_entry in source.scan(cursor=cursor, **filters):
+            if len(page) >= limit:
+                break
+            last_key = key
+            page.append(log_entry['message'])
+        else:
+            pages.append(page)
+            return pages
+        pages.append(page)
+        cursor = LogIngestor.decode_cursor(LogIngestor.encode_cursor(last_key))
+
+
+def test_cursor_pagination_matches_full_scan(ingestor):
+    write_paging_logs(ingestor.log_folder)
+    ingestor.refresh()
+
+    full = [log_entry['message'] for _, log_entry in ingestor.scan()]
+    assert len(full) == 41
+    pages = paginate(ingestor, 7)
+    assert all(len(page) == 7 for page in pages[:-1])
+    assert [message for page in pages for message in page] == full
+
+    keys = [key for key, _ in ingestor.scan()]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_memory_and_sqlite_scan_parity(dashboard, tmp_path, ingestor):
+    write_paging_logs(ingestor.log_folder)
+    ingestor.refresh()
+
+    log_store = dashboard.SQLiteLogStore(str(tmp_path / 'logs.db'), dashboard.MetricsAggregator.extract_result)
+    (tmp_path / 'sqlite-cache').mkdir()
+    sqlite_ingestor = dashboard.LogIngestor(ingestor.log_folder, str(tmp_path / 'sqlite-cache'), keep_entries=False)
+    sqlite_ingestor.add_listener(log_store)
+    sqlite_ingestor.refresh()
+
+    for filters in ({}, {'level': 'error'}, {'file_filter': 'b.json'}, {'test_suite': 'suite-a'},
+                    {'since': '2024-01-01 10:00:05', 'until': '2024-01-01 10:00:12'}):
+        assert paginate(log_store, 6, **filters) == paginate(ingestor, 6, **filters)
+
+
+def test_decode_cursor_rejects_garbage(dashboard):
+    with pytest.raises(ValueError):
+        dashboard.LogIngestor.decode_cursor('not-a-cursor')
+
+
+@pytest.mark.parametrize('suffix', ['.json', '.log'])
+def test_bulk_ingest_chunked_parse_matches_serial(dashboard, tmp_path, suffix):
+    import bulk_ingest
+
+    path = str(tmp_path / f'big{suffix}')
+    if suffix == '.json':
+        lines = [json_line(i, status='passed' if i % 3 else 'failed') for i in range(500)]
+        lines.insert(100, 'not json\n')
+    else:
+        lines = [f'2024-01-01 10:{i // 60 % 60:02d}:{i % 60:02d} - INFO - message {i}\n' for i in range(500)]
+        lines.insert(100, 'continuation line without timestamp\n')
+    # Baris terakhir belum selesai ditulis
+    write_lines(path, lines + ['{"partial'], mode='w')
+    size = os.path.getsize(path)
+    is_json = suffix == '.json'
+    pattern = dashboard.LogParser.TEXT_PATTERN.pattern
+
+    ((_, serial_entries, serial_offsets, serial_end),) = bulk_ingest.parse_files(
+        [(path, size, is_json, False)], pattern, workers=1, chunk_size=size + 1)
+    assert len(bulk_ingest.plan_chunks(path, size, 1000)) > 5
+    ((_, chunked_entries, chunked_offsets, chunked_end),) = bulk_ingest.parse_files(
+        [(path, size, is_json, False)], pattern, workers=1, chunk_size=1000)
+
+    assert chunked_entries == serial_entries
+    assert chunked_offsets == serial_offsets
+    assert chunked_end == serial_end == size - len('{"partial')
+    assert len(serial_entries) == 500
+
+    # Sama dengan parse incremental LogIngestor
+    ingestor = dashboard.LogIngestor(str(tmp_path), None)
+    ingestor.refresh()
+    state = ingestor.files[os.path.basename(path)]
+    assert [{k: v for k, v in log_entry.items() if k != 'source_file'} for log_entry in state['entries']] == serial_entries
+    assert state['offsets'] == serial_offsets
@@ -0,0 +1,144 @@
+import threading
+import time
+
+import pytest
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('timed out waiting for condition')
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def scheduler(dashboard):
+    from scheduler import TestScheduler
+
+    return TestScheduler(max_workers=2)
+
+
+def blocking_job(started, release, execution_id):
+    started.append(execution_id)
+    release.wait(5)
+
+
+def test_priority_order_and_fifo(scheduler):
+    started, release = [], threading.Event()
+    # Dua slot terisi, sisanya antri
+    scheduler.submit('busy-1', blocking_job, (started, release, 'busy-1'))
+    scheduler.submit('busy-2', blocking_job, (started, release, 'busy-2'))
+    wait_until(lambda: len(started) == 2)
+
+    for execution_id, priority in (('low', 0), ('high', 5), ('low-2', 0), ('higher', 9)):
+        scheduler.submit(execution_id, started.append, (execution_id,), priority=priority)
+    assert scheduler.stats()['queue_depth'] == 4
+
+    release.set()
+    wait_until(lambda: len(started) == 6)
+    assert started[2:] == ['higher', 'high', 'low', 'low-2']
+    wait_until(lambda: scheduler.stats()['completed'] == 6)
+    assert scheduler.stats()['busy_slots'] == 0
+
+
+def test_sharded_execution_waits_for_all_slots(scheduler):
+    started, release = [], threading.Event()
+    scheduler.submit('single', blocking_job, (started, release, 'single'))
+    wait_until(lambda: started == ['single'])
+
+    sharded_release = threading.Event()
+    scheduler.submit('sharded', blocking_job, (started, sharded_release, 'sharded'), slots=2)
+    # Submit setelahnya tidak boleh mendahului eksekusi sharded walaupun satu slot kosong
+    scheduler.submit('later', started.append, ('later',))
+    time.sleep(0.2)
+    assert started == ['single']
+    assert scheduler.idle_slots() == -2
+
+    release.set()
+    wait_until(lambda: started == ['single', 'sharded'])
+    assert scheduler.stats()['busy_slots'] == 2
+    sharded_release.set()
+    wait_until(lambda: started == ['single', 'sharded', 'later'])
+
+    with pytest.raises(ValueError):
+        scheduler.submit('too-big', started.append, ('too-big',), slots=3)
+
+
+def test_cancel_queued_and_running(scheduler):
+    started, release = [], threading.Event()
+    scheduler.submit('run-1', blocking_job, (started, release, 'run-1'))
+    scheduler.submit('run-2', blocking_job, (started, release, 'run-2'))
+    wait_until(lambda: len(started) == 2)
+    scheduler.submit('queued', started.append, ('queued',))
+
+    assert scheduler.cancel('queued') == 'queued'
+    assert scheduler.cancel('run-1') == 'running'
+    assert scheduler.is_cancelled('run-1')
+    assert scheduler.cancel('unknown') is None
+
+    release.set()
+    wait_until(lambda: scheduler.stats()['completed'] == 2)
+    time.sleep(0.1)
+    assert 'queued' not in started
+    assert not scheduler.is_cancelled('run-1')
+    assert scheduler.stats()['queue_depth'] == 0
+    assert scheduler.stats()['busy_slots'] == 0
+
+
+@pytest.fixture
+def execution_store(dashboard, tmp_path):
+    from execution_store import SQLiteExecutionStore
+
+    return SQLiteExecutionStore(str(tmp_path / 'executions.db'))
+
+
+def test_claim_respects_priority_and_capacity(execution_store):
+    slots = {'a': 1, 'b': 2, 'c': 1, 'd': 1}
+    for execution_id, priority in (('a', 0), ('b', 5), ('c', 5), ('d', 0)):
+        execution_store.enqueue(execution_id, 'pytest', [execution_id], priority=priority)
+
+    def runner_slots(runner, args):
+        return slots[args[0]]
+
+    assert execution_store.claim(0, runner_slots) == []
+    assert [claimed[0] for claimed in execution_store.claim(3, runner_slots)] == ['b', 'c']
+    # 'a' butuh 1 slot tapi hanya tersisa 0; sisa antrian tetap untuk claim berikutnya
+    assert execution_store.queue_stats()['queue_depth'] == 2
+    claimed = execution_store.claim(1, runner_slots)
+    assert claimed == [('a', 'pytest', ['a'], 0)]
+    # Eksekusi yang sudah diambil tidak diambil lagi
+    assert [claimed[0] for claimed in execution_store.claim(5, runner_slots)] == ['d']
+    assert execution_store.claim(5, runner_slots) == []
+
+
+def test_claim_does_not_skip_blocked_head(execution_store):
+    execution_store.enqueue('big', 'pytest_sharded', ['big'], priority=5)
+    execution_store.enqueue('small', 'pytest', ['small'])
+    slots = lambda runner, args: 4 if runner == 'pytest_sharded' else 1
+    assert execution_store.claim(2, slots) == []
+    assert [claimed[0] for claimed in execution_store.claim(4, slots)] == ['big']
+
+
+def test_recover_requeues_claimed_and_drops_started(dashboard, tmp_path, execution_store):
+    from execution_store import SQLiteExecutionStore
+
+    for execution_id in ('started', 'claimed', 'claimed-cancelled', 'waiting'):
+        execution_store.enqueue(execution_id, 'python', [execution_id])
+    assert len(execution_store.claim(3)) == 3
+    execution_store.start('started')
+    assert execution_store.cancel('claimed-cancelled') == 'running'
+    assert execution_store.cancel('waiting') == 'queued'
+
+    assert execution_store.acquire_owner('owner-1', timeout=10)
+    # Owner lain ditolak selama heartbeat owner-1 masih baru
+    other = SQLiteExecutionStore(execution_store.db_path)
+    assert not other.acquire_owner('owner-2', timeout=10)
+    assert other.acquire_owner('owner-2', timeout=0)
+
+    failed, cancelled = other.recover()
+    assert failed == ['started']
+    assert cancelled == ['claimed-cancelled']
+    assert other.cancel_requests() == []
+    assert [claimed[0] for claimed in other.claim(5)] == ['claimed']
+    assert other.cancel('started') is None
@@ -0,0 +1,70 @@
+import math
+import random
+
+import pytest
+
+
+def exact_quantile(values, q):
+    """Sampel ke-floor(q * (n - 1)), rank yang sama dengan DurationSketch.quantiles"""
+    ordered = sorted(values)
+    return ordered[math.floor(q * (len(ordered) - 1))]
+
+
+@pytest.mark.parametrize('distribution', ['lognormal', 'uniform', 'bimodal'])
+def test_quantiles_within_relative_accuracy(dashboard, distribution):
+    from sketch import DurationSketch
+
+    rng = random.Random(42)
+    if distribution == 'lognormal':
+        values = [rng.lognormvariate(0, 1.5) for _ in range(20000)]
+    elif distribution == 'uniform':
+        values = [rng.uniform(0.001, 300) for _ in range(20000)]
+    else:
+        values = [rng.gauss(0.2, 0.02) for _ in range(10000)] + [rng.gauss(45, 5) for _ in range(10000)]
+
+    sketch = DurationSketch()
+    for value in values:
+        sketch.add(value)
+
+    qs = (0.01, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99, 0.999)
+    for q, estimate in zip(qs, sketch.quantiles(qs)):
+        exact = exact_quantile(values, q)
+        assert abs(estimate - exact) <= DurationSketch.RELATIVE_ACCURACY * exact + 1e-12, (q, estimate, exact)
+
+    assert sketch.count == len(values)
+    assert sketch.total == pytest.approx(sum(values))
+    assert sketch.min == min(values) and sketch.max == max(values)
+    assert sum(sketch.histogram()) == len(values)
+
+
+def test_merge_matches_single_sketch(dashboard):
+    from sketch import DurationSketch, merge_sketches
+
+    rng = random.Random(7)
+    values = [rng.expovariate(0.2) for _ in range(5000)]
+    whole = DurationSketch()
+    parts = [DurationSketch() for _ in range(4)]
+    for i, value in enumerate(values):
+        whole.add(value)
+        parts[i % 4].add(value)
+
+    merged = merge_sketches(parts)
+    assert dict(merged.bins) == dict(whole.bins)
+    assert merged.quantiles((0.5, 0.99)) == whole.quantiles((0.5, 0.99))
+    # Satu sketch tidak di-copy
+    assert merge_sketches([whole]) is whole
+
+
+def test_zero_durations_and_round_trip(dashboard):
+    from sketch import DurationSketch
+
+    sketch = DurationSketch()
+    for value in (0, 0, 0, 1.5, 2.5, -1):
+        sketch.add(value)
+    assert sketch.zero_count == 4
+    assert sketch.quantile(0.5) == 0
+    assert sketch.min == 0.0
+
+    restored = DurationSketch.from_dict(sketch.to_dict())
+    assert restored.summary() == sketch.summary()
+    assert restored.count == sketch.count and restored.zero_count == sketch.zero_count
@@ -0,0 +1,154 @@
+import logging
+import threading
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import NoAlertPresentException, WebDriverException
+
+from utils.driver_factory import block_urls
+
+
+logger = logging.getLogger(__name__)
+
+# Fallback tanpa CDP: hanya bisa membersihkan origin halaman aktif
+CLEAR_STORAGE_SCRIPT = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+# Storage.clearDataForOrigin per origin yang pernah dibuka (cookies dihapus terpisah)
+CLEAR_STORAGE_TYPES = "local_storage,indexeddb,websql,cache_storage,service_workers,file_systems"
+
+
+class BrowserPool:
+    """
+    Pool WebDriver yang dipakai ulang antar test.
+
+    Driver di-lease ke test, lalu di-reset (cookies, storage setiap origin
+    yang pernah dibuka, semua tab diganti satu tab baru about:blank) saat
+    dikembalikan; URL blocking fast profile dipasang ulang di tab baru.
+    Driver yang crash, gagal di-reset, atau
+    sudah dipakai max_uses kali akan di-quit dan diganti instance baru.
+    """
+
+    def __init__(self, factory, max_uses=20, max_idle=2):
+        """
+        Args:
+            factory: Callable tanpa argumen yang membuat driver baru (get_driver)
+            max_uses: Jumlah test sebelum driver di-recycle
+            max_idle: Jumlah maksimal driver idle yang disimpan di pool
+        """
+        self.factory = factory
+        self.max_uses = max_uses
+        self.max_idle = max_idle
+        self.idle = []
+        self.uses = {}
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Ambil driver sehat dari pool, atau buat baru kalau pool kosong"""
+        while True:
+            with self.lock:
+                driver = self.idle.pop() if self.idle else None
+            if driver is None:
+                driver = self.factory()
+                self.uses[id(driver)] = 0
+                return driver
+            if self._is_healthy(driver):
+                return driver
+            self._discard(driver)
+
+    def release(self, driver, recycle=False):
+        """Kembalikan driver ke pool setelah di-reset"""
+        uses = self.uses.get(id(driver), 0) + 1
+        self.uses[id(driver)] = uses
+
+        if recycle or uses >= self.max_uses or not self._reset(driver):
+            self._discard(driver)
+            return
+
+        with self.lock:
+            if len(self.idle) < self.max_idle:
+                self.idle.append(driver)
+                return
+        self._discard(driver)
+
+    def close(self):
+        """Quit semua driver idle (dipanggil di akhir session)"""
+        with self.lock:
+            drivers, self.idle = self.idle, []
+        for driver in drivers:
+            self._discard(driver)
+
+    @staticmethod
+    def _is_healthy(driver):
+        try:
+            driver.current_url
+            return len(driver.window_handles) >= 1
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def _reset(driver):
+        """Bersihkan state browser; return False kalau driver sudah tidak sehat"""
+        try:
+            try:
+                driver.switch_to.alert.dismiss()
+            except NoAlertPresentException:
+                pass
+
+            # Kumpulkan origin dari history setiap tab sebelum tab-nya ditutup
+            origins = set()
+            handles = driver.window_handles
+            for handle in handles:
+                driver.switch_to.window(handle)
+                BrowserPool._collect_origins(driver, origins)
+
+            # Pindah ke tab baru lalu tutup semua tab lama: sessionStorage ikut hilang
+            driver.switch_to.new_window("tab")
+            fresh = driver.current_window_handle
+            for handle in handles:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(fresh)
+            # Network.setBlockedURLs hanya berlaku di tab lama
+            if getattr(driver, "blocked_urls", None):
+                block_urls(driver, driver.blocked_urls)
+
+            for origin in sorted(origins):
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin",
+                                       {"origin": origin, "storageTypes": CLEAR_STORAGE_TYPES})
+            try:
+                # Hapus cookies semua domain, bukan hanya domain halaman aktif
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            except (AttributeError, WebDriverException):
+                driver.delete_all_cookies()
+
+            driver.get("about:blank")
+            return True
+        except WebDriverException as e:
+            logger.warning("Recycling browser after failed reset: %s", e)
+            return False
+
+    @staticmethod
+    def _collect_origins(driver, origins):
+        """
+        Tambahkan origin http(s) dari history navigasi tab aktif ke origins.
+        Tanpa CDP (bukan Chromium) storage origin halaman aktif langsung
+        dihapus lewat JavaScript.
+        """
+        try:
+            history = driver.execute_cdp_cmd("Page.getNavigationHistory", {})
+        except (AttributeError, WebDriverException):
+            driver.execute_script(CLEAR_STORAGE_SCRIPT)
+            return
+        for entry in history.get("entries", []):
+            parts = urlsplit(entry.get("url", ""))
+            if parts.scheme in ("http", "https"):
+                origins.add(f"{parts.scheme}://{parts.netloc}")
+
+    def _discard(self, driver):
+        self.uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
@@ -1,9 +1,37 @@
+import os
+
 import pytest
+from utils.browser_pool import BrowserPool
 from utils.driver_factory import get_driver
 
 
+# Set BROWSER_POOL=0 untuk selalu membuat browser baru per test
+BROWSER_POOL_ENABLED = os.environ.get("BROWSER_POOL", "1") != "0"
+BROWSER_POOL_MAX_USES = int(os.environ.get("BROWSER_POOL_MAX_USES", "20"))
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "pristine_browser: jalankan test dengan Chrome baru, bukan dari browser pool"
+    )
+
+
+@pytest.fixture(scope="session")
+def browser_pool():
+    pool = BrowserPool(get_driver, max_uses=BROWSER_POOL_MAX_USES)
+    yield pool
+    pool.close()
+
+
 @pytest.fixture(scope="function")
-def driver():
-    driver = get_driver()
+def driver(request, browser_pool):
+    if not BROWSER_POOL_ENABLED or request.node.get_closest_marker("pristine_browser"):
+        driver = get_driver()
+        yield driver
+        driver.quit()
+        return
+
+    driver = browser_pool.acquire()
     yield driver
-    driver.quit()
+    browser_pool.release(driver)
@@ -1,21 +1,213 @@
+import json
+import logging
+import os
+import re
+import subprocess
+import time
+
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from config.config import HEADLESS
 
 
-def get_driver():
+logger = logging.getLogger(__name__)
+
+# Cache path chromedriver di disk, key = major version Chrome
+DRIVER_CACHE_DIR = os.environ.get(
+    "DRIVER_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "selenium-automation")
+)
+DRIVER_CACHE_FILE = os.path.join(DRIVER_CACHE_DIR, "chromedriver.json")
+
+CHROME_BINARIES = [
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+CHROME_VERSION_PATTERN = re.compile(r"(\d+)\.\d+\.\d+(?:\.\d+)?")
+
+# Fast profile: tanpa gambar/font/video/analytics, cocok untuk functional check.
+# Set FAST_PROFILE=1 untuk mengaktifkan secara default.
+FAST_PROFILE = os.environ.get("FAST_PROFILE", "0") == "1"
+FAST_PAGE_LOAD_STRATEGY = os.environ.get("PAGE_LOAD_STRATEGY", "eager")
+FAST_WINDOW_SIZE = os.environ.get("FAST_WINDOW_SIZE", "1280,800")
+FAST_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.mp3",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*connect.facebook.net*", "*hotjar.com*",
+]
+# Pattern tambahan, pisahkan dengan koma: BLOCKED_URLS="*ads.example.com*,*.gif"
+FAST_BLOCKED_URLS += [p for p in os.environ.get("BLOCKED_URLS", "").split(",") if p]
+FAST_ARGUMENTS = [
+    "--disable-background-networking",
+    "--disable-extensions",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--no-first-run",
+    "--mute-audio",
+]
+
+# Cache in-process: cukup di-resolve sekali per worker
+_chrome_version = None
+_driver_path = None
+
+
+def get_chrome_version():
+    """Deteksi versi Chrome yang terpasang (tanpa network), None kalau tidak ketemu"""
+    global _chrome_version
+    if _chrome_version is not None:
+        return _chrome_version
+
+    commands = [[binary, "--version"] for binary in CHROME_BINARIES]
+    if os.name == "nt":
+        commands = [["reg", "query", r"HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon", "/v", "version"]]
+
+    for command in commands:
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+        match = CHROME_VERSION_PATTERN.search(result.stdout)
+        if result.returncode == 0 and match:
+            _chrome_version = match.group(0)
+            return _chrome_version
+
+    return None
+
+
+def _load_driver_cache():
+    try:
+        with open(DRIVER_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_driver_cache(cache):
+    # Tulis atomic supaya aman kalau beberapa worker pytest menulis bersamaan
+    os.makedirs(DRIVER_CACHE_DIR, exist_ok=True)
+    tmp_file = f"{DRIVER_CACHE_FILE}.{os.getpid()}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_file, DRIVER_CACHE_FILE)
+
+
+def get_driver_path():
+    """
+    Path chromedriver yang sesuai dengan versi Chrome.
+
+    Urutan: env CHROMEDRIVER_PATH, cache in-process, cache di disk (key major
+    version Chrome), lalu ChromeDriverManager().install() kalau belum ada.
+    Setelah cache terisi, tidak perlu akses network lagi. Kalau versi Chrome
+    tidak terdeteksi, cache di disk dilewati (tidak dibaca maupun ditulis)
+    supaya driver untuk versi lama tidak dipakai lagi setelah Chrome update.
+    """
+    global _driver_path
+    if _driver_path:
+        return _driver_path
+
+    override = os.environ.get("CHROMEDRIVER_PATH")
+    if override:
+        _driver_path = override
+        return _driver_path
+
+    version = get_chrome_version()
+    if not version:
+        # Tanpa versi, key cache tidak bisa membedakan Chrome lama dan baru:
+        # biarkan ChromeDriverManager yang resolve
+        logger.warning("Chrome version not detected, skipping chromedriver disk cache")
+        _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+    cache_key = version.split(".")[0]
+    cache = _load_driver_cache()
+    cached = cache.get(cache_key)
+
+    if cached and os.path.exists(cached["path"]):
+        _driver_path = cached["path"]
+        return _driver_path
+
+    driver_path = ChromeDriverManager().install()
+    cache[cache_key] = {"path": driver_path, "chrome_version": version}
+    try:
+        _save_driver_cache(cache)
+    except OSError as e:
+        logger.warning("Could not write chromedriver cache %s: %s", DRIVER_CACHE_FILE, e)
+
+    _driver_path = driver_path
+    return _driver_path
+
+
+def _apply_fast_profile(options, page_load_strategy):
+    options.page_load_strategy = page_load_strategy
+    options.add_argument(f"--window-size={FAST_WINDOW_SIZE}")
+    for argument in FAST_ARGUMENTS:
+        options.add_argument(argument)
+    # Fallback kalau CDP tidak tersedia: gambar tetap tidak dimuat
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
+
+def block_urls(driver, patterns):
+    """
+    Blok request yang cocok dengan pattern lewat Chrome DevTools Protocol.
+
+    Blocking CDP hanya berlaku untuk tab aktif, jadi pattern disimpan di
+    driver.blocked_urls supaya bisa dipasang ulang di tab baru (BrowserPool).
+    """
+    driver.blocked_urls = list(patterns)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": driver.blocked_urls})
+    except Exception as e:
+        logger.warning("Could not enable URL blocking via CDP: %s", e)
+
+
+def get_driver(fast_profile=None, page_load_strategy=None, blocked_urls=None):
+    """
+    Buat Chrome WebDriver.
+
+    Args:
+        fast_profile: Pakai fast profile (default: env FAST_PROFILE)
+        page_load_strategy: "normal", "eager" atau "none" (default fast profile: eager)
+        blocked_urls: Pattern URL yang diblok (default fast profile: FAST_BLOCKED_URLS)
+    """
+    fast_profile = FAST_PROFILE if fast_profile is None else fast_profile
+
     options = webdriver.ChromeOptions()
-    options.add_argument("--start-maximized")
-    
+    if fast_profile:
+        _apply_fast_profile(options, page_load_strategy or FAST_PAGE_LOAD_STRATEGY)
+        if blocked_urls is None:
+            blocked_urls = FAST_BLOCKED_URLS
+    else:
+        options.add_argument("--start-maximized")
+        if page_load_strategy:
+            options.page_load_strategy = page_load_strategy
+
     if HEADLESS:
         options.add_argument("--headless=new")
 
+    start = time.perf_counter()
+    driver_path = get_driver_path()
+    resolved = time.perf_counter()
+
     driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
+        service=Service(driver_path),
         options=options
     )
-    
+
+    if blocked_urls:
+        block_urls(driver, blocked_urls)
+
+    driver.startup_time = time.perf_counter() - start
+    logger.info(
+        "Chrome started in %.3fs (driver resolve %.3fs, browser launch %.3fs)",
+        driver.startup_time, resolved - start, driver.startup_time - (resolved - start)
+    )
 
     return driver
- 
\ No newline at end of file